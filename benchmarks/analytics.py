@@ -0,0 +1,109 @@
+"""Speed of the vectorized fleet analytics against iterating over the machines.
+
+Usage:
+    python -m benchmarks.analytics [--machines N] [--vends N] [--repeat N]
+
+Builds a VendingFleet and a random sales history of the given sizes, then times the SlotTable export and queries and
+the SalesHistory queries. Low stock and stock by item are also computed by iterating over the slot_items of every
+machine, the way they were answered before.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from vending_machine.analytics import SalesHistory, SlotTable
+from vending_machine.fleet import VendingFleet
+from vending_machine.simulation import DEFAULT_MENU
+from vending_machine.vending_machine import Item
+
+
+class StubProvider:
+
+    def fetch(self, search_term):
+        return ''
+
+
+def build_fleet(machines, seed):
+    rng = np.random.default_rng(seed)
+    fleet = VendingFleet(machines, abstract_provider=StubProvider())
+    stock = rng.integers(0, 20, size=machines * 9).tolist()
+
+    for machine_id in range(machines):
+        vending_machine = fleet.machine(machine_id)
+        for slot_number in range(1, 10):
+            name, price = DEFAULT_MENU[(machine_id + slot_number) % len(DEFAULT_MENU)]
+            vending_machine.add_item_to_slot(slot_number, Item(name, price, stock[machine_id * 9 + slot_number - 1]))
+
+    return fleet
+
+
+def build_history(table, vends, seed):
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, len(table), size=vends)
+
+    return SalesHistory(
+        table.machine_ids[rows],
+        table.slot_numbers[rows],
+        table.name_ids[rows],
+        table.prices[rows],
+        np.sort(rng.uniform(0, 30 * 86400, size=vends)),
+        table.names,
+    )
+
+
+def iterate_low_stock(fleet, threshold):
+    low = []
+    stock_by_item = {}
+
+    for machine_id, vending_machine in enumerate(fleet):
+        for slot_number, slot_item in vending_machine.slot_items.items():
+            if slot_item is not None:
+                if slot_item.stock <= threshold:
+                    low.append((machine_id, slot_number))
+                stock_by_item[slot_item.name] = stock_by_item.get(slot_item.name, 0) + slot_item.stock
+
+    return low, stock_by_item
+
+
+def best_of(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the vectorized fleet analytics.')
+    parser.add_argument('--machines', type=int, default=100000)
+    parser.add_argument('--vends', type=int, default=10000000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    fleet = build_fleet(args.machines, seed=1)
+    table = SlotTable.from_fleet(fleet)
+    history = build_history(table, args.vends, seed=2)
+
+    timings = [
+        ('SlotTable.from_fleet', lambda: SlotTable.from_fleet(fleet)),
+        ('low_stock', lambda: table.low_stock(threshold=2)),
+        ('stock_by_item', table.stock_by_item),
+        ('price_outliers', table.price_outliers),
+        ('iterate machines (low stock, stock by item)', lambda: iterate_low_stock(fleet, 2)),
+        ('revenue_by_item', history.revenue_by_item),
+        ('units_by_item', history.units_by_item),
+        ('revenue_by_machine', lambda: history.revenue_by_machine(args.machines)),
+        ('sell_through', lambda: history.sell_through(table)),
+        ('between (one week)', lambda: history.between(0, 7 * 86400)),
+    ]
+
+    print(f'{args.machines:,} machines, {len(table):,} slots, {len(history):,} vends')
+
+    for label, function in timings:
+        print(f'{label:>44} {best_of(function, args.repeat) * 1000:>10.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
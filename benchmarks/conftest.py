@@ -0,0 +1,59 @@
+"""Fixtures of the pytest-benchmark suite.
+
+The suite only runs with VENDING_MACHINE_BENCHMARKS=1, as the benchmarks of tests/unit do, so a plain pytest run of
+the repository stays a correctness run:
+
+    VENDING_MACHINE_BENCHMARKS=1 python -m pytest benchmarks
+
+benchmarks/pytest.ini holds the pytest-benchmark options. See the README for saving a baseline and comparing against it.
+"""
+import os
+
+import pytest
+
+from vending_machine.abstract_cache import AbstractCache
+from vending_machine.fleet import VendingFleet
+from vending_machine.vending_machine import Item, VendingMachine
+
+if not os.environ.get('VENDING_MACHINE_BENCHMARKS'):
+    collect_ignore_glob = ['test_*.py']
+
+FLEET_MACHINES = 10000
+
+MENU = [('Sparkling Water', 1.25), ('Soda', 0.75), ('Coffee', 1.75), ('Energy Drink', 1.50), ('Lemonade', 2.00)]
+
+
+class StubProvider:
+
+    def fetch(self, search_term):
+        return f'About {search_term}'
+
+
+@pytest.fixture
+def stub_provider():
+    return StubProvider()
+
+
+@pytest.fixture
+def vending_machine(stub_provider):
+    """Nine slot machine with plenty of every item of MENU and a shared abstract cache."""
+    vending_machine = VendingMachine(abstract_cache=AbstractCache(), abstract_provider=stub_provider)
+
+    for slot_number in range(1, 10):
+        name, price = MENU[slot_number % len(MENU)]
+        vending_machine.add_item_to_slot(slot_number, Item(name, price, 10 ** 9))
+
+    return vending_machine
+
+
+@pytest.fixture
+def fleet(stub_provider):
+    """Fleet of FLEET_MACHINES machines stocked like the vending_machine fixture."""
+    fleet = VendingFleet(FLEET_MACHINES, slots=9, abstract_provider=stub_provider)
+
+    for fleet_machine in fleet:
+        for slot_number in range(1, 10):
+            name, price = MENU[slot_number % len(MENU)]
+            fleet_machine.add_item_to_slot(slot_number, Item(name, price, 10 ** 9))
+
+    return fleet
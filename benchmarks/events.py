@@ -0,0 +1,84 @@
+"""Cost of event emission on the vend path, from no event bus to a queued subscriber.
+
+Usage:
+    python -m benchmarks.events [--vends N] [--repeat N]
+
+Runs the same insert and vend sequence through select_and_vend and vend_many on machines without an event bus, with
+a bus nobody subscribes to, with a counting subscriber and with a QueuedSubscriber.
+"""
+import argparse
+import time
+
+from vending_machine.events import EventBus, QueuedSubscriber
+from vending_machine.vending_machine import Item, VendingMachine
+
+
+class StubProvider:
+
+    def fetch(self, search_term):
+        return ''
+
+
+class Counter:
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, event):
+        self.count += 1
+
+
+def build(events):
+    vending_machine = VendingMachine(slots=10, abstract_provider=StubProvider(), events=events)
+    for slot_number in range(1, 11):
+        vending_machine.add_item_to_slot(slot_number, Item(f'Item {slot_number}', 1, 10 ** 9))
+    return vending_machine
+
+
+def single_vends(vending_machine, vends):
+    for n in range(vends):
+        vending_machine.insert_money(1)
+        vending_machine.select_and_vend(n % 10 + 1)
+
+
+def batch_vends(vending_machine, vends):
+    vending_machine.vend_many([(1, n % 10 + 1) for n in range(vends)], abstracts=False)
+
+
+def best_of(function, vending_machine, vends, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(vending_machine, vends)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the cost of event emission on the vend path.')
+    parser.add_argument('--vends', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    empty_bus = EventBus()
+    counting_bus = EventBus()
+    counting_bus.subscribe(Counter())
+    queued_bus = EventBus()
+    queued_subscriber = queued_bus.subscribe(QueuedSubscriber(lambda batch: None))
+
+    print(f'{"events":>12} {"select_and_vend":>18} {"vend_many":>12}')
+
+    for label, events in (('none', None), ('no subscriber', empty_bus), ('counter', counting_bus),
+                          ('queued', queued_bus)):
+        vending_machine = build(events)
+        single_seconds = best_of(single_vends, vending_machine, args.vends, args.repeat)
+        batch_seconds = best_of(batch_vends, vending_machine, args.vends, args.repeat)
+
+        print(f'{label:>12} {single_seconds / args.vends * 1e9:>14,.0f}ns/op '
+              f'{batch_seconds / args.vends * 1e9:>8,.0f}ns/op')
+
+    queued_subscriber.close()
+
+
+if __name__ == '__main__':
+    main()
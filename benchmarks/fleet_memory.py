@@ -0,0 +1,64 @@
+"""Memory footprint of VendingFleet against the same number of VendingMachine objects.
+
+Usage:
+    python -m benchmarks.fleet_memory [--machines N] [--slots S]
+"""
+import argparse
+import gc
+import tracemalloc
+
+from vending_machine.abstract_provider import get_default_provider
+from vending_machine.fleet import VendingFleet
+from vending_machine.vending_machine import Item, VendingMachine
+
+MENU = [('Sparkling Water', 1.25), ('Soda', 0.75), ('Coffee', 1.75), ('Energy Drink', 1.50), ('Lemonade', 2.00)]
+
+
+def fill(vending_machine, slots):
+    for slot in range(1, slots + 1):
+        name, price = MENU[slot % len(MENU)]
+        vending_machine.add_item_to_slot(slot, Item(name, price, 20))
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, current
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the memory of a VendingFleet with VendingMachine objects.')
+    parser.add_argument('--machines', type=int, default=100000)
+    parser.add_argument('--slots', type=int, default=9)
+    args = parser.parse_args()
+
+    # Create the shared provider up front so that neither measurement includes it.
+    get_default_provider()
+
+    def build_machines():
+        machines = [VendingMachine(slots=args.slots) for _ in range(args.machines)]
+        for vending_machine in machines:
+            fill(vending_machine, args.slots)
+        return machines
+
+    def build_fleet():
+        fleet = VendingFleet(args.machines, slots=args.slots)
+        for vending_machine in fleet:
+            fill(vending_machine, args.slots)
+        return fleet
+
+    machines, machines_bytes = measure(build_machines)
+    del machines
+    fleet, fleet_bytes = measure(build_fleet)
+
+    print(f'{args.machines} machines x {args.slots} slots')
+    print(f'VendingMachine objects: {machines_bytes / 2 ** 20:10.1f} MiB')
+    print(f'VendingFleet columns:   {fleet_bytes / 2 ** 20:10.1f} MiB ({fleet_bytes / machines_bytes:.1%})')
+
+
+if __name__ == '__main__':
+    main()
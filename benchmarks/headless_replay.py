@@ -0,0 +1,66 @@
+"""Replay speed of a scripted menu session, headless against the terminal console with patched input.
+
+Usage:
+    python -m benchmarks.headless_replay [--steps N]
+
+The terminal run patches builtins.input and prints every menu to /dev/null, as the integration tests do. Abstracts
+come from a stub provider through the cache, so neither run touches the network.
+"""
+import argparse
+import contextlib
+import os
+import time
+from unittest.mock import patch
+
+from vending_machine.abstract_cache import AbstractCache
+from vending_machine.console import HeadlessConsole
+from vending_machine.vending_machine import Item, VendingMachine, VendingMachineInterface
+
+
+class StubProvider:
+
+    def fetch(self, search_term):
+        return f'About {search_term}'
+
+
+def build_script(steps):
+    session = ['i', '1.75', '1', 'i', '0.75', '5', 'r', '0.25', 'm', 'd', 'm']
+    return (session * (steps // len(session) + 1))[:steps] + ['q']
+
+
+def build_interface(console=None):
+    vending_machine = VendingMachine(abstract_cache=AbstractCache(), abstract_provider=StubProvider())
+    vending_machine.add_item_to_slot(1, Item('Sparkling Water', 1.25, 10 ** 9))
+    vending_machine.add_item_to_slot(5, Item('Soda', 0.75, 10 ** 9))
+    return VendingMachineInterface(vending_machine, console=console)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure scripted session replay speed.')
+    parser.add_argument('--steps', type=int, default=1000000)
+    args = parser.parse_args()
+
+    script = build_script(args.steps)
+
+    interface = build_interface(HeadlessConsole(script))
+    started = time.perf_counter()
+    interface.run()
+    headless_seconds = time.perf_counter() - started
+
+    terminal_steps = min(args.steps, 100000)
+    interface = build_interface()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull), \
+            patch('builtins.input', side_effect=build_script(terminal_steps)):
+        started = time.perf_counter()
+        interface.run()
+        terminal_seconds = time.perf_counter() - started
+
+    headless_rate = args.steps / headless_seconds
+    terminal_rate = terminal_steps / terminal_seconds
+
+    print(f'headless:               {headless_rate:12,.0f} steps/s ({args.steps:,} steps in {headless_seconds:.2f}s)')
+    print(f'patched input + print:  {terminal_rate:12,.0f} steps/s ({headless_rate / terminal_rate:,.1f}x slower)')
+
+
+if __name__ == '__main__':
+    main()
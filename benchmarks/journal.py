@@ -0,0 +1,57 @@
+"""Journaling throughput of VendingMachine for several group commit settings.
+
+Usage:
+    python -m benchmarks.journal [--events N]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from vending_machine.journal import Journal, replay_journal
+from vending_machine.vending_machine import Item, VendingMachine
+
+SETTINGS = [
+    ('no journal', None),
+    ('group_commit=1', {'group_commit': 1}),
+    ('group_commit=64', {'group_commit': 64}),
+    ('group_commit=1024', {'group_commit': 1024}),
+    ('group_commit=64, fsync', {'group_commit': 64, 'fsync': True}),
+]
+
+
+def drive(vending_machine, events):
+    """Alternate insert_money and vend calls, each of them producing one journal event."""
+    vending_machine.add_item_to_slot(1, Item('Soda', 0.75, events))
+
+    started = time.perf_counter()
+    for _ in range(events // 2):
+        vending_machine.insert_money(1)
+        vending_machine._vend(1)
+
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure journaled events per second.')
+    parser.add_argument('--events', type=int, default=200000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for index, (label, journal_options) in enumerate(SETTINGS):
+            if journal_options is None:
+                elapsed = drive(VendingMachine(), args.events)
+            else:
+                path = os.path.join(directory, f'{index}.journal')
+                with Journal(path, **journal_options) as journal:
+                    elapsed = drive(VendingMachine(journal=journal), args.events)
+
+            print(f'{label:<24} {args.events / elapsed:12,.0f} events/s {elapsed / args.events * 1e6:8.2f} us/event')
+
+        started = time.perf_counter()
+        replay_journal(os.path.join(directory, '2.journal'))
+        print(f'\nreplay of {args.events} events: {time.perf_counter() - started:.3f} s')
+
+
+if __name__ == '__main__':
+    main()
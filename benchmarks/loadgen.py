@@ -0,0 +1,105 @@
+"""Load generator for the vending server, reporting throughput and latency percentiles.
+
+Usage:
+    python -m benchmarks.loadgen [--address HOST:PORT|unix:PATH] [--connections N] [--pipeline N] [--requests N]
+
+Each connection keeps --pipeline requests in flight, alternating INSERT 1 and VEND with a random slot. Without
+--address a server is started in a background thread of this process, with abstracts served from a stub provider.
+"""
+import argparse
+import asyncio
+import random
+import threading
+import time
+
+from vending_machine.abstract_cache import AbstractCache
+from vending_machine.client import VendingClient
+from vending_machine.server import VendingServer, parse_address
+from vending_machine.vending_machine import Item, VendingMachine
+
+
+class StubAsyncProvider:
+
+    async def fetch(self, search_term):
+        return f'About {search_term}'
+
+
+def start_local_server():
+    vending_machine = VendingMachine(abstract_cache=AbstractCache())
+    for slot in range(1, 10):
+        vending_machine.add_item_to_slot(slot, Item(f'Item {slot}', 1, 10 ** 9))
+
+    started = threading.Event()
+    address = []
+
+    async def serve():
+        server = VendingServer(vending_machine, abstract_provider=StubAsyncProvider())
+        address.extend(await server.start())
+        started.set()
+        await server.serve_forever()
+
+    threading.Thread(target=asyncio.run, args=(serve(),), daemon=True).start()
+    started.wait()
+
+    return 'tcp', *address
+
+
+async def connect(address):
+    kind, *location = address
+
+    if kind == 'unix':
+        return await VendingClient.connect_unix(*location)
+
+    return await VendingClient.connect(*location)
+
+
+async def run_load(address, connections, pipeline, requests):
+    clients = [await connect(address) for _ in range(connections)]
+    latencies = []
+    remaining = [requests]
+
+    async def worker(client, rng):
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            request = ('INSERT', 1) if remaining[0] % 2 else ('VEND', rng.randint(1, 9))
+            started = time.perf_counter()
+            await client.request(*request)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        worker(client, random.Random(n)) for n, client in enumerate(clients * pipeline)
+    ))
+    elapsed = time.perf_counter() - started
+
+    for client in clients:
+        await client.close()
+
+    return elapsed, latencies
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate load on a vending server.')
+    parser.add_argument('--address', help='HOST:PORT or unix:PATH of the server, a local server by default')
+    parser.add_argument('--connections', type=int, default=16)
+    parser.add_argument('--pipeline', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=100000)
+    args = parser.parse_args()
+
+    address = parse_address(args.address) if args.address else start_local_server()
+    elapsed, latencies = asyncio.run(run_load(address, args.connections, args.pipeline, args.requests))
+    latencies.sort()
+
+    print(f'{len(latencies):,} requests over {args.connections} connections, pipeline depth {args.pipeline}')
+    print(f'throughput: {len(latencies) / elapsed:12,.0f} requests/s')
+    print(f'p50:        {percentile(latencies, 0.50) * 1e6:12,.0f} us')
+    print(f'p99:        {percentile(latencies, 0.99) * 1e6:12,.0f} us')
+    print(f'max:        {latencies[-1] * 1e6:12,.0f} us')
+
+
+if __name__ == '__main__':
+    main()
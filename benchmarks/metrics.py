@@ -0,0 +1,73 @@
+"""Overhead of the metrics instrumentation, and where the time of a vend goes once it is enabled.
+
+Usage:
+    python -m benchmarks.metrics [--vends N] [--lookup-ms MS]
+
+Runs the same vends with metrics disabled and enabled, then vends items whose abstracts take --lookup-ms to fetch
+and prints the latency percentiles of each operation, separating the abstract wait from the vend itself.
+"""
+import argparse
+import time
+
+from vending_machine.metrics import Metrics
+from vending_machine.vending_machine import Item, VendingMachine
+
+
+class SlowProvider:
+
+    def __init__(self, lookup_seconds):
+        self.lookup_seconds = lookup_seconds
+
+    def fetch(self, search_term):
+        time.sleep(self.lookup_seconds)
+        return f'About {search_term}'
+
+
+def build(provider):
+    vending_machine = VendingMachine(slots=10, abstract_provider=provider)
+    for slot_number in range(1, 11):
+        vending_machine.add_item_to_slot(slot_number, Item(f'Item {slot_number}', 1, 10 ** 9))
+    return vending_machine
+
+
+def vends_per_second(vending_machine, vends):
+    started = time.perf_counter()
+    for n in range(vends):
+        vending_machine.insert_money(1)
+        vending_machine.select_and_vend(n % 10 + 1)
+    vending_machine.vend_many([(1, n % 10 + 1) for n in range(vends)], abstracts=False)
+    return 2 * vends / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the metrics instrumentation.')
+    parser.add_argument('--vends', type=int, default=100000)
+    parser.add_argument('--lookup-ms', type=float, default=1.0)
+    args = parser.parse_args()
+
+    metrics = Metrics()
+    vending_machine = build(SlowProvider(0))
+
+    disabled = vends_per_second(vending_machine, args.vends)
+    metrics.enable(VendingMachine)
+    enabled = vends_per_second(vending_machine, args.vends)
+
+    print(f'disabled: {disabled:,.0f} vends/s')
+    print(f'enabled:  {enabled:,.0f} vends/s ({(disabled / enabled - 1) * 100:.0f}% slower)')
+
+    metrics.reset()
+    vending_machine = build(SlowProvider(args.lookup_ms / 1000))
+    vending_machine.insert_money(1000)
+    for n in range(200):
+        vending_machine.select_and_vend(n % 10 + 1)
+    metrics.disable(VendingMachine)
+
+    print(f'\n{"operation":>16} {"calls":>8} {"p50":>10} {"p99":>10}')
+    for operation in ('select_and_vend', 'vend_decision', 'abstract_lookup', 'abstract_fetch'):
+        histogram = metrics.histograms[operation]
+        print(f'{operation:>16} {histogram.count:>8} {histogram.percentile(50) / 1000:>8,.1f}us '
+              f'{histogram.percentile(99) / 1000:>8,.1f}us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Cost of pushing a planogram to a fleet, against resetting every slot one call at a time.
+
+Usage:
+    python -m benchmarks.planogram [--machines N] [--slots N]
+
+Stocks a VendingFleet with a layout, then times a planogram push that changes the price of one slot and replaces
+the item of another on every machine, a second push of the same planogram, which finds every machine already
+matching, and the same new layout set by calling replace_item_in_slot on every slot of every machine.
+"""
+import argparse
+import time
+
+from vending_machine.fleet import VendingFleet
+from vending_machine.planogram import Planogram
+from vending_machine.simulation import DEFAULT_MENU
+from vending_machine.vending_machine import Item
+
+
+class StubProvider:
+
+    def fetch(self, search_term):
+        return ''
+
+
+def layout(slots, changed):
+    planogram_layout = {}
+
+    for slot_number in range(1, slots + 1):
+        name, price = DEFAULT_MENU[(slot_number - 1) % len(DEFAULT_MENU)]
+        planogram_layout[slot_number] = (name, price, 10)
+
+    if changed:
+        name, price, stock = planogram_layout[1]
+        planogram_layout[1] = (name, price + 0.25, stock)
+        planogram_layout[2] = ('Iced Tea', 1.75, 10)
+
+    return planogram_layout
+
+
+def build_fleet(machines, slots):
+    fleet = VendingFleet(machines, slots=slots, abstract_provider=StubProvider())
+    Planogram(layout(slots, changed=False)).push(fleet)
+    return fleet
+
+
+def timed(function):
+    started = time.perf_counter()
+    result = function()
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure planogram pushes to a fleet.')
+    parser.add_argument('--machines', type=int, default=10000)
+    parser.add_argument('--slots', type=int, default=9)
+    args = parser.parse_args()
+
+    planogram = Planogram(layout(args.slots, changed=True))
+    fleet = build_fleet(args.machines, args.slots)
+
+    push_seconds, report = timed(lambda: planogram.push(fleet))
+    print(f'push: {report.changed:,} machines changed with {report.changes:,} changes in {push_seconds * 1000:,.1f}ms')
+
+    push_seconds, report = timed(lambda: planogram.push(fleet))
+    print(f'push again: {report.unchanged:,} machines unchanged in {push_seconds * 1000:,.1f}ms')
+
+    fleet = build_fleet(args.machines, args.slots)
+
+    def replace_every_slot():
+        for vending_machine in fleet:
+            for slot_number, (name, price, stock) in layout(args.slots, changed=True).items():
+                vending_machine.replace_item_in_slot(slot_number, Item(name, price, stock))
+
+    replace_seconds, _ = timed(replace_every_slot)
+    print(f'replace_item_in_slot on every slot: {replace_seconds * 1000:,.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
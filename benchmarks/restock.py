@@ -0,0 +1,76 @@
+"""Cost of the RestockPlanner updates and plans against rescanning every slot.
+
+Usage:
+    python -m benchmarks.restock [--slots N] [--vends N] [--repeat N]
+
+Feeds the planner random vends over a week across the slots, each slot with its own popularity, then times
+observe_vend, a plan of the slots running out within the next day, and the same plan computed by projecting every
+slot and sorting them, as a full rescan would.
+"""
+import argparse
+import math
+import random
+import time
+
+from vending_machine.restock import RestockPlanner
+
+HOUR = 3600
+
+
+def best_of(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def rescan(planner, horizon, at):
+    projections = []
+
+    for (machine_id, slot_number), state in planner._slots.items():
+        rate = planner.rate(machine_id, slot_number, at=at) / HOUR
+        stockout_at = at if state[2] <= 0 else (at + state[2] / rate if rate > 0 else math.inf)
+        if stockout_at <= at + horizon:
+            projections.append((stockout_at, machine_id, slot_number))
+
+    return sorted(projections)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the RestockPlanner against a full rescan.')
+    parser.add_argument('--slots', type=int, default=100000)
+    parser.add_argument('--vends', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    machines = -(-args.slots // 9)
+    keys = [(machine_id, slot_number) for machine_id in range(machines) for slot_number in range(1, 10)][:args.slots]
+    weights = [rng.paretovariate(1.5) for _ in keys]
+    stock = dict.fromkeys(keys, 50)
+
+    chosen = rng.choices(keys, weights=weights, k=args.vends)
+    times = sorted(rng.uniform(0, 7 * 24 * HOUR) for _ in range(args.vends))
+    planner = RestockPlanner(half_life=24 * HOUR)
+
+    started = time.perf_counter()
+    for (machine_id, slot_number), at in zip(chosen, times):
+        stock[machine_id, slot_number] = left = max(stock[machine_id, slot_number] - 1, 0)
+        planner.observe_vend(machine_id, slot_number, left, at=at)
+    update_seconds = time.perf_counter() - started
+
+    now = 7 * 24 * HOUR
+    plan = planner.plan(24 * HOUR, at=now)
+
+    print(f'{len(keys):,} slots, {args.vends:,} vends, {len(planner):,} slots with sales, {len(plan):,} in the plan')
+    print(f'{"observe_vend":>20} {update_seconds / args.vends * 1e9:>10,.0f}ns/op')
+    print(f'{"plan (one day)":>20} {best_of(lambda: planner.plan(24 * HOUR, at=now), args.repeat) * 1000:>10.2f}ms')
+    print(f'{"plan (top 100)":>20} '
+          f'{best_of(lambda: planner.plan(24 * HOUR, at=now, limit=100), args.repeat) * 1000:>10.2f}ms')
+    print(f'{"full rescan":>20} {best_of(lambda: rescan(planner, 24 * HOUR, now), args.repeat) * 1000:>10.2f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Throughput of a ShardedFleet as workers are added.
+
+Usage:
+    python -m benchmarks.sharding [--machines N] [--vends N] [--workers N [N ...]]
+
+Stocks every machine of the fleet, then times one batch of vends spread evenly over the machines for each worker
+count, next to the same vends run in this process on plain VendingMachine objects. The vends are submitted both as
+request tuples through vend_many and as prebuilt columns through execute_columns, which leaves out the conversion
+done by the parent process. Scaling is bounded by the cores of the host.
+"""
+import argparse
+import os
+import time
+from array import array
+
+from vending_machine.sharding import ShardedFleet, ShardOp
+from vending_machine.vending_machine import Item, VendingMachine
+
+
+class StubProvider:
+
+    def fetch(self, search_term):
+        return ''
+
+
+def requests_for(machines, vends):
+    return [(n % machines, 100, n // machines % 9 + 1) for n in range(vends)]
+
+
+def in_process(machines, requests):
+    vending_machines = [VendingMachine(abstract_provider=StubProvider()) for _ in range(machines)]
+    for vending_machine in vending_machines:
+        for slot_number in range(1, 10):
+            vending_machine.add_item_to_slot(slot_number, Item(f'Item {slot_number}', 1, 10 ** 9))
+
+    batches = [[] for _ in range(machines)]
+    for machine_id, amount_cents, slot_number in requests:
+        batches[machine_id].append((amount_cents, slot_number))
+
+    started = time.perf_counter()
+    for vending_machine, batch in zip(vending_machines, batches):
+        vending_machine.vend_many(batch, abstracts=False, cents=True)
+    return time.perf_counter() - started
+
+
+def sharded(machines, requests, workers):
+    with ShardedFleet(machines, workers=workers, batch_size=len(requests)) as fleet:
+        for slot_number in range(1, 10):
+            fleet.stock_all(slot_number, f'Item {slot_number}', 100, 10 ** 9)
+
+        started = time.perf_counter()
+        fleet.vend_many(requests)
+        tuple_seconds = time.perf_counter() - started
+
+        machine_ids, amounts_cents, slot_numbers = (array('q', column) for column in zip(*requests))
+        columns = [array('q', [ShardOp.VEND]) * len(requests), machine_ids, slot_numbers, amounts_cents,
+                   array('q', [0]) * len(requests)]
+
+        started = time.perf_counter()
+        fleet.execute_columns(columns)
+        column_seconds = time.perf_counter() - started
+
+        assert fleet.totals()['vends'] == 2 * len(requests)
+
+    return tuple_seconds, column_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the throughput of a ShardedFleet as workers are added.')
+    parser.add_argument('--machines', type=int, default=10000)
+    parser.add_argument('--vends', type=int, default=1000000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    requests = requests_for(args.machines, args.vends)
+
+    print(f'{os.cpu_count()} cores, {args.machines:,} machines, {args.vends:,} vends')
+    print(f'{"workers":>10} {"vend_many/s":>14} {"speedup":>8} {"columns/s":>14} {"speedup":>8}')
+
+    baseline = in_process(args.machines, requests)
+    print(f'{"in process":>10} {args.vends / baseline:>14,.0f} {1:>8.2f}')
+
+    for workers in args.workers:
+        tuple_seconds, column_seconds = sharded(args.machines, requests, workers)
+        print(f'{workers:>10} {args.vends / tuple_seconds:>14,.0f} {baseline / tuple_seconds:>8.2f} '
+              f'{args.vends / column_seconds:>14,.0f} {baseline / column_seconds:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Speed of the discrete-event fleet simulator, and the outcome of restock and cash pickup schedules.
+
+Usage:
+    python -m benchmarks.simulation [--machines N] [--days N] [--arrival-rate R] [--seed N]
+
+Simulates the same fleet with restock routes every 12, 24, 48 and 72 hours, and prints for each the simulated vends
+per minute of wall time, the revenue, the lost sales and the slot hours out of stock.
+"""
+import argparse
+import time
+
+from vending_machine.money import format_money
+from vending_machine.simulation import FleetSimulation
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the fleet simulator with several restock intervals.')
+    parser.add_argument('--machines', type=int, default=1000)
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--arrival-rate', type=float, default=4.0, help='customers per machine and hour')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{args.machines:,} machines, {args.days} days, {args.arrival_rate} customers per machine and hour')
+    print(f'{"restock":>8} {"vends/min":>12} {"vends":>10} {"revenue":>14} {"lost":>9} {"stockout h":>11} '
+          f'{"max cash":>10}')
+
+    for restock_interval in (12, 24, 48, 72):
+        simulation = FleetSimulation(machines=args.machines, arrival_rate=args.arrival_rate,
+                                     restock_interval=restock_interval, seed=args.seed)
+
+        started = time.perf_counter()
+        report = simulation.run(args.days * 24)
+        seconds = time.perf_counter() - started
+
+        max_cash_cents = max(machine.max_cash_cents for machine in report.machines)
+        print(f'{restock_interval:>7}h {report.vends / seconds * 60:>12,.0f} {report.vends:>10,} '
+              f'{format_money(report.revenue_cents):>14} {report.lost_sales:>9,} {report.stockout_hours:>11,.0f} '
+              f'{format_money(max_cash_cents):>10}')
+
+
+if __name__ == '__main__':
+    main()
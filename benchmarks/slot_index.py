@@ -0,0 +1,56 @@
+"""Slot queries through the slot index against scanning slot_items, on machines of growing size.
+
+Usage:
+    python -m benchmarks.slot_index [--occupied N] [--queries N]
+
+Every machine holds the same --occupied items, so the index costs should stay flat while the scans grow with the
+number of slots.
+"""
+import argparse
+import time
+
+from vending_machine.vending_machine import Item, VendingMachine
+
+
+def scan_queries(vending_machine):
+    slot_items = vending_machine.slot_items
+    occupied = {slot for slot, item in slot_items.items() if item is not None}
+    by_name = {slot for slot, item in slot_items.items() if item is not None and item.name == 'Item 7'}
+    low_stock = sorted((item.stock, slot) for slot, item in slot_items.items() if item is not None and item.stock <= 2)
+    return occupied, by_name, low_stock
+
+
+def index_queries(vending_machine):
+    return vending_machine.occupied_slots(), vending_machine.find_slots('Item 7'), vending_machine.low_stock_slots(2)
+
+
+def measure(function, vending_machine, queries):
+    started = time.perf_counter()
+    for _ in range(queries):
+        function(vending_machine)
+    return (time.perf_counter() - started) / queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare indexed slot queries with scans.')
+    parser.add_argument('--occupied', type=int, default=100)
+    parser.add_argument('--queries', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f'{"slots":>10} {"scan":>12} {"index":>12}')
+
+    for slots in (10 ** 4, 10 ** 5, 10 ** 6):
+        vending_machine = VendingMachine(slots=slots)
+        step = slots // args.occupied
+        for n in range(args.occupied):
+            vending_machine.add_item_to_slot(1 + n * step, Item(f'Item {n % 10}', 1, n % 5))
+        vending_machine.occupied_slots()
+
+        scan_seconds = measure(scan_queries, vending_machine, args.queries)
+        index_seconds = measure(index_queries, vending_machine, args.queries)
+
+        print(f'{slots:>10,} {scan_seconds * 1e6:>10,.0f}us {index_seconds * 1e6:>10,.0f}us')
+
+
+if __name__ == '__main__':
+    main()
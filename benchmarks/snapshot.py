@@ -0,0 +1,70 @@
+"""Controller restart time: rebuilding VendingMachine objects against memory-mapping a fleet snapshot.
+
+Usage:
+    python -m benchmarks.snapshot [--machines N] [--slots S]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from vending_machine.abstract_provider import get_default_provider
+from vending_machine.fleet import VendingFleet
+from vending_machine.snapshot import load_fleet_snapshot, open_fleet_snapshot, save_fleet_snapshot
+from vending_machine.vending_machine import Item, VendingMachine
+
+MENU = [('Sparkling Water', 1.25), ('Soda', 0.75), ('Coffee', 1.75), ('Energy Drink', 1.50), ('Lemonade', 2.00)]
+
+
+def timed(label, function):
+    started = time.perf_counter()
+    result = function()
+    print(f'{label:<36} {time.perf_counter() - started:8.3f} s')
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare ways of restoring a fleet on restart.')
+    parser.add_argument('--machines', type=int, default=100000)
+    parser.add_argument('--slots', type=int, default=9)
+    args = parser.parse_args()
+
+    get_default_provider()
+
+    fleet = VendingFleet(args.machines, slots=args.slots)
+    for vending_machine in fleet:
+        for slot in range(1, args.slots + 1):
+            name, price = MENU[slot % len(MENU)]
+            vending_machine.add_item_to_slot(slot, Item(name, price, 20))
+
+    def rebuild_objects():
+        machines = []
+        for machine_id in range(args.machines):
+            vending_machine = VendingMachine(slots=args.slots)
+            for slot in range(1, args.slots + 1):
+                name, price = MENU[slot % len(MENU)]
+                vending_machine.add_item_to_slot(slot, Item(name, price, 20))
+            machines.append(vending_machine)
+        return machines
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'fleet.snapshot')
+
+        timed('save_fleet_snapshot', lambda: save_fleet_snapshot(fleet, path))
+        print(f'{"snapshot size":<36} {os.path.getsize(path) / 2 ** 20:8.1f} MiB')
+
+        timed('rebuild VendingMachine objects', rebuild_objects)
+        timed('load_fleet_snapshot (read)', lambda: load_fleet_snapshot(path))
+        snapshot = timed('open_fleet_snapshot (mmap)', lambda: open_fleet_snapshot(path))
+
+        def touch_and_checkpoint():
+            for machine_id in range(0, args.machines, 100):
+                snapshot.fleet.machine(machine_id).decrease_stock(1)
+            snapshot.checkpoint()
+
+        timed(f'update {args.machines // 100} machines + checkpoint', touch_and_checkpoint)
+        snapshot.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Dense against sparse slot storage on a machine with a huge slot count.
+
+Usage:
+    python -m benchmarks.sparse_slots [--slots N] [--occupied N] [--vends N]
+
+Measures the construction time and memory of the machine, then the cost of stocking --occupied slots, listing the
+occupied slots and vending a batch, for both storages.
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from vending_machine.vending_machine import Item, VendingMachine
+
+
+def build(slots, sparse):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    vending_machine = VendingMachine(slots=slots, sparse=sparse)
+    seconds = time.perf_counter() - started
+    allocated, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return vending_machine, seconds, allocated
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started
+
+
+def stock(vending_machine, slot_numbers):
+    for n, slot_number in enumerate(slot_numbers):
+        vending_machine.add_item_to_slot(slot_number, Item(f'Item {n % 50}', 1, 10))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare dense and sparse slot storage.')
+    parser.add_argument('--slots', type=int, default=10 ** 6)
+    parser.add_argument('--occupied', type=int, default=1000)
+    parser.add_argument('--vends', type=int, default=10000)
+    args = parser.parse_args()
+
+    step = args.slots // args.occupied
+    slot_numbers = [1 + n * step for n in range(args.occupied)]
+    requests = [(100, slot_numbers[n % args.occupied]) for n in range(args.vends)]
+
+    print(f'{args.slots:,} slots, {args.occupied:,} occupied')
+    print(f'{"storage":>8} {"build":>10} {"memory":>12} {"stock":>10} {"listing":>10} {"vend_many":>10}')
+
+    for sparse in (False, True):
+        vending_machine, build_seconds, allocated = build(args.slots, sparse)
+        stock_seconds = timed(stock, vending_machine, slot_numbers)
+        listing_seconds = timed(lambda: [vending_machine.slot_items[slot] for slot in
+                                         sorted(vending_machine.occupied_slots())])
+        vend_seconds = timed(vending_machine.vend_many, requests, False)
+
+        print(f'{"sparse" if sparse else "dense":>8} {build_seconds * 1e3:>8.1f}ms {allocated / 2 ** 20:>9.2f}MiB '
+              f'{stock_seconds * 1e3:>8.1f}ms {listing_seconds * 1e3:>8.2f}ms {vend_seconds * 1e3:>8.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""Cold start benchmark of main.py.
+
+Usage:
+    python -m benchmarks.startup [--runs N] [--budget-us US]
+
+Exits with a non-zero status when the median import time of main.py exceeds the budget.
+"""
+import argparse
+import sys
+
+from vending_machine.startup import COLD_START_BUDGET_US, measure_import_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the cold start import time of main.py.')
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--budget-us', type=int, default=COLD_START_BUDGET_US)
+    args = parser.parse_args()
+
+    total_us, module_times = measure_import_time('main', runs=args.runs)
+
+    for name, cumulative_us in sorted(module_times.items(), key=lambda entry: -entry[1]):
+        print(f'{name:<40} {cumulative_us:>10} us')
+
+    print(f'\nmain.py cold start: {total_us} us (budget {args.budget_us} us)')
+
+    if total_us > args.budget_us:
+        print('Cold start budget exceeded!')
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,40 @@
+import pytest
+
+from vending_machine.fleet import VendingFleet
+
+pytest.importorskip('pytest_benchmark')
+
+# Same size as the fleet fixture.
+MACHINES = 10000
+
+
+def test_build_fleet(benchmark, stub_provider):
+    fleet = benchmark(VendingFleet, MACHINES, slots=9, abstract_provider=stub_provider)
+
+    assert len(fleet) == MACHINES
+
+
+def test_vend_across_fleet(benchmark, fleet):
+    fleet_machines = [fleet.machine(machine_id) for machine_id in range(MACHINES)]
+
+    def vend_everywhere():
+        for fleet_machine in fleet_machines:
+            fleet_machine.vend_many([(2, 1), (0, 5)], abstracts=False)
+
+    benchmark(vend_everywhere)
+
+    assert fleet.stock[0] < 10 ** 9
+
+
+def test_restock_fleet(benchmark, fleet):
+    def restock_everywhere():
+        for fleet_machine in fleet:
+            fleet_machine.increase_stock(3, 10)
+
+    benchmark(restock_everywhere)
+
+
+def test_fleet_low_stock_scan(benchmark, fleet):
+    fleet_machines = [fleet.machine(machine_id) for machine_id in range(0, MACHINES, 100)]
+
+    benchmark(lambda: [fleet_machine.low_stock_slots(5) for fleet_machine in fleet_machines])
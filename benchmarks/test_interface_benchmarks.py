@@ -0,0 +1,53 @@
+import pytest
+
+from vending_machine.console import HeadlessConsole
+from vending_machine.vending_machine import VendingMachineInterface
+
+pytest.importorskip('pytest_benchmark')
+
+# Customer session going through every menu screen: insert, vend, remove, then the maintenance listing.
+SESSION = ['i', '1.75', '1', 'i', '0.75', '5', 'r', '0.25', 'm', 'd', 'm'] * 20 + ['q']
+
+
+class ScreenConsole(HeadlessConsole):
+    """Headless console that still has the menus rendered, to measure the rendering without a terminal."""
+
+    show_menus = True
+
+    def __init__(self, script):
+        super().__init__(script)
+        self.screen_bytes = 0
+
+    def write_screen(self, screen):
+        self.screen_bytes += len(screen)
+
+
+def test_customer_screen(benchmark, vending_machine):
+    interface = VendingMachineInterface(vending_machine, console=ScreenConsole([]))
+
+    screen = benchmark(interface.renderer.customer_screen)
+
+    assert 'Sparkling Water' in screen
+
+
+def test_slot_items_screen(benchmark, vending_machine):
+    interface = VendingMachineInterface(vending_machine, console=ScreenConsole([]))
+
+    screen = benchmark(interface.renderer.slot_items_screen)
+
+    assert screen.count('\n[') == 9
+
+
+def test_menu_session(benchmark, vending_machine):
+    def run_session():
+        console = ScreenConsole(SESSION)
+        VendingMachineInterface(vending_machine, console=console).run()
+        return console
+
+    console = benchmark(run_session)
+
+    assert console.screen_bytes > 0
+
+
+def test_headless_session(benchmark, vending_machine):
+    benchmark(lambda: VendingMachineInterface(vending_machine, console=HeadlessConsole(SESSION)).run())
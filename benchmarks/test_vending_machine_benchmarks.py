@@ -0,0 +1,88 @@
+import pytest
+
+from vending_machine.vending_machine import Item
+
+pytest.importorskip('pytest_benchmark')
+
+
+def test_select_and_vend(benchmark, vending_machine):
+    vending_machine.insert_money(10 ** 9)
+
+    vended, item_summary, vend_result, total_balance = benchmark(vending_machine.select_and_vend, 1)
+
+    assert vended
+
+
+def test_select_and_vend_failure(benchmark, vending_machine):
+    vended, item_summary, vend_result, total_balance = benchmark(vending_machine.select_and_vend, 1)
+
+    assert not vended
+
+
+def test_vend_many(benchmark, vending_machine):
+    requests = [(1.75, n % 9 + 1) for n in range(1000)]
+
+    result = benchmark(vending_machine.vend_many, requests)
+
+    assert len(result) == 1000
+
+
+def test_insert_and_remove_money(benchmark, vending_machine):
+    def insert_and_remove():
+        vending_machine.insert_money(1.25)
+        vending_machine.remove_money(1.25)
+
+    benchmark(insert_and_remove)
+
+    assert vending_machine.balance_cents == 0
+
+
+def test_current_balance(benchmark, vending_machine):
+    vending_machine.insert_money(12.5)
+
+    assert benchmark(lambda: vending_machine.current_balance) == 12.5
+
+
+def test_add_and_remove_item(benchmark, vending_machine):
+    vending_machine.remove_item_from_slot(9)
+
+    def add_and_remove():
+        vending_machine.add_item_to_slot(9, Item('Lemonade', 2, 5))
+        vending_machine.remove_item_from_slot(9)
+
+    benchmark(add_and_remove)
+
+    assert vending_machine.slot_items[9] is None
+
+
+def test_move_item(benchmark, vending_machine):
+    vending_machine.remove_item_from_slot(9)
+
+    def move_there_and_back():
+        vending_machine.move_item_to_slot(1, 9)
+        vending_machine.move_item_to_slot(9, 1)
+
+    benchmark(move_there_and_back)
+
+    assert vending_machine.slot_items[9] is None
+
+
+def test_modify_item(benchmark, vending_machine):
+    def modify():
+        vending_machine.change_name(1, 'Still Water')
+        vending_machine.change_price(1, 1.5)
+        vending_machine.increase_stock(1, 2)
+        vending_machine.decrease_stock(1, 2)
+
+    benchmark(modify)
+
+    assert vending_machine.slot_items[1].name == 'Still Water'
+
+
+def test_slot_queries(benchmark, vending_machine):
+    def query():
+        return vending_machine.occupied_slots(), vending_machine.find_slots('Soda'), vending_machine.low_stock_slots()
+
+    occupied, soda_slots, low_stock = benchmark(query)
+
+    assert len(occupied) == 9
@@ -0,0 +1,64 @@
+"""Throughput of a ThreadSafeVendingMachine driven by 1, 2, 4 and 8 threads vending from different slots.
+
+Usage:
+    python -m benchmarks.threadsafe [--vends N] [--lookup-ms MS]
+
+Every vend looks up its abstract through a stub provider sleeping --lookup-ms, without a cache, to stand in for the
+network. Per-slot locks let those waits overlap across threads, while the vends themselves are still serialized by
+the GIL.
+"""
+import argparse
+import threading
+import time
+
+from vending_machine.threadsafe import ThreadSafeVendingMachine
+from vending_machine.vending_machine import Item
+
+
+class SleepingProvider:
+
+    def __init__(self, lookup_seconds):
+        self.lookup_seconds = lookup_seconds
+
+    def fetch(self, search_term):
+        time.sleep(self.lookup_seconds)
+        return f'About {search_term}'
+
+
+def run(thread_count, vends, provider):
+    vending_machine = ThreadSafeVendingMachine(slots=thread_count, abstract_provider=provider)
+    for slot in range(1, thread_count + 1):
+        vending_machine.add_item_to_slot(slot, Item(f'Item {slot}', 1, vends))
+    vending_machine.insert_money(vends)
+
+    def vend(slot):
+        for _ in range(vends // thread_count):
+            vending_machine.select_and_vend(slot)
+
+    threads = [threading.Thread(target=vend, args=(slot,)) for slot in range(1, thread_count + 1)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure vend throughput across threads.')
+    parser.add_argument('--vends', type=int, default=2000)
+    parser.add_argument('--lookup-ms', type=float, default=1.0)
+    args = parser.parse_args()
+
+    provider = SleepingProvider(args.lookup_ms / 1000)
+    baseline = None
+
+    for thread_count in (1, 2, 4, 8):
+        seconds = run(thread_count, args.vends, provider)
+        baseline = baseline or seconds
+        print(f'{thread_count} threads: {args.vends / seconds:12,.0f} vends/s ({baseline / seconds:,.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Throughput of VendingMachine.vend_many against a Python loop over insert_money and select_and_vend.
+
+Usage:
+    python -m benchmarks.vend_many [--requests N] [--lookup-ms MS]
+
+The abstract provider is replaced by a stub sleeping --lookup-ms per lookup to stand in for the network.
+"""
+import argparse
+import random
+import time
+
+from vending_machine.vending_machine import Item, VendingMachine
+
+
+class SleepingProvider:
+
+    def __init__(self, lookup_seconds):
+        self.lookup_seconds = lookup_seconds
+
+    def fetch(self, search_term):
+        time.sleep(self.lookup_seconds)
+        return f'About {search_term}'
+
+
+def build_machine(provider):
+    vending_machine = VendingMachine(abstract_provider=provider)
+    for slot, (name, price) in enumerate([('Soda', 0.75), ('Coffee', 1.75), ('Water', 1.25)], start=1):
+        vending_machine.add_item_to_slot(slot, Item(name, price, 10 ** 9))
+    return vending_machine
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare vend_many with a loop over select_and_vend.')
+    parser.add_argument('--requests', type=int, default=200000)
+    parser.add_argument('--lookup-ms', type=float, default=0.0)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    requests = [(rng.choice((0, 1, 2)), rng.randint(1, 4)) for _ in range(args.requests)]
+    provider = SleepingProvider(args.lookup_ms / 1000)
+
+    vending_machine = build_machine(provider)
+    started = time.perf_counter()
+    for amount, slot_number in requests:
+        vending_machine.insert_money(amount)
+        vending_machine.select_and_vend(slot_number)
+    loop_seconds = time.perf_counter() - started
+
+    vending_machine = build_machine(provider)
+    started = time.perf_counter()
+    vending_machine.vend_many(requests)
+    batch_seconds = time.perf_counter() - started
+
+    print(f'select_and_vend loop: {args.requests / loop_seconds:12,.0f} requests/s')
+    print(f'vend_many:            {args.requests / batch_seconds:12,.0f} requests/s '
+          f'({loop_seconds / batch_seconds:,.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,73 @@
+import argparse
+import contextlib
+import os
+import sys
+
+from vending_machine.abstract_cache import AbstractCache
+from vending_machine.abstract_prefetcher import AbstractPrefetcher
+from vending_machine.abstract_provider import NoAbstractProvider
+from vending_machine.console import HeadlessConsole
+from vending_machine.snapshot import load_snapshot, save_snapshot
+from vending_machine.startup import warmup_in_background
 from vending_machine.vending_machine import VendingMachineInterface
 
+
+def main():
+    parser = argparse.ArgumentParser(description='Vending machine')
+    parser.add_argument('--state', help='snapshot file to restore the machine from and save it to on exit')
+    parser.add_argument('--serve', metavar='ADDRESS',
+                        help='serve the machine over the network on HOST:PORT or unix:PATH instead of the menu')
+    parser.add_argument('--script', metavar='PATH',
+                        help='run the menu headless on the commands of a script file, - for standard input')
+    parser.add_argument('--events', metavar='PATH',
+                        help='with --script, write the state changes as JSON lines to a file, - for standard output')
+    parser.add_argument('--metrics', metavar='ADDRESS',
+                        help='serve Prometheus metrics over HTTP on HOST:PORT or unix:PATH')
+    args = parser.parse_args()
+
+    # Nobody reads the abstracts of a headless run, so they are not looked up.
+    abstract_provider = NoAbstractProvider() if args.script else None
+
+    vending_machine = None
+    if args.state and os.path.exists(args.state):
+        vending_machine = load_snapshot(
+            args.state, abstract_cache=AbstractCache(), abstract_prefetcher=AbstractPrefetcher(max_workers=2),
+            abstract_provider=abstract_provider,
+        )
+
+    with contextlib.ExitStack() as files:
+        console = None
+        if args.script:
+            script = sys.stdin if args.script == '-' else files.enter_context(open(args.script))
+            events = None
+            if args.events:
+                events = sys.stdout if args.events == '-' else files.enter_context(open(args.events, 'w'))
+            console = HeadlessConsole(script, output=events)
+
+        interface = VendingMachineInterface(vending_machine, console=console, abstract_provider=abstract_provider)
+        if not args.script:
+            warmup_in_background(interface.vending_machine)
+
+        if args.metrics:
+            # Imported on use so that a machine without metrics starts as fast as before.
+            from vending_machine.metrics import Metrics, MetricsServer
+
+            metrics = Metrics()
+            metrics.enable(type(interface.vending_machine))
+            MetricsServer(metrics, args.metrics)
+
+        try:
+            if args.serve:
+                # Imported on use, asyncio alone would make every start slower.
+                from vending_machine.server import run_server
+
+                run_server(interface.vending_machine, args.serve)
+            else:
+                interface.run()
+        finally:
+            if args.state:
+                save_snapshot(interface.vending_machine, args.state)
+
+
 if __name__ == '__main__':
-    VendingMachineInterface().run()
+    main()
@@ -1,11 +1,19 @@
-from unittest.mock import patch
-from vending_machine.vending_machine import VendingMachineInterface
+from unittest.mock import MagicMock, patch
+from vending_machine.abstract_provider import NoAbstractProvider, get_default_provider
+from vending_machine.console import HeadlessConsole
+from vending_machine.vending_machine import Item, VendingMachine, VendingMachineInterface
 
+import io
+import json
 import unittest
 
 
 class VendingMachineCustomerMenuTest(unittest.TestCase):
 
+    def setUp(self):
+        # Machines share the default provider, keep the failures of earlier tests from opening its circuit breaker.
+        get_default_provider().circuit_breaker.reset()
+
     def test_insert_money(self):
         interface = VendingMachineInterface()
 
@@ -25,6 +33,10 @@ class VendingMachineCustomerMenuTest(unittest.TestCase):
 
 class VendingMachineMaintenanceModeTest(unittest.TestCase):
 
+    def setUp(self):
+        # Machines share the default provider, keep the failures of earlier tests from opening its circuit breaker.
+        get_default_provider().circuit_breaker.reset()
+
     def test_add_item_to_slot_two(self):
 
         interface = VendingMachineInterface()
@@ -52,5 +64,56 @@ class VendingMachineMaintenanceModeTest(unittest.TestCase):
         self.assertEqual(14, interface.vending_machine.slot_items[2].stock)
 
 
+@patch('vending_machine.vending_machine.VendingMachine._get_abstract', MagicMock(return_value=''))
+class VendingMachineHeadlessTest(unittest.TestCase):
+
+    def setUp(self):
+        # Machines share the default provider, keep the failures of earlier tests from opening its circuit breaker.
+        get_default_provider().circuit_breaker.reset()
+
+    def test_script_reports_events(self):
+        output = io.StringIO()
+        script = io.StringIO('m\na\n2\nLemonade\n2.00\n15\nm\ni\n2.25\n2\n3\nq\n')
+        interface = VendingMachineInterface(console=HeadlessConsole(script, output=output))
+
+        with patch('builtins.print') as print_mock, patch('builtins.input') as input_mock:
+            interface.run()
+
+        print_mock.assert_not_called()
+        input_mock.assert_not_called()
+        self.assertEqual([
+            {'event': 'add', 'slot': 2, 'name': 'Lemonade', 'price': 200, 'stock': 15, 'added': True},
+            {'event': 'insert', 'amount': 225, 'inserted': True, 'balance': 225},
+            {'event': 'vend', 'slot': 2, 'vended': True, 'result': 'Vended: Lemonade', 'balance': 25},
+        ], [json.loads(line) for line in output.getvalue().splitlines()])
+        self.assertEqual(14, interface.vending_machine.slot_items[2].stock)
+
+    def test_script_machine_uses_given_provider(self):
+        provider = NoAbstractProvider()
+        interface = VendingMachineInterface(console=HeadlessConsole(['q']), abstract_provider=provider)
+
+        interface.run()
+
+        self.assertIs(provider, interface.vending_machine.abstract_provider)
+        self.assertEqual('Sparkling Water', interface.vending_machine.slot_items[1].name)
+
+    def test_end_of_script_ends_session(self):
+        interface = VendingMachineInterface(console=HeadlessConsole(['i', '1', 'm', 'mod', '1']))
+
+        interface.run()
+
+        self.assertEqual(1.0, interface.vending_machine.current_balance)
+
+    def test_long_replay(self):
+        vending_machine = VendingMachine()
+        interface = VendingMachineInterface(vending_machine, console=HeadlessConsole(['i', '1', '1'] * 10000))
+        vending_machine.add_item_to_slot(1, Item('Soda', 1, 10000))
+
+        interface.run()
+
+        self.assertEqual(0, vending_machine.slot_items[1].stock)
+        self.assertEqual(0, vending_machine.current_balance)
+
+
 if __name__ == '__main__':
     unittest.main()
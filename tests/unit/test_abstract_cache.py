@@ -0,0 +1,143 @@
+from unittest.mock import MagicMock, patch
+from vending_machine.abstract_cache import AbstractCache, normalize_search_term
+from vending_machine.vending_machine import Item, VendingMachine
+
+import json
+import os
+import tempfile
+import time
+import unittest
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class AbstractCacheTestCase(unittest.TestCase):
+
+    def test_normalize_search_term(self):
+        self.assertEqual('sparkling water', normalize_search_term('  Sparkling   WATER '))
+
+    def test_get_missing_entry(self):
+        cache = AbstractCache()
+
+        self.assertIsNone(cache.get('Soda'))
+        self.assertEqual({'hits': 0, 'misses': 1, 'evictions': 0, 'entries': 0}, cache.stats())
+
+    def test_get_normalized_entry(self):
+        cache = AbstractCache()
+        cache.set('Soda', 'A sweet drink')
+
+        self.assertEqual('A sweet drink', cache.get(' soda'))
+        self.assertEqual(1, cache.hits)
+
+    def test_least_recently_used_entry_evicted(self):
+        cache = AbstractCache(max_entries=2)
+        cache.set('Soda', 'soda')
+        cache.set('Coffee', 'coffee')
+        cache.get('Soda')
+        cache.set('Water', 'water')
+
+        self.assertNotIn('Coffee', cache)
+        self.assertIn('Soda', cache)
+        self.assertIn('Water', cache)
+        self.assertEqual(1, cache.evictions)
+
+    def test_expired_entry(self):
+        clock = FakeClock()
+        cache = AbstractCache(ttl=60, clock=clock)
+        cache.set('Soda', 'soda')
+
+        clock.now += 61
+
+        self.assertIsNone(cache.get('Soda'))
+        self.assertEqual(1, cache.evictions)
+        self.assertEqual(0, len(cache))
+
+    def test_entries_survive_restart(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'abstracts.json')
+            cache = AbstractCache(path=path)
+            cache.set('Soda', 'soda')
+            cache.flush()
+
+            self.assertEqual('soda', AbstractCache(path=path).get('Soda'))
+
+    def test_writes_are_batched(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'abstracts.json')
+            cache = AbstractCache(path=path, save_delay=0.01)
+
+            with patch('vending_machine.abstract_cache.json.dump', wraps=json.dump) as dump:
+                for name in ('Soda', 'Coffee', 'Water'):
+                    cache.set(name, name.lower())
+
+                self.assertFalse(os.path.exists(path))
+
+                deadline = time.monotonic() + 5
+                while not os.path.exists(path) and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                cache.flush()
+
+            self.assertEqual(1, dump.call_count)
+            self.assertEqual(3, len(AbstractCache(path=path)))
+
+    def test_malformed_file_ignored(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'abstracts.json')
+
+            for content in ('not json', '[1, 2]', '{"entries": [1]}', '{"entries": {"soda": "soda", "tea": [1]}}',
+                            '{"entries": {"soda": ["soda", 1e12], "tea": ["tea"]}}'):
+                with open(path, 'w', encoding='utf-8') as cache_file:
+                    cache_file.write(content)
+
+                self.assertIsNone(AbstractCache(path=path, clock=lambda: 1e12).get('tea'))
+
+            # Well-formed entries of a partly malformed file are kept.
+            self.assertIn('soda', AbstractCache(path=path, clock=lambda: 1e12))
+
+    def test_expired_entries_not_loaded(self):
+        clock = FakeClock()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'abstracts.json')
+            cache = AbstractCache(ttl=60, path=path, clock=clock)
+            cache.set('Soda', 'soda')
+            cache.flush()
+
+            clock.now += 61
+
+            self.assertEqual(0, len(AbstractCache(ttl=60, path=path, clock=clock)))
+
+    def test_select_and_vend_seen_item_skips_fetch(self):
+        vending_machine = VendingMachine(abstract_cache=AbstractCache())
+        vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 20))
+        vending_machine.insert_money(10)
+
+        fetch_abstract = MagicMock(return_value='A sweet drink')
+
+        with patch.object(VendingMachine, '_fetch_abstract', fetch_abstract):
+            vending_machine.select_and_vend(1)
+            vended, item_summary, vend_result, total_balance = vending_machine.select_and_vend(1)
+
+        self.assertTrue(vended)
+        self.assertEqual('A sweet drink', item_summary)
+        fetch_abstract.assert_called_once_with('Soda')
+
+    def test_failed_fetch_not_cached(self):
+        cache = AbstractCache()
+        vending_machine = VendingMachine(abstract_cache=cache)
+
+        with patch.object(VendingMachine, '_fetch_abstract', MagicMock(return_value=None)):
+            self.assertEqual('', vending_machine._get_abstract('Soda'))
+
+        self.assertEqual(0, len(cache))
+
+
+if __name__ == '__main__':
+    unittest.main()
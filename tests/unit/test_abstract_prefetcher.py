@@ -0,0 +1,103 @@
+from unittest.mock import MagicMock, patch
+from vending_machine.abstract_cache import AbstractCache
+from vending_machine.abstract_prefetcher import AbstractPrefetcher
+from vending_machine.vending_machine import Item, VendingMachine
+
+import threading
+import unittest
+
+
+class AbstractPrefetcherTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.prefetcher = AbstractPrefetcher(max_workers=2)
+
+    def tearDown(self):
+        self.prefetcher.shutdown()
+
+    def test_submit_resolves_lookup(self):
+        future = self.prefetcher.submit('Soda', lambda search_term: f'About {search_term}')
+
+        self.assertEqual('About Soda', future.result(timeout=5))
+
+    def test_submit_reuses_running_lookup(self):
+        release = threading.Event()
+        lookup = MagicMock(side_effect=lambda search_term: release.wait(5) and 'soda')
+
+        first_future = self.prefetcher.submit('Soda', lookup)
+        second_future = self.prefetcher.submit(' SODA', lookup)
+        release.set()
+
+        self.assertIs(first_future, second_future)
+        self.assertEqual('soda', second_future.result(timeout=5))
+        lookup.assert_called_once_with('Soda')
+
+    def test_pending_forgets_finished_lookup(self):
+        self.prefetcher.submit('Soda', lambda search_term: 'soda').result(timeout=5)
+
+        self.assertIsNone(self.prefetcher.pending('Soda'))
+
+    def test_add_item_to_slot_prefetches_abstract(self):
+        cache = AbstractCache()
+        vending_machine = VendingMachine(abstract_cache=cache, abstract_prefetcher=self.prefetcher)
+
+        with patch.object(VendingMachine, '_fetch_abstract', MagicMock(return_value='A sweet drink')):
+            vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 20))
+            self.prefetcher.shutdown()
+
+        self.assertEqual('A sweet drink', cache.get('Soda'))
+
+    def test_replace_item_in_slot_prefetches_abstract(self):
+        cache = AbstractCache()
+        vending_machine = VendingMachine(abstract_cache=cache, abstract_prefetcher=self.prefetcher)
+
+        with patch.object(VendingMachine, '_fetch_abstract', MagicMock(return_value='Hot drink')):
+            vending_machine.replace_item_in_slot(1, Item('Coffee', 1.75, 6))
+            self.prefetcher.shutdown()
+
+        self.assertIn('Coffee', cache)
+
+    def test_select_and_vend_deferred_does_not_wait_for_abstract(self):
+        release = threading.Event()
+        vending_machine = VendingMachine(abstract_prefetcher=self.prefetcher)
+        vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 20))
+        vending_machine.insert_money(2)
+
+        summaries = []
+
+        with patch.object(VendingMachine, '_fetch_abstract', MagicMock(side_effect=lambda term: release.wait(5) and 'Fizzy')):
+            vended, item_summary, vend_result, total_balance = \
+                vending_machine.select_and_vend_deferred(1, on_summary=summaries.append)
+
+            self.assertTrue(vended)
+            self.assertEqual('Vended: Soda', vend_result)
+            self.assertEqual(0.75, total_balance)
+            self.assertEqual(19, vending_machine.slot_items[1].stock)
+            self.assertFalse(item_summary.done())
+
+            release.set()
+            self.assertEqual('Fizzy', item_summary.result(timeout=5))
+
+        self.assertEqual(['Fizzy'], summaries)
+
+    def test_select_and_vend_deferred_insufficient_balance(self):
+        vending_machine = VendingMachine(abstract_prefetcher=self.prefetcher)
+        vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 20))
+
+        with patch.object(VendingMachine, '_fetch_abstract', MagicMock(return_value='Fizzy')):
+            vended, item_summary, vend_result, total_balance = vending_machine.select_and_vend_deferred(1)
+
+            self.assertFalse(vended)
+            self.assertEqual('Insufficient Balance', vend_result)
+            self.assertEqual('Fizzy', item_summary.result(timeout=5))
+
+    def test_select_and_vend_deferred_empty_slot(self):
+        vended, item_summary, vend_result, total_balance = VendingMachine().select_and_vend_deferred(1)
+
+        self.assertFalse(vended)
+        self.assertEqual('Empty Slot', vend_result)
+        self.assertEqual('', item_summary.result())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from contextlib import redirect_stderr, redirect_stdout
+from vending_machine.abstract_provider import AbstractProvider, CircuitBreaker, NoAbstractProvider
+from vending_machine.vending_machine import Item, VendingMachine
+
+import io
+import json
+import threading
+import time
+import unittest
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        server.client_ports.add(self.client_address[1])
+
+        if server.delay:
+            time.sleep(server.delay)
+
+        if server.failures_left > 0:
+            server.failures_left -= 1
+            self._respond(503, b'')
+            return
+
+        search_term = parse_qs(urlparse(self.path).query)['q'][0]
+        self._respond(200, json.dumps({'AbstractText': f'About {search_term}'}).encode())
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class AbstractProviderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.server.requests = 0
+        self.server.client_ports = set()
+        self.server.delay = 0
+        self.server.failures_left = 0
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+        self.search_url = f'http://127.0.0.1:{self.server.server_address[1]}/'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_fetch_success(self):
+        provider = AbstractProvider(search_url=self.search_url)
+
+        self.assertEqual('About soda', provider.fetch('Soda'))
+        provider.close()
+
+    def test_fetch_reuses_connection(self):
+        provider = AbstractProvider(search_url=self.search_url)
+
+        for _ in range(5):
+            provider.fetch('Soda')
+
+        self.assertEqual(5, self.server.requests)
+        self.assertEqual(1, len(self.server.client_ports))
+        provider.close()
+
+    def test_fetch_retries_server_errors(self):
+        self.server.failures_left = 2
+        provider = AbstractProvider(search_url=self.search_url, retries=2, backoff_factor=0)
+
+        self.assertEqual('About soda', provider.fetch('Soda'))
+        self.assertEqual(3, self.server.requests)
+        provider.close()
+
+    def test_fetch_read_timeout(self):
+        self.server.delay = 0.5
+        provider = AbstractProvider(search_url=self.search_url, read_timeout=0.1, retries=0)
+
+        self.assertIsNone(provider.fetch('Soda'))
+        provider.close()
+
+    def test_fetch_errors_reported_on_stderr(self):
+        self.server.failures_left = 1
+        provider = AbstractProvider(search_url=self.search_url, retries=0)
+        stdout, stderr = io.StringIO(), io.StringIO()
+
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            self.assertIsNone(provider.fetch('Soda'))
+
+        self.assertEqual('', stdout.getvalue())
+        self.assertIn('Could not establish a connection', stderr.getvalue())
+        provider.close()
+
+    def test_no_abstract_provider_skips_lookups(self):
+        vending_machine = VendingMachine(abstract_provider=NoAbstractProvider())
+        vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 20))
+        vending_machine.insert_money(2)
+
+        self.assertEqual('', vending_machine.select_and_vend(1)[1])
+
+    def test_open_circuit_skips_upstream(self):
+        self.server.failures_left = 10
+        provider = AbstractProvider(
+            search_url=self.search_url, retries=0, circuit_breaker=CircuitBreaker(failure_threshold=2)
+        )
+
+        provider.fetch('Soda')
+        provider.fetch('Soda')
+        requests_before_open = self.server.requests
+
+        self.assertIsNone(provider.fetch('Soda'))
+        self.assertEqual(requests_before_open, self.server.requests)
+        provider.close()
+
+    def test_vending_machine_falls_back_to_empty_abstract(self):
+        self.server.failures_left = 10
+        provider = AbstractProvider(search_url=self.search_url, retries=0)
+
+        vending_machine = VendingMachine(abstract_provider=provider)
+        vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 20))
+        vending_machine.insert_money(2)
+        vended, item_summary, vend_result, total_balance = vending_machine.select_and_vend(1)
+
+        self.assertTrue(vended)
+        self.assertEqual('', item_summary)
+        provider.close()
+
+
+class CircuitBreakerTestCase(unittest.TestCase):
+
+    def test_opens_after_threshold(self):
+        circuit_breaker = CircuitBreaker(failure_threshold=2)
+        circuit_breaker.record_failure()
+
+        self.assertTrue(circuit_breaker.allow())
+
+        circuit_breaker.record_failure()
+
+        self.assertFalse(circuit_breaker.allow())
+        self.assertEqual(CircuitBreaker.OPEN, circuit_breaker.state)
+
+    def test_half_open_after_reset_timeout(self):
+        clock = FakeClock()
+        circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        circuit_breaker.record_failure()
+        clock.now += 10
+
+        self.assertTrue(circuit_breaker.allow())
+        self.assertFalse(circuit_breaker.allow())
+
+        circuit_breaker.record_success()
+
+        self.assertEqual(CircuitBreaker.CLOSED, circuit_breaker.state)
+        self.assertTrue(circuit_breaker.allow())
+
+    def test_reset_closes_open_breaker(self):
+        circuit_breaker = CircuitBreaker(failure_threshold=1)
+        circuit_breaker.record_failure()
+        circuit_breaker.reset()
+
+        self.assertEqual((CircuitBreaker.CLOSED, 0), (circuit_breaker.state, circuit_breaker.failures))
+        self.assertTrue(circuit_breaker.allow())
+
+    def test_failed_trial_reopens(self):
+        clock = FakeClock()
+        circuit_breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+
+        for _ in range(3):
+            circuit_breaker.record_failure()
+
+        clock.now += 10
+        circuit_breaker.allow()
+        circuit_breaker.record_failure()
+
+        self.assertFalse(circuit_breaker.allow())
+
+
+if __name__ == '__main__':
+    unittest.main()
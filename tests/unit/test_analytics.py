@@ -0,0 +1,167 @@
+from vending_machine.events import EventBus
+from vending_machine.fleet import StringTable, VendingFleet
+from vending_machine.journal import Journal
+from vending_machine.vending_machine import Item, VendingMachine
+
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if numpy is not None:
+    from vending_machine.analytics import SalesHistory, SalesRecorder, SlotTable
+
+
+class StubProvider:
+
+    def fetch(self, search_term):
+        return ''
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class SlotTableTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.fleet = VendingFleet(3, slots=4, abstract_provider=StubProvider())
+        self.fleet.machine(0).add_item_to_slot(1, Item('Soda', 1.25, 10))
+        self.fleet.machine(0).add_item_to_slot(3, Item('Coffee', 1.75, 1))
+        self.fleet.machine(1).add_item_to_slot(4, Item('Soda', 1.25, 2))
+        self.fleet.machine(2).add_item_to_slot(2, Item('Soda', 9.50, 5))
+        self.fleet.machine(2).add_item_to_slot(4, Item('Soda', 1.30, 0))
+
+    def test_from_fleet(self):
+        table = SlotTable.from_fleet(self.fleet)
+
+        self.assertEqual([0, 0, 1, 2, 2], table.machine_ids.tolist())
+        self.assertEqual([1, 3, 4, 2, 4], table.slot_numbers.tolist())
+        self.assertEqual([125, 175, 125, 950, 130], table.prices.tolist())
+        self.assertEqual(['Soda', 'Coffee', 'Soda', 'Soda', 'Soda'], [table.names[i] for i in table.name_ids])
+
+    def test_from_machines_matches_from_fleet(self):
+        table = SlotTable.from_machines(self.fleet)
+        fleet_table = SlotTable.from_fleet(self.fleet)
+
+        for column in ('machine_ids', 'slot_numbers', 'name_ids', 'prices', 'stock'):
+            self.assertEqual(getattr(fleet_table, column).tolist(), getattr(table, column).tolist())
+
+    def test_low_stock(self):
+        machine_ids, slot_numbers = SlotTable.from_fleet(self.fleet).low_stock(threshold=2)
+
+        self.assertEqual([(0, 3), (1, 4), (2, 4)], list(zip(machine_ids.tolist(), slot_numbers.tolist())))
+
+    def test_stock_by_item(self):
+        self.assertEqual({'Soda': 17, 'Coffee': 1}, SlotTable.from_fleet(self.fleet).stock_by_item())
+
+    def test_price_outliers(self):
+        machine_ids, slot_numbers = SlotTable.from_fleet(self.fleet).price_outliers()
+
+        self.assertEqual([(2, 2)], list(zip(machine_ids.tolist(), slot_numbers.tolist())))
+
+    def test_empty_fleet(self):
+        table = SlotTable.from_fleet(VendingFleet(2, abstract_provider=StubProvider()))
+
+        self.assertEqual(0, len(table))
+        self.assertEqual({}, table.stock_by_item())
+        self.assertEqual(0, len(table.price_outliers()[0]))
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class SalesHistoryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.names = StringTable()
+        self.recorder = SalesRecorder(self.names, clock=iter(range(100)).__next__)
+        self.vending_machines = []
+
+        for machine_id in range(2):
+            events = EventBus()
+            vending_machine = VendingMachine(slots=3, abstract_provider=StubProvider(), events=events)
+            vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 5))
+            vending_machine.add_item_to_slot(2, Item('Coffee', 1.75, 5))
+            self.recorder.subscribe(events, machine_id)
+            self.vending_machines.append(vending_machine)
+
+        self.vending_machines[0].vend_many([(2, 1), (0, 1), (2, 2), (0, 3)], abstracts=False)
+        self.vending_machines[1].vend_many([(5, 2), (0, 2)], abstracts=False)
+
+    def test_recorded_vends(self):
+        history = self.recorder.history()
+
+        self.assertEqual(4, len(history))
+        self.assertEqual([0, 0, 1, 1], history.machine_ids.tolist())
+        self.assertEqual([1, 2, 2, 2], history.slot_numbers.tolist())
+        self.assertEqual([0, 1, 2, 3], history.times.tolist())
+
+    def test_revenue_queries(self):
+        history = self.recorder.history()
+
+        self.assertEqual(650, history.revenue())
+        self.assertEqual({'Soda': 125, 'Coffee': 525}, history.revenue_by_item())
+        self.assertEqual({'Soda': 1, 'Coffee': 3}, history.units_by_item())
+        self.assertEqual([300, 350], history.revenue_by_machine(2).tolist())
+        self.assertEqual({'Coffee': 350}, history.between(2, 4).revenue_by_item())
+
+    def test_sell_through(self):
+        history = self.recorder.history()
+        table = SlotTable.from_machines(self.vending_machines, self.names)
+
+        self.assertEqual({'Soda': 1 / 10, 'Coffee': 3 / 10}, history.sell_through(table))
+
+        with self.assertRaises(ValueError):
+            history.sell_through(SlotTable.from_machines(self.vending_machines))
+
+    def test_from_journal_follows_item_changes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'journal')
+
+            with Journal(path, slots=3) as journal:
+                vending_machine = VendingMachine(slots=3, abstract_provider=StubProvider(), journal=journal)
+                vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 5))
+                vending_machine.insert_money(10)
+                vending_machine.select_and_vend(1)
+                vending_machine.change_price(1, 1.50)
+                vending_machine.select_and_vend(1)
+                vending_machine.move_item_to_slot(1, 3)
+                vending_machine.change_name(3, 'Cola')
+                vending_machine.select_and_vend(3)
+                vending_machine.select_and_vend(2)
+
+            names = StringTable()
+            history = SalesHistory.concatenate([
+                SalesHistory.from_journal(path, machine_id=4, names=names),
+                SalesHistory.from_journal(path, machine_id=5, names=names),
+            ])
+
+        self.assertEqual([4, 4, 4, 5, 5, 5], history.machine_ids.tolist())
+        self.assertEqual([1, 1, 3] * 2, history.slot_numbers.tolist())
+        self.assertEqual({'Soda': 550, 'Cola': 300}, history.revenue_by_item())
+
+    def test_from_journal_started_on_stocked_machine(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'journal')
+            vending_machine = VendingMachine(slots=3, abstract_provider=StubProvider())
+            vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 5))
+            vending_machine.add_item_to_slot(2, Item('Coffee', 1.75, 5))
+
+            with Journal(path, slots=3) as journal:
+                vending_machine.journal = journal
+                vending_machine.insert_money(10)
+                vending_machine.select_and_vend(1)
+                vending_machine.change_price(1, 1.50)
+                vending_machine.move_item_to_slot(2, 3)
+                vending_machine.select_and_vend(3)
+                vending_machine.replace_item_in_slot(1, Item('Cola', 2, 5))
+                vending_machine.select_and_vend(1)
+
+            history = SalesHistory.from_journal(path)
+
+        self.assertEqual([1], history.slot_numbers.tolist())
+        self.assertEqual({'Cola': 200}, history.revenue_by_item())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+from http.server import ThreadingHTTPServer
+from tests.unit import test_abstract_provider
+from vending_machine.abstract_provider import CircuitBreaker
+from vending_machine.async_abstract_provider import AsyncAbstractProvider
+
+import asyncio
+import threading
+import unittest
+
+
+class AsyncAbstractProviderTestCase(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), test_abstract_provider.StubHandler)
+        self.server.requests = 0
+        self.server.client_ports = set()
+        self.server.delay = 0
+        self.server.failures_left = 0
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+        self.search_url = f'http://127.0.0.1:{self.server.server_address[1]}/'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    async def test_fetch_success(self):
+        provider = AsyncAbstractProvider(search_url=self.search_url)
+
+        self.assertEqual('About soda', await provider.fetch('Soda'))
+        provider.close()
+
+    async def test_fetches_reuse_pooled_connection(self):
+        provider = AsyncAbstractProvider(search_url=self.search_url)
+
+        for name in ('Soda', 'Water', 'Coffee'):
+            await provider.fetch(name)
+
+        self.assertEqual(3, self.server.requests)
+        self.assertEqual(1, len(self.server.client_ports))
+        provider.close()
+
+    async def test_overlapping_fetches_share_one_request(self):
+        self.server.delay = 0.1
+        provider = AsyncAbstractProvider(search_url=self.search_url)
+
+        abstracts = await asyncio.gather(*(provider.fetch(name) for name in ('Soda', 'soda ', 'SODA', 'Water')))
+
+        self.assertEqual(['About soda', 'About soda', 'About soda', 'About water'], abstracts)
+        self.assertEqual(2, self.server.requests)
+
+    async def test_concurrency_is_bounded(self):
+        self.server.delay = 0.05
+        provider = AsyncAbstractProvider(search_url=self.search_url, max_concurrency=2)
+        in_flight = [0, 0]
+        in_flight_lock = threading.Lock()
+        fetch = provider.provider.fetch
+
+        def counting_fetch(search_term):
+            with in_flight_lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            try:
+                return fetch(search_term)
+            finally:
+                with in_flight_lock:
+                    in_flight[0] -= 1
+
+        provider.provider.fetch = counting_fetch
+        await asyncio.gather(*(provider.fetch(f'Item {n}') for n in range(6)))
+        provider.close()
+
+        self.assertEqual(6, self.server.requests)
+        self.assertEqual(2, in_flight[1])
+
+    async def test_fetch_retries_server_errors(self):
+        self.server.failures_left = 2
+        provider = AsyncAbstractProvider(search_url=self.search_url, retries=2, backoff_factor=0)
+
+        self.assertEqual('About soda', await provider.fetch('Soda'))
+        self.assertEqual(3, self.server.requests)
+
+    async def test_fetch_read_timeout(self):
+        self.server.delay = 0.5
+        # The stub answers after the provider has given up and closed the connection.
+        self.server.handle_error = lambda request, client_address: None
+        provider = AsyncAbstractProvider(search_url=self.search_url, read_timeout=0.1, retries=0)
+
+        self.assertIsNone(await provider.fetch('Soda'))
+
+    async def test_open_circuit_skips_upstream(self):
+        self.server.failures_left = 10
+        provider = AsyncAbstractProvider(
+            search_url=self.search_url, retries=0, circuit_breaker=CircuitBreaker(failure_threshold=2)
+        )
+
+        await provider.fetch('Soda')
+        await provider.fetch('Soda')
+        requests_before_open = self.server.requests
+
+        self.assertIsNone(await provider.fetch('Soda'))
+        self.assertEqual(requests_before_open, self.server.requests)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+from vending_machine.abstract_cache import AbstractCache
+from vending_machine.async_vending_machine import AsyncVendingMachine
+from vending_machine.vending_machine import Item, VendingMachine, VendReason
+
+import asyncio
+import unittest
+
+
+class SleepingAsyncProvider:
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.fetches = 0
+
+    async def fetch(self, search_term):
+        self.fetches += 1
+        await asyncio.sleep(self.delay)
+        return f'About {search_term}'
+
+
+class AsyncVendingMachineTestCase(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.provider = SleepingAsyncProvider()
+        self.vending_machine = VendingMachine(abstract_cache=AbstractCache())
+        self.vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 2))
+        self.async_vending_machine = AsyncVendingMachine(self.vending_machine, abstract_provider=self.provider)
+
+    async def test_insert_and_remove(self):
+        self.assertEqual((True, 2.0), await self.async_vending_machine.insert(2))
+        self.assertEqual((False, 2.0), await self.async_vending_machine.insert(0))
+        self.assertEqual((True, 1.5), await self.async_vending_machine.remove(0.5))
+        self.assertEqual(1.5, self.async_vending_machine.current_balance)
+
+    async def test_vend_success(self):
+        await self.async_vending_machine.insert(2)
+
+        self.assertEqual(
+            (True, 'About Soda', 'Vended: Soda', 0.75), await self.async_vending_machine.vend(1)
+        )
+        self.assertEqual(1, self.vending_machine.slot_items[1].stock)
+
+    async def test_vend_failures_match_select_and_vend(self):
+        self.assertEqual(
+            (False, 'About Soda', 'Insufficient Balance', 0.0), await self.async_vending_machine.vend(1)
+        )
+        self.assertEqual((False, '', 'Empty Slot', 0.0), await self.async_vending_machine.vend(2))
+        self.assertEqual((False, '', 'Invalid Slot', 0.0), await self.async_vending_machine.vend(10))
+
+    async def test_vend_with_reason(self):
+        await self.async_vending_machine.insert(2)
+
+        self.assertEqual((VendReason.VENDED, 75, 'About Soda'), await self.async_vending_machine.vend_with_reason(1))
+        self.assertEqual((VendReason.EMPTY_SLOT, 75, ''), await self.async_vending_machine.vend_with_reason(2))
+
+    async def test_vend_uses_cache(self):
+        await self.async_vending_machine.insert(5)
+        await self.async_vending_machine.vend(1)
+        await self.async_vending_machine.vend(1)
+
+        self.assertEqual(1, self.provider.fetches)
+
+    async def test_vend_many(self):
+        result = await self.async_vending_machine.vend_many([(2, 1), (0, 1), (0, 3)])
+
+        self.assertEqual([1, 0, 0], list(result.vended))
+        self.assertEqual([VendReason.VENDED, VendReason.INSUFFICIENT_BALANCE, VendReason.EMPTY_SLOT],
+                         list(result.reasons))
+        self.assertEqual({'Soda': 'About Soda'}, result.abstracts)
+
+    async def test_thousands_of_concurrent_sessions(self):
+        machines = []
+        for _ in range(2000):
+            vending_machine = VendingMachine()
+            vending_machine.add_item_to_slot(1, Item('Soda', 1, 1))
+            machines.append(AsyncVendingMachine(vending_machine, abstract_provider=SleepingAsyncProvider(0.05)))
+
+        async def session(async_vending_machine):
+            await async_vending_machine.insert(1)
+            return await async_vending_machine.vend(1)
+
+        started = asyncio.get_running_loop().time()
+        results = await asyncio.gather(*map(session, machines))
+        elapsed = asyncio.get_running_loop().time() - started
+
+        self.assertTrue(all(vended for vended, item_summary, vend_result, balance in results))
+        # The lookups overlap: 2000 sequential lookups would take 100 seconds.
+        self.assertLess(elapsed, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
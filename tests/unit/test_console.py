@@ -0,0 +1,51 @@
+from unittest.mock import patch
+from vending_machine.console import Console, HeadlessConsole
+
+import io
+import json
+import unittest
+
+
+class ConsoleTestCase(unittest.TestCase):
+
+    def test_terminal_console_uses_input_and_print(self):
+        console = Console()
+
+        with patch('builtins.input', return_value='q') as input_mock, patch('builtins.print') as print_mock:
+            self.assertEqual('q', console.read('Please select an option: '))
+            console.write('Vended: Soda')
+
+        input_mock.assert_called_once_with('Please select an option: ')
+        print_mock.assert_called_once_with('Vended: Soda')
+        self.assertTrue(console.show_menus)
+
+
+class HeadlessConsoleTestCase(unittest.TestCase):
+
+    def test_reads_script_lines_then_raises_eof(self):
+        console = HeadlessConsole(io.StringIO('i\n2.50\r\n1'))
+
+        self.assertEqual(['i', '2.50', '1'], [console.read(), console.read(), console.read()])
+        with self.assertRaises(EOFError):
+            console.read()
+        self.assertFalse(console.show_menus)
+
+    def test_events_are_json_lines(self):
+        output = io.StringIO()
+        console = HeadlessConsole([], output=output)
+
+        console.write('dropped')
+        console.event('vend', slot=1, vended=True, balance=75)
+        console.event('insert', amount=200, inserted=True, balance=275)
+
+        self.assertEqual([
+            {'event': 'vend', 'slot': 1, 'vended': True, 'balance': 75},
+            {'event': 'insert', 'amount': 200, 'inserted': True, 'balance': 275},
+        ], [json.loads(line) for line in output.getvalue().splitlines()])
+
+    def test_events_without_output_are_dropped(self):
+        HeadlessConsole([]).event('vend', slot=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
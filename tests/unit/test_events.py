@@ -0,0 +1,185 @@
+from vending_machine.events import (
+    EventBus, ItemAdded, ItemMoved, ItemRemoved, ItemReplaced, ItemVended, MoneyInserted, MoneyRemoved, NameChanged,
+    PriceChanged, QueuedSubscriber, StockDecreased, StockIncreased, VendFailed,
+)
+from vending_machine.threadsafe import ThreadSafeVendingMachine
+from vending_machine.vending_machine import Item, VendingMachine, VendReason
+
+import threading
+import unittest
+
+
+class StubProvider:
+
+    def fetch(self, search_term):
+        return f'About {search_term}'
+
+
+class EventBusTestCase(unittest.TestCase):
+
+    def test_subscribers_receive_their_event_types(self):
+        events = EventBus()
+        money, everything = [], []
+        events.subscribe(money.append, MoneyInserted, MoneyRemoved)
+        events.subscribe(everything.append)
+
+        events.emit(MoneyInserted, 100, 100)
+        events.emit(ItemRemoved, 3)
+
+        self.assertEqual([MoneyInserted(100, 100)], money)
+        self.assertEqual([MoneyInserted(100, 100), ItemRemoved(3)], everything)
+
+    def test_unsubscribe(self):
+        events = EventBus()
+        received = []
+        events.subscribe(received.append, ItemRemoved)
+        events.unsubscribe(received.append)
+
+        events.emit(ItemRemoved, 3)
+
+        self.assertEqual([], received)
+        self.assertFalse(events.wants(ItemRemoved))
+
+    def test_events_without_subscribers_are_not_built(self):
+        events = EventBus()
+        events.subscribe(lambda event: None, ItemRemoved)
+
+        # Too many fields for MoneyInserted, which would raise if the event were built.
+        events.emit(MoneyInserted, 1, 2, 3)
+
+        self.assertTrue(events.wants(ItemRemoved))
+        self.assertFalse(events.wants(MoneyInserted))
+
+
+class VendingMachineEventsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.events = EventBus()
+        self.received = []
+        self.events.subscribe(self.received.append)
+        self.vending_machine = VendingMachine(slots=3, abstract_provider=StubProvider(), events=self.events)
+
+    def test_mutators_emit_events(self):
+        vending_machine = self.vending_machine
+
+        vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 2))
+        vending_machine.replace_item_in_slot(2, Item('Water', 1, 5))
+        vending_machine.move_item_to_slot(2, 3)
+        vending_machine.change_name(3, 'Still Water')
+        vending_machine.change_price(3, 1.5)
+        vending_machine.increase_stock(3, 2)
+        vending_machine.decrease_stock(3, 4)
+        vending_machine.remove_item_from_slot(3)
+        vending_machine.insert_money(2)
+        vending_machine.select_and_vend(1)
+        vending_machine.select_and_vend(2)
+        vending_machine.remove_money(1)
+
+        self.assertEqual([
+            ItemAdded(1, False, 'Soda', 125, 2),
+            ItemReplaced(2, 'Water', 100, 5),
+            ItemMoved(2, 3, False),
+            NameChanged(3, 'Still Water'),
+            PriceChanged(3, 150),
+            StockIncreased(3, 2, 7),
+            StockDecreased(3, 4, 3),
+            ItemRemoved(3),
+            MoneyInserted(200, 200),
+            ItemVended(1, 'Soda', 125, 1, 75),
+            VendFailed(2, VendReason.EMPTY_SLOT, 75),
+            MoneyRemoved(100, 0),
+        ], self.received)
+
+    def test_rejected_changes_emit_nothing(self):
+        vending_machine = self.vending_machine
+
+        vending_machine.add_item_to_slot(4, Item('Soda', 1.25, 2))
+        vending_machine.move_item_to_slot(1, 2)
+        vending_machine.remove_item_from_slot(1)
+        vending_machine.change_name(1, 'Soda')
+        vending_machine.insert_money(-1)
+        vending_machine.remove_money(1)
+
+        self.assertEqual([], self.received)
+
+    def test_vend_many_emits_the_same_events_as_single_vends(self):
+        requests = [(1, 1), (0, 2), (0, 1), (2, 4), (0, 1)]
+        single_events = EventBus()
+        single_received = []
+        single_events.subscribe(single_received.append)
+        single = VendingMachine(slots=3, abstract_provider=StubProvider(), events=single_events)
+
+        for vending_machine in (single, self.vending_machine):
+            vending_machine.add_item_to_slot(1, Item('Soda', 1, 2))
+
+        for amount, slot_number in requests:
+            single.insert_money(amount)
+            single.select_and_vend(slot_number)
+        self.vending_machine.vend_many(requests, abstracts=False)
+
+        self.assertEqual(single_received, self.received)
+
+    def test_thread_safe_machine_emits_every_vend(self):
+        vending_machine = ThreadSafeVendingMachine(slots=4, abstract_provider=StubProvider(), events=self.events)
+        for slot_number in range(1, 5):
+            vending_machine.add_item_to_slot(slot_number, Item(f'Item {slot_number}', 0, 200))
+        del self.received[:]
+
+        threads = [
+            threading.Thread(target=lambda n=n: [vending_machine.select_and_vend(n % 4 + 1) for _ in range(100)])
+            for n in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(800, len(self.received))
+        self.assertTrue(all(isinstance(event, ItemVended) for event in self.received))
+        self.assertEqual([0] * 4, sorted(event.stock for event in self.received)[:4])
+
+
+class QueuedSubscriberTestCase(unittest.TestCase):
+
+    def test_delivers_in_order_in_batches(self):
+        batches = []
+        subscriber = QueuedSubscriber(batches.append, max_batch=10)
+
+        for n in range(100):
+            subscriber(ItemRemoved(n))
+        subscriber.close()
+
+        self.assertTrue(all(len(batch) <= 10 for batch in batches))
+        self.assertEqual([ItemRemoved(n) for n in range(100)], [event for batch in batches for event in batch])
+        self.assertEqual(100, subscriber.delivered)
+
+    def test_drops_events_when_full(self):
+        release = threading.Event()
+        batches = []
+        subscriber = QueuedSubscriber(lambda batch: (release.wait(), batches.append(batch)), max_queued=5,
+                                      drop_when_full=True)
+
+        for n in range(50):
+            subscriber(ItemRemoved(n))
+        release.set()
+        subscriber.close()
+
+        self.assertGreater(subscriber.dropped, 0)
+        self.assertEqual(50, subscriber.dropped + subscriber.delivered)
+
+    def test_failing_batches_are_counted(self):
+        def fail(batch):
+            raise ValueError('subscriber failed')
+
+        subscriber = QueuedSubscriber(fail)
+        subscriber(ItemRemoved(1))
+        subscriber.join()
+        subscriber(ItemRemoved(2))
+        subscriber.close()
+
+        self.assertEqual(2, subscriber.failed)
+        self.assertEqual(0, subscriber.delivered)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+from unittest.mock import MagicMock, patch
+from vending_machine.fleet import StringTable, VendingFleet
+from vending_machine.vending_machine import Item, VendingMachine
+
+import unittest
+
+
+class StringTableTestCase(unittest.TestCase):
+
+    def test_intern_reuses_id(self):
+        names = StringTable()
+
+        self.assertEqual(0, names.intern('Soda'))
+        self.assertEqual(1, names.intern('Coffee'))
+        self.assertEqual(0, names.intern('Soda'))
+        self.assertEqual('Coffee', names[1])
+        self.assertEqual(2, len(names))
+
+
+class VendingFleetTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.fleet = VendingFleet(3, slots=4)
+
+    def test_machine_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self.fleet.machine(3)
+
+    def test_new_machine_is_empty(self):
+        vending_machine = self.fleet.machine(1)
+
+        self.assertEqual(4, vending_machine.total_slots)
+        self.assertEqual(4, vending_machine.available_slots)
+        self.assertEqual(0, vending_machine.current_balance)
+        self.assertEqual({1: None, 2: None, 3: None, 4: None}, dict(vending_machine.slot_items))
+        self.assertEqual('Invalid slot', vending_machine.slot_items.get(5, 'Invalid slot'))
+
+    def test_add_item_to_slot(self):
+        self.assertTrue(self.fleet.machine(1).add_item_to_slot(2, Item('Soda', 1.25, 20)))
+
+        vending_machine = self.fleet.machine(1)
+
+        self.assertEqual(3, vending_machine.available_slots)
+        self.assertEqual('Soda', vending_machine.slot_items[2].name)
+        self.assertEqual(1.25, vending_machine.slot_items[2].price)
+        self.assertEqual(20, vending_machine.slot_items[2].stock)
+        self.assertIsNone(self.fleet.machine(0).slot_items[2])
+        self.assertIsNone(self.fleet.machine(2).slot_items[2])
+
+    def test_add_same_item_to_slot_adds_stock(self):
+        vending_machine = self.fleet.machine(0)
+        vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 20))
+        vending_machine.add_item_to_slot(1, Item('Soda', 1.50, 5))
+
+        self.assertEqual(1.50, vending_machine.slot_items[1].price)
+        self.assertEqual(25, vending_machine.slot_items[1].stock)
+
+    def test_names_are_interned(self):
+        for vending_machine in self.fleet:
+            vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 20))
+
+        self.assertEqual(1, len(self.fleet.names))
+
+    def test_move_item_to_slot(self):
+        vending_machine = self.fleet.machine(2)
+        vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 20))
+        vending_machine.add_item_to_slot(2, Item('Coffee', 1.75, 6))
+
+        self.assertFalse(vending_machine.move_item_to_slot(1, 2))
+        self.assertTrue(vending_machine.move_item_to_slot(1, 2, replace=True))
+        self.assertIsNone(vending_machine.slot_items[1])
+        self.assertEqual('Soda', vending_machine.slot_items[2].name)
+        self.assertEqual(20, vending_machine.slot_items[2].stock)
+        self.assertEqual(3, vending_machine.available_slots)
+
+    def test_move_item_to_same_slot(self):
+        vending_machine = self.fleet.machine(0)
+        vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 20))
+
+        self.assertTrue(vending_machine.move_item_to_slot(1, 1, replace=True))
+        self.assertEqual('Soda', vending_machine.slot_items[1].name)
+
+    def test_slot_queries_see_changes_made_through_other_views(self):
+        self.fleet.machine(1).add_item_to_slot(2, Item('Soda', 1.25, 2))
+
+        self.assertEqual({2}, self.fleet.machine(1).occupied_slots())
+
+        self.fleet.machine(1).add_item_to_slot(4, Item('Soda', 1.25, 20))
+        self.fleet.machine(1).decrease_stock(2)
+
+        vending_machine = self.fleet.machine(1)
+        self.assertEqual({1, 3}, vending_machine.empty_slots())
+        self.assertEqual({2, 4}, vending_machine.find_slots('Soda'))
+        self.assertEqual([(2, 1)], vending_machine.low_stock_slots(5))
+        self.assertEqual(set(), self.fleet.machine(0).occupied_slots())
+
+    def test_remove_item_from_slot(self):
+        vending_machine = self.fleet.machine(0)
+        vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 20))
+
+        self.assertTrue(vending_machine.remove_item_from_slot(1))
+        self.assertIsNone(vending_machine.slot_items[1])
+        self.assertEqual(4, vending_machine.available_slots)
+
+    @patch('vending_machine.vending_machine.VendingMachine._get_abstract', MagicMock(return_value='Soda'))
+    def test_select_and_vend(self):
+        vending_machine = self.fleet.machine(1)
+        vending_machine.add_item_to_slot(3, Item('Soda', 1.25, 20))
+        vending_machine.insert_money(10.0)
+        vended, item_summary, vend_result, total_balance = vending_machine.select_and_vend(3)
+
+        self.assertTrue(vended)
+        self.assertEqual('Vended: Soda', vend_result)
+        self.assertEqual(8.75, total_balance)
+        self.assertEqual(875, self.fleet.balances[1])
+        self.assertEqual(19, self.fleet.machine(1).slot_items[3].stock)
+        self.assertEqual(0, self.fleet.balances[0])
+
+    def test_fleet_machine_is_vending_machine(self):
+        self.assertIsInstance(self.fleet.machine(0), VendingMachine)
+
+    def test_nbytes(self):
+        self.assertEqual(3 * 4 * (4 + 8 + 8) + 3 * (8 + 8), self.fleet.nbytes())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+from unittest.mock import MagicMock, patch
+from vending_machine.events import EventBus, PriceChanged
+from vending_machine.journal import Journal, JournalOp, read_journal, read_journal_header, replay_journal
+from vending_machine.vending_machine import Item, VendingMachine
+
+import os
+import gc
+import tempfile
+import time
+import unittest
+import weakref
+
+
+class JournalTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'machine.journal')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_records_round_trip(self):
+        with Journal(self.path, slots=12) as journal:
+            journal.record(JournalOp.INSERT_MONEY, 250)
+            journal.record(JournalOp.ADD_ITEM, 3, True, 125, 20, 'Crème Soda')
+            journal.record(JournalOp.MOVE_ITEM, 3, 4, False)
+
+        records = [(op, fields) for op, timestamp, fields in read_journal(self.path)]
+
+        self.assertEqual(12, read_journal_header(self.path))
+        self.assertEqual([
+            (JournalOp.INSERT_MONEY, (250,)),
+            (JournalOp.ADD_ITEM, (3, True, 125, 20, 'Crème Soda')),
+            (JournalOp.MOVE_ITEM, (3, 4, False)),
+        ], records)
+
+    def test_group_commit_buffers_records(self):
+        journal = Journal(self.path, group_commit=3)
+        journal.record(JournalOp.VEND, 1)
+        journal.record(JournalOp.VEND, 1)
+
+        self.assertEqual([], list(read_journal(self.path)))
+
+        journal.record(JournalOp.VEND, 1)
+
+        self.assertEqual(3, len(list(read_journal(self.path))))
+        self.assertEqual(3, journal.records_written)
+        journal.close()
+
+    def test_max_delay_flushes_old_records(self):
+        clock = MagicMock(side_effect=[0.0, 0.5, 2.0])
+        journal = Journal(self.path, group_commit=100, max_delay=1.0, clock=clock)
+
+        journal.record(JournalOp.VEND, 1)
+        journal.record(JournalOp.VEND, 1)
+        self.assertEqual(0, journal.records_written)
+
+        journal.record(JournalOp.VEND, 1)
+        self.assertEqual(3, journal.records_written)
+        journal.close()
+
+    def test_max_delay_flushes_without_another_record(self):
+        journal = Journal(self.path, group_commit=100, max_delay=0.01)
+        journal.record(JournalOp.VEND, 1)
+
+        deadline = time.monotonic() + 5
+        while journal.records_written == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(1, len(list(read_journal(self.path))))
+        journal.close()
+
+    def test_reopen_appends(self):
+        with Journal(self.path, slots=5) as journal:
+            journal.record(JournalOp.INSERT_MONEY, 100)
+
+        with Journal(self.path) as journal:
+            journal.record(JournalOp.INSERT_MONEY, 200)
+            self.assertEqual(5, journal.slots)
+
+        self.assertEqual([(100,), (200,)], [fields for op, timestamp, fields in read_journal(self.path)])
+
+    def test_truncated_record_ignored(self):
+        with Journal(self.path) as journal:
+            journal.record(JournalOp.CHANGE_NAME, 1, 'Iced Tea')
+            journal.record(JournalOp.CHANGE_NAME, 1, 'Lemonade')
+
+        with open(self.path, 'r+b') as journal_file:
+            journal_file.truncate(os.path.getsize(self.path) - 3)
+
+        self.assertEqual([(1, 'Iced Tea')], [fields for op, timestamp, fields in read_journal(self.path)])
+
+    def test_record_after_close(self):
+        journal = Journal(self.path)
+        journal.close()
+
+        with self.assertRaises(ValueError):
+            journal.record(JournalOp.VEND, 1)
+
+    def test_unreferenced_journal_collected_and_flushed(self):
+        journal = Journal(self.path)
+        journal.record(JournalOp.INSERT_MONEY, 100)
+        reference = weakref.ref(journal)
+
+        del journal
+        gc.collect()
+
+        self.assertIsNone(reference())
+        self.assertEqual([(100,)], [fields for op, timestamp, fields in read_journal(self.path)])
+
+    def test_not_a_journal(self):
+        with open(self.path, 'wb') as journal_file:
+            journal_file.write(b'nope')
+
+        with self.assertRaises(ValueError):
+            list(read_journal(self.path))
+
+    @patch('vending_machine.vending_machine.VendingMachine._get_abstract', MagicMock(return_value=''))
+    def test_replay_rebuilds_machine(self):
+        with Journal(self.path, slots=6) as journal:
+            vending_machine = VendingMachine(slots=6, journal=journal)
+            vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 20))
+            vending_machine.add_item_to_slot(2, Item('Coffee', 1.75, 6))
+            vending_machine.add_item_to_slot(2, Item('Water', 1.00, 3), replace=True)
+            vending_machine.replace_item_in_slot(3, Item('Tea', 2.00, 4))
+            vending_machine.move_item_to_slot(3, 4)
+            vending_machine.remove_item_from_slot(1)
+            vending_machine.add_item_to_slot(5, Item('Juice', 2.50, 8))
+            vending_machine.change_name(5, 'Orange Juice')
+            vending_machine.change_price(5, 2.75)
+            vending_machine.increase_stock(5, 4)
+            vending_machine.decrease_stock(5, 2)
+            vending_machine.insert_money(10)
+            vending_machine.remove_money(1.5)
+            vending_machine.select_and_vend(5)
+            vending_machine.select_and_vend(6)
+            vending_machine.vend_many([(0, 2), (1, 4)])
+
+        replayed = replay_journal(self.path)
+
+        self.assertEqual(6, replayed.total_slots)
+        self.assertEqual(vending_machine.balance_cents, replayed.balance_cents)
+        self.assertEqual(vending_machine.available_slots, replayed.available_slots)
+
+        for slot_number, slot_item in vending_machine.slot_items.items():
+            replayed_item = replayed.slot_items[slot_number]
+
+            if slot_item is None:
+                self.assertIsNone(replayed_item)
+            else:
+                self.assertEqual(
+                    (slot_item.name, slot_item.price_cents, slot_item.stock),
+                    (replayed_item.name, replayed_item.price_cents, replayed_item.stock),
+                )
+
+    def test_replay_emits_price_changes(self):
+        with Journal(self.path, slots=3) as journal:
+            vending_machine = VendingMachine(slots=3, journal=journal)
+            vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 20))
+            vending_machine.change_price(1, 1.35)
+
+        events = EventBus()
+        price_changes = []
+        events.subscribe(price_changes.append, PriceChanged)
+
+        replayed = replay_journal(self.path, VendingMachine(slots=3, events=events))
+
+        self.assertEqual(135, replayed.slot_items[1].price_cents)
+        self.assertEqual([PriceChanged(1, 135)], price_changes)
+
+    def test_failed_calls_not_recorded(self):
+        with Journal(self.path) as journal:
+            vending_machine = VendingMachine(journal=journal)
+            vending_machine.insert_money(-1)
+            vending_machine.remove_money(5)
+            vending_machine.change_price(1, 2)
+            vending_machine.select_and_vend(1)
+
+        self.assertEqual([], list(read_journal(self.path)))
+
+
+if __name__ == '__main__':
+    unittest.main()
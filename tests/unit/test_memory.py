@@ -0,0 +1,44 @@
+from vending_machine.abstract_provider import get_default_provider
+from vending_machine.vending_machine import Item, VendingMachine
+
+import gc
+import tracemalloc
+import unittest
+
+# Budgets in bytes per object, including the list slot holding it during the measurement. An Item owns its price int:
+# prices are measured above 256 cents, where CPython no longer shares cached small ints.
+VENDING_MACHINE_BYTES_BUDGET = 488
+ITEM_BYTES_BUDGET = 104
+
+
+def bytes_per_object(factory, count=10000):
+    gc.collect()
+    tracemalloc.start()
+    objects = [factory() for _ in range(count)]
+    allocated, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del objects
+
+    return allocated / count
+
+
+class MemoryBudgetTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # The shared provider is created by the first machine, keep it out of the measurement.
+        get_default_provider()
+
+    def test_vending_machine_within_budget(self):
+        self.assertLessEqual(bytes_per_object(VendingMachine), VENDING_MACHINE_BYTES_BUDGET)
+
+    def test_item_within_budget(self):
+        self.assertLessEqual(bytes_per_object(lambda: Item('Sparkling Water', 12.50, 20)), ITEM_BYTES_BUDGET)
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(VendingMachine(), '__dict__'))
+        self.assertFalse(hasattr(Item('Soda', 1.25, 20), '__dict__'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+from vending_machine.metrics import LatencyHistogram, Metrics, MetricsServer
+from vending_machine.threadsafe import ThreadSafeVendingMachine
+from vending_machine.vending_machine import Item, VendingMachine, VendReason
+
+import os
+import random
+import socket
+import tempfile
+import unittest
+import urllib.request
+
+
+class StubProvider:
+
+    def fetch(self, search_term):
+        return f'About {search_term}'
+
+
+class FakeClock:
+
+    def __init__(self, step_ns):
+        self.now = 0
+        self.step_ns = step_ns
+
+    def __call__(self):
+        self.now += self.step_ns
+        return self.now
+
+
+class LatencyHistogramTestCase(unittest.TestCase):
+
+    def test_values_are_bucketed_within_precision(self):
+        histogram = LatencyHistogram(precision_bits=6)
+
+        for value in list(range(200)) + [random.Random(3).randrange(1, 10 ** 12) for _ in range(2000)]:
+            highest = histogram._highest_value_of(histogram._index_of(value))
+            self.assertGreaterEqual(highest, value)
+            self.assertLessEqual(highest - value, value / 32)
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 1001):
+            histogram.record(value * 1000)
+
+        self.assertEqual(1000, histogram.count)
+        self.assertAlmostEqual(500000, histogram.percentile(50), delta=500000 / 32)
+        self.assertAlmostEqual(990000, histogram.percentile(99), delta=990000 / 32)
+        self.assertEqual(0, LatencyHistogram().percentile(50))
+
+    def test_cumulative_counts(self):
+        histogram = LatencyHistogram()
+        for value in (10, 20, 2000, 3000000):
+            histogram.record(value)
+
+        self.assertEqual([2, 3, 3, 4], histogram.cumulative_counts([100, 10000, 1000000, 10 ** 9]))
+
+
+class MetricsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = Metrics(clock=FakeClock(1000))
+        self.metrics.enable(VendingMachine)
+        self.addCleanup(self.metrics.disable, VendingMachine)
+
+        self.vending_machine = VendingMachine(abstract_provider=StubProvider())
+        self.vending_machine.add_item_to_slot(1, Item('Soda', 1, 1))
+
+    def test_counts_calls_and_vend_outcomes(self):
+        vending_machine = self.vending_machine
+        vending_machine.insert_money(2)
+
+        vending_machine.select_and_vend(1)
+        vending_machine.select_and_vend(1)
+        vending_machine.select_and_vend(5)
+        vending_machine.vend_many([(0, 0), (0, 1)], abstracts=False)
+
+        self.assertEqual(3, self.metrics.calls('select_and_vend'))
+        self.assertEqual(3, self.metrics.calls('vend_decision'))
+        self.assertEqual(1, self.metrics.calls('vend_batch'))
+        self.assertEqual(1, self.metrics.calls('add_item_to_slot'))
+        self.assertEqual(2, self.metrics.calls('abstract_fetch'))
+        self.assertEqual({
+            VendReason.VENDED: 1,
+            VendReason.INVALID_SLOT: 1,
+            VendReason.EMPTY_SLOT: 1,
+            VendReason.INSUFFICIENT_BALANCE: 0,
+            VendReason.OUT_OF_STOCK: 2,
+        }, self.metrics.vend_reasons)
+
+    def test_abstract_wait_is_timed_apart_from_vend(self):
+        self.vending_machine.insert_money(1)
+        self.vending_machine.select_and_vend(1)
+
+        # Each clock reading advances 1us: the vend decision and the fetch take 1us each, the abstract lookup wraps
+        # the fetch and select_and_vend wraps them all.
+        self.assertEqual(1000, self.metrics.histograms['vend_decision'].total)
+        self.assertEqual(1000, self.metrics.histograms['abstract_fetch'].total)
+        self.assertEqual(3000, self.metrics.histograms['abstract_lookup'].total)
+        self.assertEqual(7000, self.metrics.histograms['select_and_vend'].total)
+
+    def test_disable_restores_methods(self):
+        self.metrics.disable(VendingMachine)
+
+        self.assertFalse(self.metrics.is_enabled(VendingMachine))
+        self.assertIs(VendingMachine.__dict__['select_and_vend'], VendingMachine.select_and_vend)
+        self.assertFalse(hasattr(VendingMachine.select_and_vend, '__wrapped__'))
+
+        self.vending_machine.insert_money(1)
+        self.assertEqual(0, self.metrics.calls('insert_money'))
+
+    def test_subclass_operations_are_counted_once(self):
+        self.metrics.disable(VendingMachine)
+        self.metrics.reset()
+        self.metrics.enable(ThreadSafeVendingMachine)
+
+        vending_machine = ThreadSafeVendingMachine(abstract_provider=StubProvider())
+        vending_machine.add_item_to_slot(1, Item('Soda', 1, 1))
+        vending_machine.insert_money(1)
+        vending_machine.select_and_vend(1)
+
+        self.assertEqual(1, self.metrics.calls('add_item_to_slot'))
+        self.assertEqual(1, self.metrics.calls('vend_decision'))
+        self.assertEqual(1, self.metrics.vend_reasons[VendReason.VENDED])
+
+        self.metrics.disable(ThreadSafeVendingMachine)
+
+        self.assertNotIn('select_and_vend', ThreadSafeVendingMachine.__dict__)
+        self.assertFalse(hasattr(ThreadSafeVendingMachine.add_item_to_slot, '__wrapped__'))
+
+    def test_render_prometheus_text(self):
+        self.vending_machine.insert_money(1)
+        self.vending_machine.select_and_vend(1)
+
+        rendered = self.metrics.render()
+
+        self.assertIn('# TYPE vending_machine_calls_total counter', rendered)
+        self.assertIn('vending_machine_calls_total{operation="select_and_vend"} 1\n', rendered)
+        self.assertIn('vending_machine_vends_total{reason="vended"} 1\n', rendered)
+        self.assertIn('vending_machine_vends_total{reason="out_of_stock"} 0\n', rendered)
+        self.assertIn('vending_machine_operation_duration_seconds_bucket{operation="select_and_vend",le="5e-06"} 0\n',
+                      rendered)
+        self.assertIn('vending_machine_operation_duration_seconds_bucket{operation="select_and_vend",le="1e-05"} 1\n',
+                      rendered)
+        self.assertIn('vending_machine_operation_duration_seconds_sum{operation="select_and_vend"} 7e-06\n', rendered)
+        self.assertNotIn('operation="remove_money"', rendered)
+
+    def test_write_and_serve(self):
+        self.vending_machine.insert_money(1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'vending_machine.prom')
+            self.metrics.write(path)
+            with open(path) as metrics_file:
+                self.assertEqual(self.metrics.render(), metrics_file.read())
+
+            socket_path = os.path.join(directory, 'metrics.sock')
+            server = MetricsServer(self.metrics, f'unix:{socket_path}')
+            with socket.socket(socket.AF_UNIX) as client:
+                client.connect(socket_path)
+                client.sendall(b'GET /metrics HTTP/1.0\r\n\r\n')
+                response = b''.join(iter(lambda: client.recv(65536), b''))
+            server.close()
+
+        self.assertTrue(response.startswith(b'HTTP/1.0 200'))
+        self.assertIn(b'vending_machine_calls_total{operation="insert_money"} 1\n', response)
+
+        server = MetricsServer(self.metrics, '127.0.0.1:0')
+        with urllib.request.urlopen(f'http://127.0.0.1:{server.address[1]}/metrics') as response:
+            self.assertEqual(self.metrics.render(), response.read().decode('utf-8'))
+        server.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+from decimal import Decimal
+from vending_machine.money import format_money, from_cents, parse_money, sum_cents, to_cents
+from vending_machine.vending_machine import Item, VendingMachine
+
+import unittest
+
+
+class MoneyTestCase(unittest.TestCase):
+
+    def test_to_cents(self):
+        self.assertEqual(1200, to_cents(12))
+        self.assertEqual(125, to_cents(1.25))
+        self.assertEqual(10, to_cents(0.1))
+        self.assertEqual(101, to_cents(1.005))
+        self.assertEqual(4875, to_cents(Decimal('48.75')))
+        self.assertEqual(-2165, to_cents(-21.65))
+        self.assertEqual(2500, to_cents('2.5e1'))
+        self.assertEqual(2500, to_cents(2.5e1))
+
+    def test_to_cents_invalid_amount(self):
+        for amount in ('abc', float('nan'), float('inf'), 1e30, '2e40'):
+            with self.assertRaises(ValueError):
+                to_cents(amount)
+
+    def test_from_cents(self):
+        self.assertEqual(48.75, from_cents(4875))
+
+    def test_parse_money(self):
+        self.assertEqual(Decimal('2.25'), parse_money(' 2.25\n'))
+
+        with self.assertRaises(ValueError):
+            parse_money('two')
+        with self.assertRaises(ValueError):
+            parse_money('1e30')
+
+    def test_format_money(self):
+        self.assertEqual('$0.00', format_money(0))
+        self.assertEqual('$1.05', format_money(105))
+        self.assertEqual('-$0.25', format_money(-25))
+
+    def test_sum_cents_is_exact(self):
+        self.assertEqual(100000, sum_cents([0.1] * 10000))
+        self.assertNotEqual(1000.0, sum([0.1] * 10000))
+
+
+class VendingMachineMoneyTestCase(unittest.TestCase):
+
+    def test_balance_stays_exact(self):
+        vending_machine = VendingMachine()
+
+        for _ in range(10):
+            vending_machine.insert_money(0.1)
+
+        self.assertEqual(100, vending_machine.balance_cents)
+        self.assertEqual(1.0, vending_machine.current_balance)
+
+    def test_insert_money_below_one_cent(self):
+        inserted, total_balance = VendingMachine().insert_money(0.001)
+
+        self.assertFalse(inserted)
+
+    def test_insert_money_decimal(self):
+        inserted, total_balance = VendingMachine().insert_money(Decimal('0.30'))
+
+        self.assertTrue(inserted)
+        self.assertEqual(0.3, total_balance)
+
+    def test_item_price_in_cents(self):
+        item = Item('Soda', 0.75, 20)
+        item.price = Decimal('1.10')
+
+        self.assertEqual(110, item.price_cents)
+        self.assertEqual(1.1, item.price)
+
+    def test_change_price_in_cents(self):
+        vending_machine = VendingMachine()
+        vending_machine.add_item_to_slot(1, Item('Coffee', 1.75, 6))
+        vending_machine.change_price(1, 2.3)
+
+        self.assertEqual(230, vending_machine.slot_items[1].price_cents)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+from vending_machine.fleet import VendingFleet
+from vending_machine.journal import Journal, replay_journal
+from vending_machine.planogram import Planogram, PlanogramError, PlanogramOp, PlanogramRollbackError
+from vending_machine.vending_machine import Item, VendingMachine
+
+import os
+import tempfile
+import unittest
+
+
+class StubProvider:
+
+    def fetch(self, search_term):
+        return ''
+
+
+class FailingVendingMachine(VendingMachine):
+
+    __slots__ = ()
+
+    def add_item_to_slot(self, target_slot, item, replace=False):
+        if item.name == 'Broken':
+            return False
+        return super().add_item_to_slot(target_slot, item, replace=replace)
+
+    def remove_item_from_slot(self, target_slot):
+        slot_item = self.slot_items[target_slot]
+        if slot_item is not None and slot_item.name == 'Glue':
+            return False
+        return super().remove_item_from_slot(target_slot)
+
+    def change_price(self, target_slot, new_price):
+        if new_price == 9.99:
+            raise OSError('disk full')
+        return super().change_price(target_slot, new_price)
+
+
+def layout_of(vending_machine):
+    return Planogram.from_machine(vending_machine).layout
+
+
+class PlanogramTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.vending_machine = VendingMachine(slots=6, abstract_provider=StubProvider())
+        self.vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 5))
+        self.vending_machine.add_item_to_slot(2, Item('Chips', 1, 3))
+        self.vending_machine.add_item_to_slot(3, Item('Gum', 0.5, 9))
+        self.vending_machine.add_item_to_slot(4, Item('Tea', 2, 1))
+
+        self.planogram = Planogram({
+            1: ('Soda', 1.50, 10),
+            2: ('Water', 1, 6),
+            3: Item('Gum', 0.5, 9),
+            4: ('Coffee', 2, 2),
+            5: ('Chips', 1, 3),
+        })
+
+    def test_diff_is_minimal(self):
+        changes = self.planogram.diff(self.vending_machine)
+
+        self.assertEqual([
+            (PlanogramOp.MOVE_ITEM, 5, 2),
+            (PlanogramOp.REPLACE_ITEM, 4, None),
+            (PlanogramOp.ADD_ITEM, 2, None),
+            (PlanogramOp.CHANGE_PRICE, 1, None),
+            (PlanogramOp.CHANGE_STOCK, 1, None),
+        ], [change[:3] for change in changes])
+
+    def test_diff_moves_into_slots_emptied_by_moves(self):
+        vending_machine = VendingMachine(slots=3, abstract_provider=StubProvider())
+        vending_machine.add_item_to_slot(2, Item('Soda', 1, 4))
+        vending_machine.add_item_to_slot(3, Item('Chips', 1, 7))
+        planogram = Planogram({1: ('Soda', 1, 4), 2: ('Chips', 1, 7)})
+
+        changes = planogram.diff(vending_machine)
+
+        self.assertEqual([(PlanogramOp.MOVE_ITEM, 1, 2), (PlanogramOp.MOVE_ITEM, 2, 3)], [c[:3] for c in changes])
+
+        planogram.apply(vending_machine)
+
+        self.assertEqual(planogram.layout, layout_of(vending_machine))
+
+    def test_diff_replaces_swapped_items(self):
+        vending_machine = VendingMachine(slots=3, abstract_provider=StubProvider())
+        vending_machine.add_item_to_slot(1, Item('Soda', 1, 4))
+        vending_machine.add_item_to_slot(2, Item('Chips', 1, 7))
+
+        changes = Planogram({1: ('Chips', 1, 7), 2: ('Soda', 1, 4)}).diff(vending_machine)
+
+        self.assertEqual([(PlanogramOp.REPLACE_ITEM, 1), (PlanogramOp.REPLACE_ITEM, 2)], [c[:2] for c in changes])
+
+    def test_diff_removes_slots_left_out(self):
+        changes = Planogram({1: ('Soda', 1.25, 5)}).diff(self.vending_machine)
+
+        self.assertEqual([(PlanogramOp.REMOVE_ITEM, slot) for slot in (2, 3, 4)], [change[:2] for change in changes])
+
+    def test_apply(self):
+        changes = self.planogram.apply(self.vending_machine)
+
+        self.assertEqual(5, len(changes))
+        self.assertEqual(self.planogram.layout, layout_of(self.vending_machine))
+        self.assertEqual(1, self.vending_machine.available_slots)
+        self.assertEqual([], self.planogram.diff(self.vending_machine))
+        self.assertEqual([], self.planogram.apply(self.vending_machine))
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            Planogram({0: ('Soda', 1, 1)})
+        with self.assertRaises(ValueError):
+            Planogram({1: ('Soda', 1, -1)})
+        with self.assertRaises(ValueError):
+            Planogram({7: ('Soda', 1, 1)}).diff(self.vending_machine)
+
+    def test_failed_change_rolls_back(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'journal')
+
+            with Journal(path, slots=6) as journal:
+                vending_machine = FailingVendingMachine(slots=6, abstract_provider=StubProvider(), journal=journal)
+                vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 5))
+                vending_machine.add_item_to_slot(2, Item('Chips', 1, 3))
+                before = layout_of(vending_machine)
+
+                with self.assertRaises(PlanogramError) as raised:
+                    Planogram({1: ('Tea', 2, 1), 3: ('Chips', 1, 3), 4: ('Broken', 1, 1)}).apply(vending_machine)
+
+                self.assertEqual(PlanogramOp.ADD_ITEM, raised.exception.change.op)
+                self.assertEqual(before, layout_of(vending_machine))
+                self.assertEqual(4, vending_machine.available_slots)
+
+                with self.assertRaises(OSError):
+                    Planogram({1: ('Soda', 9.99, 5), 2: ('Water', 1, 1)}).apply(vending_machine)
+
+                self.assertEqual(before, layout_of(vending_machine))
+
+            # The rollback is journaled like the changes it undoes.
+            self.assertEqual(before, layout_of(replay_journal(path)))
+
+    def test_failed_rollback_is_reported(self):
+        vending_machine = FailingVendingMachine(slots=6, abstract_provider=StubProvider())
+        vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 5))
+
+        with self.assertRaises(PlanogramRollbackError) as raised:
+            Planogram({1: ('Soda', 1.25, 5), 2: ('Glue', 1, 1), 3: ('Broken', 1, 1)}).apply(vending_machine)
+
+        self.assertEqual((PlanogramOp.REMOVE_ITEM, 2), raised.exception.change[:2])
+        self.assertIsInstance(raised.exception.__cause__, PlanogramError)
+        self.assertEqual('Glue', vending_machine.slot_items[2].name)
+
+    def test_push_to_machines(self):
+        vending_machines = [VendingMachine(slots=6, abstract_provider=StubProvider()) for _ in range(3)]
+        self.planogram.apply(vending_machines[1])
+        vending_machines.append(FailingVendingMachine(slots=6, abstract_provider=StubProvider()))
+
+        report = Planogram({1: ('Soda', 1.50, 10), 6: ('Broken', 1, 1)}).push(vending_machines)
+
+        self.assertEqual(3, report.changed)
+        self.assertEqual(0, report.unchanged)
+        self.assertEqual([3], [machine_index for machine_index, error in report.failures])
+        self.assertEqual({}, layout_of(vending_machines[3]))
+
+    def test_push_reports_any_error(self):
+        vending_machines = [FailingVendingMachine(slots=6, abstract_provider=StubProvider()) for _ in range(3)]
+        vending_machines[1].add_item_to_slot(1, Item('Soda', 1.25, 5))
+
+        report = Planogram({1: ('Soda', 9.99, 5)}).push(vending_machines)
+
+        self.assertEqual(2, report.changed)
+        self.assertEqual([1], [machine_index for machine_index, error in report.failures])
+        self.assertIsInstance(report.failures[0][1], OSError)
+        self.assertEqual({1: ('Soda', 125, 5)}, layout_of(vending_machines[1]))
+
+    def test_push_to_fleet(self):
+        fleet = VendingFleet(4, slots=6, abstract_provider=StubProvider())
+        self.planogram.apply(fleet.machine(2))
+        fleet.machine(3).add_item_to_slot(6, Item('Tea', 2, 1))
+
+        report = self.planogram.push(fleet)
+
+        self.assertEqual(3, report.changed)
+        self.assertEqual(1, report.unchanged)
+        self.assertEqual(16, report.changes)
+        for vending_machine in fleet:
+            self.assertEqual(self.planogram.layout, layout_of(vending_machine))
+
+        report = self.planogram.push(fleet)
+
+        self.assertEqual((0, 4, 0), (report.changed, report.unchanged, report.changes))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+from unittest.mock import patch
+from vending_machine.console import Console
+from vending_machine.rendering import CUSTOMER_OPTIONS, MenuRenderer
+from vending_machine.vending_machine import Item, VendingMachine, VendingMachineInterface
+
+import unittest
+
+
+class MenuRendererTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.vending_machine = VendingMachine(slots=3)
+        self.vending_machine.add_item_to_slot(1, Item('Soda', 0.75, 20))
+        self.vending_machine.add_item_to_slot(3, Item('Coffee', 1.75, 5))
+        self.renderer = MenuRenderer(self.vending_machine)
+
+    def test_customer_screen(self):
+        self.vending_machine.insert_money(2)
+
+        self.assertEqual(
+            'Current balance: $2.00\n\n'
+            '==== SLOT ITEMS ====\n'
+            '[1] Soda - $0.75 (Remaining: 20)\n'
+            '[3] Coffee - $1.75 (Remaining: 5)\n' + CUSTOMER_OPTIONS,
+            self.renderer.customer_screen()
+        )
+
+    def test_slot_items_screen_lists_empty_slots(self):
+        self.assertEqual(
+            '\n==== SLOT ITEMS ====\n'
+            '[1] Soda - $0.75 (Remaining: 20)\n'
+            '[2] Empty slot\n'
+            '[3] Coffee - $1.75 (Remaining: 5)\n\n',
+            self.renderer.slot_items_screen()
+        )
+
+    def test_only_changed_slot_lines_are_formatted_again(self):
+        first_lines = list(self.renderer._slot_lines_of(include_empty=False))
+        self.vending_machine.decrease_stock(3)
+        second_lines = list(self.renderer._slot_lines_of(include_empty=False))
+
+        self.assertIs(first_lines[0], second_lines[0])
+        self.assertEqual('[3] Coffee - $1.75 (Remaining: 4)\n', second_lines[1])
+
+        self.vending_machine.change_name(1, 'Cola')
+
+        self.assertEqual('[1] Cola - $0.75 (Remaining: 20)\n', self.renderer.customer_screen().splitlines(True)[3])
+
+    def test_one_write_per_screen(self):
+        interface = VendingMachineInterface(self.vending_machine, console=Console())
+
+        with patch('builtins.input', side_effect=['m', 'd', 'q']), patch('builtins.print') as print_mock:
+            interface.run()
+
+        # Welcome, customer menu, maintenance menu, slot listing, maintenance menu.
+        self.assertEqual(5, print_mock.call_count)
+        self.assertIn('[2] Empty slot\n', print_mock.call_args_list[3][0][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
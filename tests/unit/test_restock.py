@@ -0,0 +1,130 @@
+from vending_machine.events import EventBus
+from vending_machine.restock import RestockPlanner
+from vending_machine.vending_machine import Item, VendingMachine
+
+import math
+import unittest
+
+HOUR = 3600
+
+
+class StubProvider:
+
+    def fetch(self, search_term):
+        return ''
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RestockPlannerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.planner = RestockPlanner(half_life=24 * HOUR, clock=self.clock)
+
+    def test_rate_follows_steady_sales(self):
+        # Two vends an hour for two weeks, long enough for the weight of the first vends to fade.
+        for n in range(2 * 24 * 14):
+            self.planner.observe_vend(0, 1, 1000, at=n * HOUR / 2)
+
+        self.assertAlmostEqual(2, self.planner.rate(0, 1, at=14 * 24 * HOUR), delta=0.05)
+        self.assertAlmostEqual(1, self.planner.rate(0, 1, at=15 * 24 * HOUR), delta=0.05)
+        self.assertEqual(0, self.planner.rate(0, 2))
+
+    def test_stockout_projection(self):
+        for n in range(2 * 24 * 14):
+            self.planner.observe_vend(0, 1, 10, at=n * HOUR / 2)
+
+        # 10 left at 2 an hour, from the last vend.
+        last_vend = (2 * 24 * 14 - 1) * HOUR / 2
+        self.assertAlmostEqual(last_vend + 5 * HOUR, self.planner.stockout_time(0, 1), delta=HOUR / 4)
+        self.assertEqual(math.inf, self.planner.stockout_time(0, 2))
+
+    def test_plan_ranks_slots_by_stockout_time(self):
+        self.planner.observe_vend(0, 1, 5, at=0)
+        self.planner.observe_vend(0, 2, 1, at=0)
+        self.planner.observe_vend(1, 1, 0, at=0)
+        self.planner.observe_vend(1, 2, 10 ** 6, at=0)
+        self.planner.observe_stock(2, 1, 3, at=0)
+
+        plan = self.planner.plan(horizon=1000 * HOUR, at=0)
+
+        self.assertEqual([(1, 1), (0, 2), (0, 1)], [(need.machine_id, need.slot_number) for need in plan])
+        self.assertEqual([0, 1, 5], [need.stock for need in plan])
+        self.assertEqual([(1, 1)], [(need.machine_id, need.slot_number) for need in self.planner.plan(1000, at=0)])
+        self.assertEqual(2, len(self.planner.plan(1000 * HOUR, at=0, limit=2)))
+
+    def test_updates_replace_older_projections(self):
+        self.planner.observe_vend(0, 1, 1, at=0)
+        self.planner.observe_stock(0, 1, 10 ** 6, at=HOUR)
+        self.planner.observe_vend(0, 2, 3, at=HOUR)
+        self.planner.forget(0, 2)
+
+        self.assertEqual([], self.planner.plan(1000 * HOUR, at=HOUR))
+
+        self.planner.observe_stock(0, 1, 0, at=2 * HOUR)
+
+        self.assertEqual([(0, 1, 0)], [need[:3] for need in self.planner.plan(0, at=2 * HOUR)])
+
+    def test_heap_is_compacted(self):
+        for n in range(1000):
+            self.planner.observe_vend(0, 1, 1000 - n, at=n)
+
+        self.assertLessEqual(len(self.planner._heap), 2 * len(self.planner) + 64)
+        self.assertEqual(1, len(self.planner.plan(10 ** 9, at=1000)))
+
+    def test_watch_follows_machine_events(self):
+        events = EventBus()
+        vending_machine = VendingMachine(slots=3, abstract_provider=StubProvider(), events=events)
+        self.planner.watch(vending_machine, machine_id=7)
+
+        vending_machine.add_item_to_slot(1, Item('Soda', 1, 2))
+        vending_machine.add_item_to_slot(1, Item('Soda', 1, 2))
+        vending_machine.vend_many([(1, 1), (1, 1)], abstracts=False)
+
+        self.assertEqual([(7, 1, 2)], [need[:3] for need in self.planner.plan(10 ** 9, at=0)])
+
+        vending_machine.move_item_to_slot(1, 2)
+        vending_machine.decrease_stock(2, 2)
+
+        self.assertEqual([(7, 2, 0)], [need[:3] for need in self.planner.plan(0, at=0)])
+
+        vending_machine.replace_item_in_slot(2, Item('Coffee', 2, 5))
+
+        self.assertEqual(0, self.planner.rate(7, 2))
+        self.assertEqual([], self.planner.plan(10 ** 9, at=0))
+
+        vending_machine.remove_item_from_slot(2)
+
+        self.assertEqual(0, len(self.planner))
+
+    def test_watch_resets_rate_of_item_added_in_place_of_another(self):
+        events = EventBus()
+        vending_machine = VendingMachine(slots=3, abstract_provider=StubProvider(), events=events)
+        vending_machine.add_item_to_slot(1, Item('Soda', 1, 5))
+        self.planner.watch(vending_machine)
+
+        vending_machine.vend_many([(1, 1), (1, 1)], abstracts=False)
+        vending_machine.add_item_to_slot(1, Item('Soda', 1, 2))
+
+        self.assertGreater(self.planner.rate(0, 1), 0)
+
+        vending_machine.add_item_to_slot(1, Item('Coffee', 2, 5), replace=True)
+
+        self.assertEqual(0, self.planner.rate(0, 1))
+        self.assertEqual([], self.planner.plan(10 ** 9, at=0))
+
+    def test_watch_needs_event_bus(self):
+        with self.assertRaises(ValueError):
+            self.planner.watch(VendingMachine(abstract_provider=StubProvider()))
+
+
+if __name__ == '__main__':
+    unittest.main()
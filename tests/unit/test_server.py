@@ -0,0 +1,136 @@
+from vending_machine.client import VendingClient, VendingServerError
+from vending_machine.server import MAX_LINE_LENGTH, VendingServer, parse_address
+from vending_machine.vending_machine import Item, VendingMachine, VendReason
+
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+
+class StubAsyncProvider:
+
+    async def fetch(self, search_term):
+        await asyncio.sleep(0)
+        return f'About {search_term}'
+
+
+class VendingServerTestCase(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.vending_machine = VendingMachine()
+        self.vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 2))
+        self.server = VendingServer(self.vending_machine, abstract_provider=StubAsyncProvider())
+        self.host, self.port = await self.server.start()
+        self.client = await VendingClient.connect(self.host, self.port)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+
+    async def test_insert_and_vend(self):
+        self.assertEqual((True, 200), await self.client.insert(2))
+        self.assertEqual((True, VendReason.VENDED, 75, 'About Soda'), await self.client.vend(1))
+        self.assertEqual((False, VendReason.INSUFFICIENT_BALANCE, 75, 'About Soda'), await self.client.vend(1))
+        self.assertEqual((False, VendReason.EMPTY_SLOT, 75, ''), await self.client.vend(2))
+        self.assertEqual(['75'], await self.client.request('BALANCE'))
+        self.assertEqual(1, self.vending_machine.slot_items[1].stock)
+
+    async def test_maintenance_commands(self):
+        self.assertEqual(['1'], await self.client.request('ADD', 2, '0.5', 10, 'Sparkling Water'))
+        self.assertEqual(['Sparkling Water', '50', '10'], await self.client.request('SLOT', 2))
+        self.assertEqual(['1'], await self.client.request('MOVE', 2, 3))
+        self.assertEqual(['1'], await self.client.request('PRICE', 3, '0.75'))
+        self.assertEqual(['1'], await self.client.request('NAME', 3, 'Still Water'))
+        self.assertEqual(['1', '15'], await self.client.request('RESTOCK', 3, 5))
+        self.assertEqual(['1', '12'], await self.client.request('UNSTOCK', 3, 3))
+        self.assertEqual(['Still Water', '75', '12'], await self.client.request('SLOT', 3))
+        self.assertEqual(['1'], await self.client.request('CLEAR', 3))
+        self.assertEqual([], await self.client.request('SLOT', 3))
+        self.assertEqual(8, self.vending_machine.available_slots)
+
+    async def test_errors(self):
+        for request in (('FLY',), ('INSERT', 'lots'), ('VEND',), ('SLOT', 10), ('MOVE', 1, 2, 'yes')):
+            with self.assertRaises(VendingServerError):
+                await self.client.request(*request)
+
+        self.assertEqual([], await self.client.request('PING'))
+
+    async def test_wrong_number_of_arguments(self):
+        for request in (('PING', 1), ('VEND',), ('MOVE', 1), ('ADD', 2, '0.5', 10)):
+            with self.assertRaisesRegex(VendingServerError, 'wrong number of arguments'):
+                await self.client.request(*request)
+
+    async def test_internal_error_keeps_connection(self):
+        with mock.patch.object(VendingMachine, 'change_name', side_effect=KeyError(3)):
+            responses = await asyncio.gather(
+                self.client.request('NAME', 1, 'Cola'), self.client.request('BALANCE'), return_exceptions=True,
+            )
+
+        self.assertIsInstance(responses[0], VendingServerError)
+        self.assertIn('internal error', str(responses[0]))
+        self.assertEqual(['0'], responses[1])
+
+    async def test_pipelined_responses_keep_request_order(self):
+        self.vending_machine.increase_stock(1, 100)
+
+        responses = await asyncio.gather(*(
+            self.client.request('INSERT', 2) if n % 2 == 0 else self.client.request('VEND', 1) for n in range(100)
+        ))
+
+        for n in range(50):
+            self.assertEqual(['1', str(200 + n * 75)], responses[2 * n])
+            self.assertEqual(['1', '0', str(75 + n * 75), 'About Soda'], responses[2 * n + 1])
+
+        self.assertEqual(52, self.vending_machine.slot_items[1].stock)
+        self.assertEqual(1, self.server.connections)
+
+    async def test_quit_closes_connection(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        writer.write(b'PING\nQUIT\nPING\n')
+
+        self.assertEqual(b'OK\nOK\n', await reader.read())
+        writer.close()
+
+    async def test_requests_split_across_reads(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        writer.write(b'BALA')
+        await writer.drain()
+        await asyncio.sleep(0.01)
+        writer.write(b'NCE\nINSERT 2\nPING')
+        writer.write_eof()
+
+        self.assertEqual(b'OK\t0\nOK\t1\t200\nOK\n', await reader.read())
+        writer.close()
+
+    async def test_request_line_too_long(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        writer.write(b'PING\n' + b'x' * (MAX_LINE_LENGTH + 1))
+
+        self.assertEqual(b'OK\nERR\trequest line too long\n', await reader.read())
+        writer.close()
+
+    async def test_unix_socket(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'vending.sock')
+            await self.server.start_unix(path)
+            client = await VendingClient.connect_unix(path)
+
+            self.assertEqual(['0'], await client.request('BALANCE'))
+            await client.close()
+
+
+class ParseAddressTestCase(unittest.TestCase):
+
+    def test_parse_address(self):
+        self.assertEqual(('tcp', '0.0.0.0', 8000), parse_address('0.0.0.0:8000'))
+        self.assertEqual(('tcp', '127.0.0.1', 8000), parse_address(':8000'))
+        self.assertEqual(('unix', '/tmp/vending.sock'), parse_address('unix:/tmp/vending.sock'))
+
+        with self.assertRaises(ValueError):
+            parse_address('localhost')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+from vending_machine.sharding import ShardedFleet, ShardOp
+from vending_machine.vending_machine import Item, VendingMachine, VendReason
+
+import random
+import unittest
+
+
+class StubProvider:
+
+    def fetch(self, search_term):
+        return ''
+
+
+class ShardedFleetTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.fleet = ShardedFleet(machines=5, slots=3, workers=2, batch_size=8)
+        self.addCleanup(self.fleet.close)
+
+    def test_commands_match_single_machines(self):
+        rng = random.Random(7)
+        vending_machines = [VendingMachine(slots=3, abstract_provider=StubProvider()) for _ in range(5)]
+        commands = [(ShardOp.ADD_ITEM, machine_id, slot_number, 75 * slot_number, 2, f'Item {slot_number}')
+                    for machine_id in range(5) for slot_number in range(1, 4)]
+
+        for _ in range(100):
+            op = rng.choice(list(ShardOp))
+            commands.append((op, rng.randrange(5), rng.randrange(5), rng.choice((0, 25, 100, 200)), 3, 'Soda'))
+
+        results = self.fleet.execute(commands)
+
+        self.assertEqual(len(commands), len(results))
+
+        for index, (op, machine_id, slot_number, value, extra, name) in enumerate(commands):
+            vending_machine = vending_machines[machine_id]
+
+            if op == ShardOp.INSERT_MONEY:
+                expected = vending_machine.insert_money(value / 100)[0], 0, vending_machine.balance_cents
+            elif op == ShardOp.REMOVE_MONEY:
+                expected = vending_machine.remove_money(value / 100)[0], 0, vending_machine.balance_cents
+            elif op == ShardOp.VEND:
+                batch = vending_machine.vend_many([(value / 100, slot_number)], abstracts=False)
+                expected = batch.vended[0], batch.reasons[0], batch.balances[0]
+            elif op == ShardOp.INCREASE_STOCK:
+                increased, stock = vending_machine.increase_stock(slot_number, value)
+                expected = increased, 0, stock
+            else:
+                expected = vending_machine.add_item_to_slot(slot_number, Item(name, value / 100, extra), True), 0, 0
+
+            self.assertEqual(expected, (bool(results.ok[index]), results.reasons[index], results.values[index]),
+                             f'command {index}: {commands[index]}')
+
+    def test_vend_many_and_totals(self):
+        self.fleet.stock_all(1, 'Soda', 100, 1)
+
+        results = self.fleet.vend_many([(machine_id, 100, 1) for machine_id in range(5)] + [(0, 100, 1), (3, 0, 2)])
+
+        self.assertEqual([1, 1, 1, 1, 1, 0, 0], list(results.ok))
+        self.assertEqual(VendReason.OUT_OF_STOCK, results.reasons[5])
+        self.assertEqual(VendReason.EMPTY_SLOT, results.reasons[6])
+        self.assertEqual(100, results.values[5])
+
+        totals = self.fleet.totals()
+
+        self.assertEqual(12, totals['commands'])
+        self.assertEqual(5, totals['vends'])
+        self.assertEqual(500, totals['revenue_cents'])
+        self.assertEqual(5, totals['reasons'][VendReason.VENDED])
+        self.assertEqual(1, totals['reasons'][VendReason.OUT_OF_STOCK])
+
+    def test_amounts_stay_integer_cents(self):
+        amount_cents = 2 ** 53 + 1
+        results = self.fleet.execute([
+            (ShardOp.INSERT_MONEY, 2, 0, amount_cents, 0),
+            (ShardOp.ADD_ITEM, 2, 1, amount_cents, 1, 'Gold Bar'),
+            (ShardOp.VEND, 2, 1, 0, 0),
+            (ShardOp.INSERT_MONEY, 2, 0, amount_cents, 0),
+            (ShardOp.REMOVE_MONEY, 2, 0, 1, 0),
+        ])
+
+        self.assertEqual([amount_cents, 0, 0, amount_cents, amount_cents - 1], list(results.values))
+        self.assertEqual(amount_cents, self.fleet.totals()['revenue_cents'])
+
+    def test_failed_shard_leaves_other_shards_applied(self):
+        with self.assertRaisesRegex(RuntimeError, 'shard 1'):
+            self.fleet.execute([(ShardOp.INSERT_MONEY, 0, 0, 100, 0), (99, 1, 0, 100, 0)])
+
+        results = self.fleet.execute([(ShardOp.REMOVE_MONEY, 0, 0, 25, 0)])
+
+        self.assertEqual(75, results.values[0])
+
+    def test_unknown_machine(self):
+        with self.assertRaises(IndexError):
+            self.fleet.execute([(ShardOp.INSERT_MONEY, 5, 0, 100, 0)])
+
+    def test_empty_batch(self):
+        self.assertEqual(0, len(self.fleet.execute([])))
+
+
+if __name__ == '__main__':
+    unittest.main()
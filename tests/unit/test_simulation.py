@@ -0,0 +1,68 @@
+from vending_machine.simulation import FleetSimulation, SimulatedVendingMachine
+
+import unittest
+
+
+def summary(report):
+    return [
+        (machine.revenue_cents, machine.vends, machine.lost_sales, round(machine.stockout_hours, 9), machine.restocks,
+         machine.max_cash_cents)
+        for machine in report.machines
+    ]
+
+
+class FleetSimulationTestCase(unittest.TestCase):
+
+    def test_same_seed_same_report(self):
+        first = FleetSimulation(machines=5, seed=3).run(200)
+        second = FleetSimulation(machines=5, seed=3).run(200)
+        other = FleetSimulation(machines=5, seed=4).run(200)
+
+        self.assertEqual(summary(first), summary(second))
+        self.assertNotEqual(summary(first), summary(other))
+
+    def test_revenue_and_stock_match_vends(self):
+        simulation = FleetSimulation(machines=3, capacity=1000, restock_interval=10 ** 6, seed=1)
+
+        report = simulation.run(100)
+
+        for vending_machine, machine_report in zip(simulation.vending_machines, report.machines):
+            remaining = sum(slot_item.stock for slot_item in vending_machine.slot_items.values())
+            self.assertEqual(9 * 1000 - machine_report.vends, remaining)
+            self.assertEqual(0, vending_machine.balance_cents)
+            self.assertEqual(0, machine_report.lost_sales)
+            self.assertGreater(machine_report.revenue_cents, machine_report.vends * 75 - 1)
+        self.assertGreater(report.vends, 3 * 4 * 100 * 0.8)
+
+    def test_stockouts_without_restocks(self):
+        simulation = FleetSimulation(machines=2, capacity=2, arrival_rate=20, restock_interval=10 ** 6, seed=2)
+
+        report = simulation.run(100)
+
+        self.assertEqual(2 * 9 * 2, report.vends)
+        self.assertGreater(report.lost_sales, 0)
+        self.assertGreater(report.stockout_hours, 2 * 9 * 50)
+        self.assertLessEqual(report.stockout_hours, 2 * 9 * 100)
+
+    def test_restocks_reduce_stockouts(self):
+        rarely = FleetSimulation(machines=10, capacity=5, restock_interval=72, seed=5).run(24 * 14)
+        daily = FleetSimulation(machines=10, capacity=5, restock_interval=12, seed=5).run(24 * 14)
+
+        self.assertLess(daily.stockout_hours, rarely.stockout_hours)
+        self.assertLess(daily.lost_sales, rarely.lost_sales)
+        self.assertGreater(daily.revenue_cents, rarely.revenue_cents)
+        self.assertEqual(10 * 14 * 2, sum(machine.restocks for machine in daily.machines))
+
+    def test_cash_pickups(self):
+        report = FleetSimulation(machines=2, cash_pickup_interval=24, seed=6).run(24 * 7)
+
+        for machine_report in report.machines:
+            self.assertEqual(7, machine_report.cash_pickups)
+            self.assertLess(machine_report.max_cash_cents, machine_report.revenue_cents)
+
+    def test_abstract_lookups_are_stubbed(self):
+        self.assertEqual('', SimulatedVendingMachine()._get_abstract('Soda'))
+
+
+if __name__ == '__main__':
+    unittest.main()
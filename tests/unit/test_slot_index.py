@@ -0,0 +1,83 @@
+from unittest.mock import patch
+from vending_machine.console import HeadlessConsole
+from vending_machine.slot_index import SlotIndex
+from vending_machine.vending_machine import Item, VendingMachine, VendingMachineInterface
+
+import random
+import unittest
+
+
+class SlotIndexTestCase(unittest.TestCase):
+
+    def assert_matches_scan(self, vending_machine, threshold=3):
+        slot_items = vending_machine.slot_items
+        occupied = {slot for slot, item in slot_items.items() if item is not None}
+        names = {slot_items[slot].name for slot in occupied}
+        low_stock = sorted((slot_items[slot].stock, slot) for slot in occupied if slot_items[slot].stock <= threshold)
+
+        self.assertEqual(set(slot_items) - occupied, vending_machine.empty_slots())
+        self.assertEqual(occupied, vending_machine.occupied_slots())
+        for name in names:
+            self.assertEqual({slot for slot in occupied if slot_items[slot].name == name},
+                             vending_machine.find_slots(name))
+        self.assertEqual([(slot, stock) for stock, slot in low_stock], vending_machine.low_stock_slots(threshold))
+        self.assertEqual(len(set(slot_items) - occupied), vending_machine.available_slots)
+
+    def test_random_mutations_keep_indexes_current(self):
+        rng = random.Random(7)
+        vending_machine = VendingMachine(slots=20)
+        vending_machine.insert_money(10000)
+        names = ['Soda', 'Coffee', 'Water', 'Tea']
+
+        for step in range(3000):
+            slot, other_slot = rng.randint(1, 20), rng.randint(1, 20)
+            operation = rng.randrange(8)
+
+            if operation == 0:
+                vending_machine.add_item_to_slot(slot, Item(rng.choice(names), 1, rng.randint(0, 6)),
+                                                 replace=rng.random() < 0.5)
+            elif operation == 1:
+                vending_machine.move_item_to_slot(slot, other_slot, replace=rng.random() < 0.5)
+            elif operation == 2:
+                vending_machine.remove_item_from_slot(slot)
+            elif operation == 3:
+                vending_machine.replace_item_in_slot(slot, Item(rng.choice(names), 1, rng.randint(0, 6)))
+            elif operation == 4:
+                vending_machine.change_name(slot, rng.choice(names))
+            elif operation == 5:
+                vending_machine.increase_stock(slot, rng.randint(1, 3))
+            elif operation == 6:
+                vending_machine.decrease_stock(slot, rng.randint(1, 3))
+            else:
+                vending_machine.vend_many([(0, slot), (0, other_slot)], abstracts=False)
+
+            if step % 50 == 0:
+                self.assert_matches_scan(vending_machine)
+
+        self.assert_matches_scan(vending_machine)
+
+    def test_stale_heap_entries_are_compacted(self):
+        slot_items = {1: Item('Soda', 1, 1000), 2: None}
+        slot_index = SlotIndex(slot_items)
+
+        for _ in range(999):
+            slot_items[1].stock -= 1
+            slot_index.stock_changed(1, slot_items[1].stock)
+
+        self.assertLessEqual(len(slot_index._stock_heap), 2 * len(slot_index.occupied) + 65)
+        self.assertEqual([(1, 1)], slot_index.low_stock(1))
+
+    def test_maintenance_menu_does_not_copy_empty_slots(self):
+        vending_machine = VendingMachine(slots=10 ** 6, sparse=True)
+        vending_machine.add_item_to_slot(3, Item('Soda', 0.75, 2))
+        script = ['m', 'a', '500000', 'Water', '1.00', '3', 'rep', '3', 'y', 'Cola', '1.25', '4', 'q']
+
+        with patch.object(VendingMachine, 'empty_slots', side_effect=AssertionError('empty_slots called')):
+            VendingMachineInterface(vending_machine, console=HeadlessConsole(script)).run()
+
+        self.assertEqual('Water', vending_machine.slot_items[500000].name)
+        self.assertEqual('Cola', vending_machine.slot_items[3].name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+from unittest.mock import patch
+from vending_machine.fleet import VendingFleet
+from vending_machine.snapshot import (SnapshotWriter, load_fleet_snapshot, load_snapshot, open_fleet_snapshot,
+                                      save_fleet_snapshot, save_snapshot)
+from vending_machine.sparse_slots import SparseSlots
+from vending_machine.vending_machine import Item, VendingMachine
+
+import os
+import tempfile
+import unittest
+
+
+def slot_states(vending_machine):
+    return {
+        slot_number: None if slot_item is None else (slot_item.name, slot_item.price_cents, slot_item.stock)
+        for slot_number, slot_item in vending_machine.slot_items.items()
+    }
+
+
+class SnapshotTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'machine.snapshot')
+
+        self.vending_machine = VendingMachine(slots=5)
+        self.vending_machine.add_item_to_slot(1, Item('Sparkling Water', 1.25, 20))
+        self.vending_machine.add_item_to_slot(4, Item('Café au lait', 2.10, 3))
+        self.vending_machine.insert_money(3.35)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_save_and_load_machine(self):
+        save_snapshot(self.vending_machine, self.path)
+        loaded = load_snapshot(self.path)
+
+        self.assertEqual(5, loaded.total_slots)
+        self.assertEqual(3, loaded.available_slots)
+        self.assertEqual(3.35, loaded.current_balance)
+        self.assertEqual(slot_states(self.vending_machine), slot_states(loaded))
+
+    def test_load_not_a_snapshot(self):
+        with open(self.path, 'wb') as snapshot_file:
+            snapshot_file.write(b'\0' * 100)
+
+        with self.assertRaises(ValueError):
+            load_snapshot(self.path)
+
+    def test_load_fleet_as_machine(self):
+        save_fleet_snapshot(VendingFleet(2), self.path)
+
+        with self.assertRaises(ValueError):
+            load_snapshot(self.path)
+
+    def test_incremental_checkpoint_writes_dirty_slots(self):
+        writer = SnapshotWriter(self.vending_machine, self.path)
+
+        self.assertEqual(5, writer.checkpoint())
+        self.assertEqual(0, writer.checkpoint())
+
+        self.vending_machine.decrease_stock(4, 1)
+        self.vending_machine.add_item_to_slot(2, Item('Lemonade', 2.00, 15))
+        self.vending_machine.remove_money(1)
+
+        self.assertEqual(2, writer.checkpoint())
+
+        loaded = load_snapshot(self.path)
+
+        self.assertEqual(slot_states(self.vending_machine), slot_states(loaded))
+        self.assertEqual(2.35, loaded.current_balance)
+        self.assertEqual(2, loaded.available_slots)
+
+    def test_incremental_checkpoint_writes_emptied_slots(self):
+        writer = SnapshotWriter(self.vending_machine, self.path)
+        writer.checkpoint()
+
+        self.vending_machine.remove_item_from_slot(4)
+
+        self.assertEqual(1, writer.checkpoint())
+        self.assertIsNone(load_snapshot(self.path).slot_items[4])
+
+    def test_interrupted_checkpoint_refused(self):
+        writer = SnapshotWriter(self.vending_machine, self.path)
+        writer.checkpoint()
+        self.vending_machine.decrease_stock(4, 1)
+
+        with patch('vending_machine.snapshot.os.fsync', side_effect=[None, OSError('disk full')]):
+            with self.assertRaises(OSError):
+                writer.checkpoint()
+
+        with self.assertRaises(ValueError):
+            load_snapshot(self.path)
+
+        writer.checkpoint()
+
+        self.assertEqual(2, load_snapshot(self.path).slot_items[4].stock)
+
+    def test_sparse_machine_stays_sparse(self):
+        vending_machine = VendingMachine(slots=100000, sparse=True)
+        vending_machine.add_item_to_slot(70000, Item('Soda', 0.75, 20))
+
+        writer = SnapshotWriter(vending_machine, self.path)
+        writer.checkpoint()
+        vending_machine.increase_stock(70000, 5)
+
+        self.assertEqual(1, writer.checkpoint())
+
+        loaded = load_snapshot(self.path)
+
+        self.assertIsInstance(loaded.slot_items, SparseSlots)
+        self.assertEqual(25, loaded.slot_items[70000].stock)
+        self.assertIsInstance(load_snapshot(self.path, sparse=False).slot_items, dict)
+
+    def test_fleet_round_trip(self):
+        fleet = VendingFleet(3, slots=4)
+        fleet.machine(0).add_item_to_slot(1, Item('Soda', 0.75, 20))
+        fleet.machine(2).add_item_to_slot(4, Item('Coffee', 1.75, 6))
+        fleet.machine(2).insert_money(5)
+
+        save_fleet_snapshot(fleet, self.path)
+        loaded = load_fleet_snapshot(self.path)
+
+        for machine_id in range(3):
+            self.assertEqual(slot_states(fleet.machine(machine_id)), slot_states(loaded.machine(machine_id)))
+
+        self.assertEqual(500, loaded.balances[2])
+
+    def test_memory_mapped_fleet_persists_changes(self):
+        fleet = VendingFleet(3, slots=4)
+        fleet.machine(1).add_item_to_slot(1, Item('Soda', 0.75, 20))
+        save_fleet_snapshot(fleet, self.path)
+
+        with open_fleet_snapshot(self.path) as snapshot:
+            vending_machine = snapshot.fleet.machine(1)
+            vending_machine.insert_money(1)
+            vending_machine._vend(1)
+            vending_machine.add_item_to_slot(3, Item('Iced Tea', 1.50, 7))
+            snapshot.checkpoint()
+
+            vending_machine.increase_stock(3, 2)
+
+        loaded = load_fleet_snapshot(self.path)
+        vending_machine = loaded.machine(1)
+
+        self.assertEqual(25, vending_machine.balance_cents)
+        self.assertEqual(19, vending_machine.slot_items[1].stock)
+        self.assertEqual('Iced Tea', vending_machine.slot_items[3].name)
+        self.assertEqual(9, vending_machine.slot_items[3].stock)
+        self.assertEqual(2, vending_machine.available_slots)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+from vending_machine.snapshot import load_snapshot, save_snapshot
+from vending_machine.sparse_slots import SparseSlots, occupied_items
+from vending_machine.vending_machine import Item, VendingMachine
+
+import os
+import random
+import tempfile
+import tracemalloc
+import unittest
+
+
+class SparseSlotsTestCase(unittest.TestCase):
+
+    def test_behaves_like_slot_items_dict(self):
+        slot_items = SparseSlots(5)
+        slot_items[3] = Item('Soda', 1, 2)
+
+        self.assertEqual(5, len(slot_items))
+        self.assertEqual([1, 2, 3, 4, 5], list(slot_items))
+        self.assertIsNone(slot_items[1])
+        self.assertEqual('Soda', slot_items[3].name)
+        self.assertIn(5, slot_items)
+        self.assertNotIn(6, slot_items)
+        self.assertEqual([None, None, 'Soda', None, None], [item and item.name for item in slot_items.values()])
+
+        slot_items[3] = None
+
+        self.assertIsNone(slot_items[3])
+        self.assertEqual([], slot_items.occupied_items())
+
+    def test_out_of_range_slots_raise_key_error(self):
+        slot_items = SparseSlots(5)
+
+        with self.assertRaises(KeyError):
+            slot_items[0]
+        with self.assertRaises(KeyError):
+            slot_items[6] = Item('Soda', 1, 2)
+
+    def test_occupied_items_of_dict_and_sparse_slots(self):
+        soda, water = Item('Soda', 1, 2), Item('Water', 1, 2)
+        sparse_slot_items = SparseSlots(5)
+        sparse_slot_items[4], sparse_slot_items[2] = water, soda
+
+        self.assertEqual([(2, soda), (4, water)], list(occupied_items(sparse_slot_items)))
+        self.assertEqual([(2, soda), (4, water)], list(occupied_items({1: None, 2: soda, 3: None, 4: water})))
+
+    def test_only_occupied_slots_are_allocated(self):
+        tracemalloc.start()
+        vending_machine = VendingMachine(slots=10 ** 6, sparse=True)
+        allocated, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.assertLess(peak, 10000)
+        self.assertEqual(10 ** 6, vending_machine.available_slots)
+
+    def test_random_operations_match_dense_machine(self):
+        rng = random.Random(17)
+        dense, sparse = VendingMachine(slots=30), VendingMachine(slots=30, sparse=True)
+        names = ['Soda', 'Coffee', 'Water']
+
+        for step in range(2000):
+            slot, other_slot = rng.randint(-1, 32), rng.randint(-1, 32)
+            operation = rng.randrange(7)
+            name, stock, replace = rng.choice(names), rng.randint(0, 4), rng.random() < 0.5
+
+            for vending_machine in (dense, sparse):
+                if operation == 0:
+                    result = vending_machine.add_item_to_slot(slot, Item(name, 1, stock), replace=replace)
+                elif operation == 1:
+                    result = vending_machine.move_item_to_slot(slot, other_slot, replace=replace)
+                elif operation == 2:
+                    result = vending_machine.remove_item_from_slot(slot)
+                elif operation == 3:
+                    result = vending_machine.change_name(slot, name)
+                elif operation == 4:
+                    result = vending_machine.decrease_stock(slot, stock)
+                elif operation == 5:
+                    result = vending_machine.insert_money(stock)
+                else:
+                    batch = vending_machine.vend_many([(0, slot), (0, other_slot)], abstracts=False)
+                    result = list(zip(batch.vended, batch.reasons, batch.balances))
+
+                if vending_machine is dense:
+                    expected = result
+                else:
+                    self.assertEqual(expected, result, f'step {step}')
+
+            if step % 100 == 0:
+                self.assert_same_state(dense, sparse)
+
+        self.assert_same_state(dense, sparse)
+
+    def test_snapshot_round_trip(self):
+        vending_machine = VendingMachine(slots=10 ** 5, sparse=True)
+        vending_machine.add_item_to_slot(7, Item('Soda', 1.25, 3))
+        vending_machine.add_item_to_slot(99999, Item('Water', 1, 2))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'machine.snapshot')
+            save_snapshot(vending_machine, path)
+            loaded = load_snapshot(path)
+
+        self.assertEqual({7, 99999}, loaded.occupied_slots())
+        self.assertEqual(vending_machine.available_slots, loaded.available_slots)
+
+    def assert_same_state(self, dense, sparse):
+        self.assertEqual(dense.balance_cents, sparse.balance_cents)
+        self.assertEqual(dense.available_slots, sparse.available_slots)
+        self.assertEqual(dense.empty_slots(), sparse.empty_slots())
+        self.assertEqual(dense.occupied_slots(), sparse.occupied_slots())
+        self.assertEqual(dense.low_stock_slots(2), sparse.low_stock_slots(2))
+        self.assertEqual(
+            [(slot, item.name, item.stock) for slot, item in occupied_items(dense.slot_items)],
+            [(slot, item.name, item.stock) for slot, item in occupied_items(sparse.slot_items)],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
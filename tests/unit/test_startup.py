@@ -0,0 +1,78 @@
+from unittest.mock import MagicMock
+from vending_machine.abstract_cache import AbstractCache
+from vending_machine.abstract_prefetcher import AbstractPrefetcher
+from vending_machine.startup import COLD_START_BUDGET_US, measure_import_time, warmup, warmup_in_background
+from vending_machine.vending_machine import Item, VendingMachine
+
+import os
+import threading
+import unittest
+
+
+class StartupTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.provider = MagicMock()
+        self.provider.fetch.return_value = 'A sweet drink'
+
+        self.vending_machine = VendingMachine(abstract_cache=AbstractCache(), abstract_provider=self.provider)
+        self.vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 20))
+
+    def test_warmup_sets_up_provider(self):
+        warmup(provider=self.provider)
+
+        self.provider.warmup.assert_called_once_with()
+        self.provider.fetch.assert_not_called()
+
+    def test_warmup_caches_slot_item_abstracts(self):
+        warmup(self.vending_machine)
+
+        self.provider.warmup.assert_called_once_with()
+        self.assertIn('Soda', self.vending_machine.abstract_cache)
+
+    def test_warmup_joins_prefetched_lookups(self):
+        release = threading.Event()
+        self.provider.fetch.side_effect = lambda search_term: release.wait(5) and 'A sweet drink'
+        prefetcher = AbstractPrefetcher(max_workers=1)
+        vending_machine = VendingMachine(
+            abstract_cache=AbstractCache(), abstract_prefetcher=prefetcher, abstract_provider=self.provider
+        )
+        vending_machine.add_item_to_slot(1, Item('Coffee', 1.75, 20))
+
+        thread = warmup_in_background(vending_machine)
+        release.set()
+        thread.join(timeout=5)
+        prefetcher.shutdown()
+
+        self.provider.fetch.assert_called_once_with('Coffee')
+        self.assertIn('Coffee', vending_machine.abstract_cache)
+
+    def test_first_vend_after_warmup_skips_fetch(self):
+        warmup_in_background(self.vending_machine).join(timeout=5)
+        self.provider.fetch.reset_mock()
+
+        self.vending_machine.insert_money(2)
+        vended, item_summary, vend_result, total_balance = self.vending_machine.select_and_vend(1)
+
+        self.assertTrue(vended)
+        self.assertEqual('A sweet drink', item_summary)
+        self.provider.fetch.assert_not_called()
+
+    def test_warmup_without_cache_does_not_fetch(self):
+        vending_machine = VendingMachine(abstract_provider=self.provider)
+        vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 20))
+
+        warmup(vending_machine)
+
+        self.provider.fetch.assert_not_called()
+
+    @unittest.skipUnless(os.environ.get('VENDING_MACHINE_BENCHMARKS'), 'set VENDING_MACHINE_BENCHMARKS=1 to run')
+    def test_cold_start_within_budget(self):
+        total_us, module_times = measure_import_time('main', runs=5)
+
+        self.assertIn('vending_machine.vending_machine', module_times)
+        self.assertLessEqual(total_us, COLD_START_BUDGET_US)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+from vending_machine.threadsafe import ThreadSafeVendingMachine
+from vending_machine.vending_machine import Item, VendingMachine
+
+import threading
+import time
+import unittest
+
+
+class StubProvider:
+
+    def fetch(self, search_term):
+        return f'About {search_term}'
+
+
+def yielding_attribute(slot):
+    """Slot attribute that gives other threads a chance to run between a read and the write that follows it."""
+    def get(instance):
+        value = slot.__get__(instance)
+        time.sleep(0)
+        return value
+
+    return property(get, slot.__set__)
+
+
+class YieldingItem(Item):
+    __slots__ = ()
+
+    stock = yielding_attribute(Item.stock)
+
+
+class YieldingVendingMachine(ThreadSafeVendingMachine):
+    __slots__ = ()
+
+    balance_cents = yielding_attribute(VendingMachine.balance_cents)
+    available_slots = yielding_attribute(VendingMachine.available_slots)
+
+
+class ThreadSafeVendingMachineTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # Reads of the balance, stock and free slot counter yield to other threads, so any unsynchronized
+        # read-modify-write would lose updates.
+        self.vending_machine = YieldingVendingMachine(slots=4, abstract_provider=StubProvider())
+
+    def run_threads(self, targets):
+        threads = [threading.Thread(target=target) for target in targets]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join(timeout=30)
+            self.assertFalse(thread.is_alive(), 'thread did not finish, possible deadlock')
+
+    def test_vends_on_different_slots_lose_no_updates(self):
+        vends_per_thread = 500
+        for slot in range(1, 5):
+            self.vending_machine.add_item_to_slot(slot, YieldingItem(f'Item {slot}', slot * 0.25, vends_per_thread + 10))
+        self.vending_machine.insert_money(10000)
+
+        def vend(slot):
+            for _ in range(vends_per_thread):
+                vended, summary, result, balance = self.vending_machine.select_and_vend(slot)
+                self.assertTrue(vended)
+
+        self.run_threads([lambda slot=slot: vend(slot) for slot in range(1, 5)])
+
+        for slot in range(1, 5):
+            self.assertEqual(10, self.vending_machine.slot_items[slot].stock)
+        self.assertEqual(10000 - vends_per_thread * (0.25 + 0.5 + 0.75 + 1), self.vending_machine.current_balance)
+
+    def test_vends_on_one_slot_never_oversell(self):
+        self.vending_machine.add_item_to_slot(1, YieldingItem('Soda', 1, 500))
+        self.vending_machine.insert_money(10000)
+        vended_counts = []
+
+        def vend():
+            vended_counts.append(sum(self.vending_machine.vend_many([(0, 1)] * 300, abstracts=False).vended))
+
+        self.run_threads([vend for _ in range(4)])
+
+        self.assertEqual(500, sum(vended_counts))
+        self.assertEqual(0, self.vending_machine.slot_items[1].stock)
+        self.assertEqual(9500, self.vending_machine.current_balance)
+
+    def test_concurrent_insert_and_remove_money(self):
+        def insert():
+            for _ in range(500):
+                self.vending_machine.insert_money(0.25)
+
+        def remove():
+            for _ in range(250):
+                self.vending_machine.remove_money(0.25)
+
+        self.vending_machine.insert_money(1000)
+        self.run_threads([insert, insert, remove])
+
+        self.assertEqual(1000 + 0.25 * 750, self.vending_machine.current_balance)
+
+    def test_opposite_moves_do_not_deadlock(self):
+        self.vending_machine.add_item_to_slot(1, Item('Soda', 1, 5))
+
+        def move(source_slot, target_slot):
+            for _ in range(2000):
+                self.vending_machine.move_item_to_slot(source_slot, target_slot)
+
+        self.run_threads([lambda: move(1, 2), lambda: move(2, 1), lambda: move(2, 3), lambda: move(3, 1)])
+
+        occupied = [slot for slot, item in self.vending_machine.slot_items.items() if item is not None]
+        self.assertEqual(1, len(occupied))
+        self.assertEqual('Soda', self.vending_machine.slot_items[occupied[0]].name)
+        self.assertEqual(3, self.vending_machine.available_slots)
+
+    def test_concurrent_add_and_remove_keep_available_slots_consistent(self):
+        def churn(slot):
+            for _ in range(300):
+                self.vending_machine.add_item_to_slot(slot, Item('Soda', 1, 1))
+                self.vending_machine.remove_item_from_slot(slot)
+
+        self.run_threads([lambda slot=slot: churn(slot) for slot in range(1, 5)])
+
+        self.assertEqual(4, self.vending_machine.available_slots)
+        self.assertTrue(all(item is None for item in self.vending_machine.slot_items.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
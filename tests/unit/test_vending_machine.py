@@ -1,5 +1,6 @@
 from unittest.mock import MagicMock, patch
-from vending_machine.vending_machine import Item, VendingMachine
+from vending_machine.abstract_provider import get_default_provider
+from vending_machine.vending_machine import Item, VendingMachine, VendReason
 
 import requests
 import unittest
@@ -7,6 +8,10 @@ import unittest
 
 class VendingMachineTestCase(unittest.TestCase):
 
+    def setUp(self):
+        # Machines share the default provider, keep the failures of earlier tests from opening its circuit breaker.
+        get_default_provider().circuit_breaker.reset()
+
     def test_add_item_to_slot_already_occupied_with_other_item(self):
         sparkling_water = Item('Sparkling Water', 1.25, 6)
         regular_water = Item('Water', 1.00, 2)
@@ -116,6 +121,14 @@ class VendingMachineTestCase(unittest.TestCase):
         self.assertTrue(inserted)
         self.assertEqual(65.5, total_balance)
 
+    def test_insert_and_remove_money_in_cents(self):
+        vending_machine = VendingMachine()
+        vending_machine.insert_money(1250, cents=True)
+        removed, total_balance = vending_machine.remove_money(25, cents=True)
+
+        self.assertTrue(removed)
+        self.assertEqual(12.25, total_balance)
+
     def test_remove_money_negative_amount(self):
         vending_machine = VendingMachine()
         removed, total_balance = vending_machine.remove_money(-124)
@@ -199,10 +212,77 @@ class VendingMachineTestCase(unittest.TestCase):
         self.assertEqual('Vended: Soda', vend_result)
         self.assertEqual(8.75, total_balance)
 
+    @patch('vending_machine.vending_machine.VendingMachine._get_abstract', MagicMock(return_value='Soda'))
+    def test_select_and_vend_success_matches_vend_many(self):
+        vending_machine = VendingMachine()
+        vending_machine.add_item_to_slot(3, Item('Soda', 1.25, 20))
+        result = vending_machine.vend_many([(10.0, 3)])
+
+        self.assertEqual((True, VendReason.VENDED, 8.75), result[0])
+
+    def test_vend_many_reasons(self):
+        vending_machine = VendingMachine()
+        vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 1))
+        vending_machine.add_item_to_slot(2, Item('Coffee', 1.75, 6))
+
+        with patch.object(VendingMachine, '_get_abstract', MagicMock(return_value='')):
+            result = vending_machine.vend_many([(0, 10), (0, 5), (1, 2), (1, 1), (2, 1), (0, 2)])
+
+        self.assertEqual([0, 0, 0, 1, 0, 1], list(result.vended))
+        self.assertEqual([
+            VendReason.INVALID_SLOT, VendReason.EMPTY_SLOT, VendReason.INSUFFICIENT_BALANCE, VendReason.VENDED,
+            VendReason.OUT_OF_STOCK, VendReason.VENDED,
+        ], list(result.reasons))
+        self.assertEqual([0, 0, 100, 75, 275, 100], list(result.balances))
+        self.assertEqual([0, 0, 0, 125, 0, 175], list(result.sales))
+        self.assertEqual(300, result.revenue_cents())
+        self.assertEqual(1.0, vending_machine.current_balance)
+        self.assertEqual(0, vending_machine.slot_items[1].stock)
+        self.assertEqual(5, vending_machine.slot_items[2].stock)
+        self.assertEqual({VendReason.VENDED: 2, VendReason.INVALID_SLOT: 1, VendReason.EMPTY_SLOT: 1,
+                          VendReason.INSUFFICIENT_BALANCE: 1, VendReason.OUT_OF_STOCK: 1}, result.reason_counts())
+
+    def test_vend_many_negative_amount_not_inserted(self):
+        vending_machine = VendingMachine()
+        result = vending_machine.vend_many([(-5, 1)], abstracts=False)
+
+        self.assertEqual(0, result.balances[0])
+
+    def test_vend_many_in_cents(self):
+        vending_machine = VendingMachine()
+        vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 20))
+        result = vending_machine.vend_many([(100, 1), (25, 1), (150, 1)], abstracts=False, cents=True)
+
+        self.assertEqual([0, 1, 1], list(result.vended))
+        self.assertEqual([100, 0, 25], list(result.balances))
+
+    def test_vend_many_deduplicates_abstracts(self):
+        vending_machine = VendingMachine()
+        vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 20))
+        vending_machine.add_item_to_slot(2, Item('Coffee', 1.75, 6))
+
+        get_abstract = MagicMock(side_effect=lambda search_term: f'About {search_term}')
+
+        with patch.object(VendingMachine, '_get_abstract', get_abstract):
+            result = vending_machine.vend_many([(2, 1)] * 5 + [(2, 2)] * 5)
+
+        self.assertEqual({'Soda': 'About Soda', 'Coffee': 'About Coffee'}, result.abstracts)
+        self.assertEqual(2, get_abstract.call_count)
+
+    def test_vend_many_without_abstracts(self):
+        vending_machine = VendingMachine()
+        vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 20))
+
+        with patch.object(VendingMachine, '_get_abstract', MagicMock()) as get_abstract:
+            result = vending_machine.vend_many([(2, 1)], abstracts=False)
+
+        self.assertEqual({}, result.abstracts)
+        get_abstract.assert_not_called()
+
     def test_get_abstract_request_exception(self):
         vending_machine = VendingMachine()
 
-        with patch('requests.get', MagicMock(side_effect=requests.exceptions.RequestException)):
+        with patch('requests.Session.get', MagicMock(side_effect=requests.exceptions.RequestException)):
             self.assertEqual('', vending_machine._get_abstract('test'))
 
     def test_get_abstract_success(self):
@@ -251,6 +331,7 @@ class VendingMachineTestCase(unittest.TestCase):
         self.assertTrue(vending_machine.move_item_to_slot(1, 2, replace=True))
         self.assertIsNone(vending_machine.slot_items[1])
         self.assertEqual('Soda', vending_machine.slot_items[2].name)
+        self.assertEqual(8, vending_machine.available_slots)
 
     def test_replace_item_in_slot_invalid_slot(self):
         self.assertFalse(VendingMachine().replace_item_in_slot(12, Item('Soda', 1.25, 20)))
@@ -335,6 +416,39 @@ class VendingMachineTestCase(unittest.TestCase):
         self.assertEqual(2, new_stock)
         self.assertEqual(2, vending_machine.slot_items[1].stock)
 
+    def test_slot_queries(self):
+        vending_machine = VendingMachine(slots=4)
+        vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 20))
+        vending_machine.add_item_to_slot(3, Item('Soda', 1.25, 2))
+
+        self.assertEqual({2, 4}, vending_machine.empty_slots())
+        self.assertEqual({1, 3}, vending_machine.occupied_slots())
+        self.assertEqual({1, 3}, vending_machine.find_slots('Soda'))
+        self.assertEqual(set(), vending_machine.find_slots('Coffee'))
+        self.assertEqual([(3, 2)], vending_machine.low_stock_slots(5))
+
+    def test_slot_queries_follow_mutations(self):
+        vending_machine = VendingMachine(slots=4)
+        vending_machine.add_item_to_slot(1, Item('Soda', 1.25, 20))
+        vending_machine.add_item_to_slot(2, Item('Coffee', 1.75, 1))
+        vending_machine.occupied_slots()
+
+        vending_machine.move_item_to_slot(1, 4)
+        vending_machine.change_name(2, 'Espresso')
+        vending_machine.insert_money(5)
+        vending_machine.vend_many([(0, 2)], abstracts=False)
+        vending_machine.decrease_stock(4, 17)
+        vending_machine.add_item_to_slot(3, Item('Water', 1, 4))
+        vending_machine.remove_item_from_slot(3)
+
+        self.assertEqual({1, 3}, vending_machine.empty_slots())
+        self.assertEqual({2, 4}, vending_machine.occupied_slots())
+        self.assertEqual({4}, vending_machine.find_slots('Soda'))
+        self.assertEqual({2}, vending_machine.find_slots('Espresso'))
+        self.assertEqual(set(), vending_machine.find_slots('Coffee'))
+        self.assertEqual([(2, 0), (4, 3)], vending_machine.low_stock_slots(5))
+        self.assertEqual([(2, 0)], vending_machine.low_stock_slots(5, limit=1))
+
 
 if __name__ == '__main__':
     unittest.main()
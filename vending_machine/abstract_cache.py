@@ -0,0 +1,200 @@
+import atexit
+import json
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+
+def normalize_search_term(search_term):
+    """Normalize an item name into a cache key.
+
+    Args:
+        search_term (str)
+
+    Returns:
+        str: the lower-cased item name with collapsed whitespace.
+
+    """
+    return ' '.join(search_term.split()).lower()
+
+
+class AbstractCache:
+    """In-memory LRU cache of item abstracts with TTL and optional disk persistence.
+
+    With a path, changes are written to the file in the background save_delay seconds after the first unsaved one, so
+    a burst of cache misses rewrites the file once. Call flush to write them right away; unsaved changes are also
+    written when the interpreter exits.
+    """
+
+    def __init__(self, max_entries=256, ttl=24 * 60 * 60, path=None, clock=time.time, save_delay=1.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.clock = clock
+        self.save_delay = save_delay
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Held while writing the file, so that an older copy of the entries never overwrites a newer one.
+        self._save_lock = threading.Lock()
+        # Timer writing the unsaved changes, while there are some.
+        self._save_timer = None
+
+        if self.path is not None:
+            self._load()
+
+    def get(self, search_term):
+        """Look up the cached abstract of an item.
+
+        Args:
+            search_term (str)
+
+        Returns:
+            str: the cached abstract, or None if it is missing or expired.
+
+        """
+        key = normalize_search_term(search_term)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and self._is_expired(entry):
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return entry[0]
+
+    def set(self, search_term, abstract):
+        """Store the abstract of an item, evicting the least recently used entries if full.
+
+        Args:
+            search_term (str)
+            abstract (str)
+
+        """
+        key = normalize_search_term(search_term)
+
+        with self._lock:
+            self._entries[key] = (abstract, self.clock())
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+            if self.path is not None:
+                self._schedule_save()
+
+    def clear(self):
+        """Remove every cached abstract, including the ones on disk once saved."""
+        with self._lock:
+            self._entries.clear()
+
+            if self.path is not None:
+                self._schedule_save()
+
+    def flush(self):
+        """Write the unsaved changes to the file."""
+        with self._save_lock:
+            with self._lock:
+                if self._save_timer is None:
+                    return
+
+                self._save_timer.cancel()
+                self._save_timer = None
+                entries = {key: list(entry) for key, entry in self._entries.items()}
+                _unsaved_caches.discard(self)
+
+            temporary_path = f'{self.path}.tmp'
+
+            with open(temporary_path, 'w', encoding='utf-8') as cache_file:
+                json.dump({'entries': entries}, cache_file)
+
+            os.replace(temporary_path, self.path)
+
+    def stats(self):
+        """Counters describing the cache efficiency.
+
+        Returns:
+            dict: the hits, misses, evictions and current number of entries.
+
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, search_term):
+        with self._lock:
+            entry = self._entries.get(normalize_search_term(search_term))
+            return entry is not None and not self._is_expired(entry)
+
+    """PRIVATE METHODS"""
+
+    def _is_expired(self, entry):
+        return self.ttl is not None and self.clock() - entry[1] >= self.ttl
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as cache_file:
+                stored = json.load(cache_file)
+        except (OSError, ValueError):
+            return
+
+        stored_entries = stored.get('entries') if isinstance(stored, dict) else None
+        if not isinstance(stored_entries, dict):
+            return
+
+        # Entries of any other shape, e.g. from an edited or foreign file, are skipped.
+        entries = [
+            (key, tuple(entry)) for key, entry in stored_entries.items()
+            if isinstance(entry, list) and len(entry) == 2 and isinstance(entry[0], str) and
+            isinstance(entry[1], (int, float))
+        ]
+
+        # Oldest entries first so that the LRU order survives the restart.
+        for key, entry in sorted(entries, key=lambda stored_entry: stored_entry[1][1]):
+            if not self._is_expired(entry):
+                self._entries[key] = entry
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _schedule_save(self):
+        # Called with the lock held.
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self.save_delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+            _unsaved_caches.add(self)
+
+
+"""PRIVATE FUNCTIONS"""
+
+# Caches with unsaved changes, written at exit. Weak, so that the set does not keep caches alive.
+_unsaved_caches = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_unsaved_caches():
+    for cache in list(_unsaved_caches):
+        cache.flush()
@@ -0,0 +1,85 @@
+import threading
+
+from vending_machine.abstract_cache import normalize_search_term
+
+
+def completed_future(result):
+    """Wrap an already known result in a resolved Future.
+
+    Args:
+        result (object)
+
+    Returns:
+        Future: a future that is already done with the given result.
+
+    """
+    # Imported on use since concurrent.futures pulls in logging, which dominates the package import time.
+    from concurrent.futures import Future
+
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+class AbstractPrefetcher:
+    """Resolves item abstracts on a background thread pool, one lookup per item name at a time."""
+
+    def __init__(self, max_workers=4):
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='abstract-prefetch')
+        self._pending = {}
+        # Re-entrant because a lookup finishing before submit returns runs its done callback inline.
+        self._lock = threading.RLock()
+
+    def submit(self, search_term, lookup):
+        """Schedule a lookup of the abstract, reusing a lookup of the same item that is still running.
+
+        Args:
+            search_term (str)
+            lookup (callable): function taking the search term and returning its abstract.
+
+        Returns:
+            Future: resolves to the abstract of the item.
+
+        """
+        key = normalize_search_term(search_term)
+
+        with self._lock:
+            future = self._pending.get(key)
+
+            if future is None:
+                future = self._executor.submit(lookup, search_term)
+                self._pending[key] = future
+                future.add_done_callback(lambda done_future: self._forget(key, done_future))
+
+        return future
+
+    def pending(self, search_term):
+        """Get the running lookup of an item, if any.
+
+        Args:
+            search_term (str)
+
+        Returns:
+            Future: the running lookup, or None if the item is not being looked up.
+
+        """
+        with self._lock:
+            return self._pending.get(normalize_search_term(search_term))
+
+    def shutdown(self, wait=True):
+        """Stop accepting lookups and optionally wait for the running ones to finish.
+
+        Args:
+            wait (bool)
+
+        """
+        self._executor.shutdown(wait=wait)
+
+    """PRIVATE METHODS"""
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
@@ -0,0 +1,201 @@
+import sys
+import threading
+import time
+
+
+class CircuitBreaker:
+    """Stops calling a failing upstream until a cool-down period has passed.
+
+    After failure_threshold consecutive failures the breaker opens and rejects calls. Once reset_timeout seconds have
+    elapsed a single trial call is let through: a success closes the breaker, a failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Check whether a call to the upstream may be made.
+
+        Returns:
+            bool: flag indicating whether or not the call is allowed.
+
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+
+            return False
+
+    def record_success(self):
+        self.reset()
+
+    def reset(self):
+        """Close the breaker and forget the failures, e.g. between tests sharing the default provider."""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+
+class AbstractProvider:
+    """Looks up item abstracts on the DuckDuckGo instant answer API over a pooled keep-alive session."""
+
+    def __init__(self, search_url='https://api.duckduckgo.com', connect_timeout=2.0, read_timeout=5.0, retries=2,
+                 backoff_factor=0.2, pool_maxsize=10, circuit_breaker=None):
+        self.search_url = search_url
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.pool_maxsize = pool_maxsize
+        self.circuit_breaker = circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """The pooled requests session, created on first use."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+
+        return self._session
+
+    def fetch(self, search_term):
+        """Fetch the abstract of an item.
+
+        Args:
+            search_term (str)
+
+        Returns:
+            str: the abstract of the item, or None if the upstream failed or the circuit breaker is open.
+
+        """
+        if not self.circuit_breaker.allow():
+            return None
+
+        import requests
+
+        request_params = {
+            'q': search_term.lower(),
+            'format': 'json',
+            'pretty': 1
+        }
+
+        try:
+            response = self.session.get(url=self.search_url, params=request_params, timeout=self.timeout)
+            response.raise_for_status()
+            abstract = response.json().get('AbstractText', '')
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self.circuit_breaker.record_failure()
+            print(f'Could not establish a connection to the DuckDuckGo API!\n{e}', file=sys.stderr)
+            return None
+
+        self.circuit_breaker.record_success()
+
+        return abstract
+
+    def warmup(self):
+        """Import requests and set up the connection pool ahead of the first lookup."""
+        return self.session
+
+    def close(self):
+        """Close the pooled connections."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    """PRIVATE METHODS"""
+
+    def _create_session(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=self.retries,
+            status=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize, max_retries=retry)
+
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        return session
+
+
+class NoAbstractProvider:
+    """Provider of machines whose abstracts are never shown, e.g. headless script runs, which never looks them up."""
+
+    def fetch(self, search_term):
+        """Skip the lookup of an abstract.
+
+        Args:
+            search_term (str)
+
+        Returns:
+            None
+
+        """
+        return None
+
+    def warmup(self):
+        """Nothing to set up ahead of the first lookup."""
+
+    def close(self):
+        """Nothing to close."""
+
+
+_default_provider = None
+_default_provider_lock = threading.Lock()
+
+
+def get_default_provider():
+    """Get the provider shared by every VendingMachine created without one.
+
+    Its circuit breaker is shared too: failed lookups of any machine open it for every machine.
+
+    Returns:
+        AbstractProvider
+
+    """
+    global _default_provider
+
+    if _default_provider is None:
+        with _default_provider_lock:
+            if _default_provider is None:
+                _default_provider = AbstractProvider()
+
+    return _default_provider
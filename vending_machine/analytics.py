@@ -0,0 +1,375 @@
+import time
+from array import array
+
+import numpy as np
+
+from vending_machine.events import ItemVended
+from vending_machine.fleet import EMPTY_NAME_ID, StringTable
+from vending_machine.journal import JournalOp, read_journal
+from vending_machine.sparse_slots import occupied_items
+
+# Scale factor turning a median absolute deviation into an estimate of the standard deviation of normal data.
+_MAD_SCALE = 0.6745
+
+
+class SlotTable:
+    """Occupied slots of a fleet as NumPy columns, one row per slot, for vectorized stock and price queries.
+
+    Item names are stored as ids into a StringTable, shared with any SalesHistory the table is compared with.
+    """
+
+    def __init__(self, machine_ids, slot_numbers, name_ids, prices, stock, names):
+        self.machine_ids = machine_ids
+        self.slot_numbers = slot_numbers
+        self.name_ids = name_ids
+        # Prices are integer cents.
+        self.prices = prices
+        self.stock = stock
+        self.names = names
+
+    @classmethod
+    def from_fleet(cls, fleet):
+        """Export the occupied slots of a VendingFleet, reading its columns without going through the machines.
+
+        Args:
+            fleet (VendingFleet)
+
+        Returns:
+            SlotTable: names are ids of fleet.names.
+
+        """
+        name_ids = np.frombuffer(fleet.name_ids, dtype=np.int32)
+        indexes = np.flatnonzero(name_ids != EMPTY_NAME_ID)
+        machine_ids, slot_offsets = np.divmod(indexes, fleet.slots_per_machine)
+
+        return cls(
+            machine_ids,
+            slot_offsets + 1,
+            name_ids[indexes],
+            np.frombuffer(fleet.prices, dtype=np.int64)[indexes],
+            np.frombuffer(fleet.stock, dtype=np.int64)[indexes],
+            fleet.names,
+        )
+
+    @classmethod
+    def from_machines(cls, vending_machines, names=None):
+        """Export the occupied slots of a sequence of machines, machine ids being their positions in the sequence.
+
+        Args:
+            vending_machines (iterable): VendingMachine objects.
+            names (StringTable): table to intern the item names into, a new one by default.
+
+        Returns:
+            SlotTable
+
+        """
+        names = names if names is not None else StringTable()
+        columns = array('q'), array('q'), array('i'), array('q'), array('q')
+        machine_append, slot_append, name_append, price_append, stock_append = (column.append for column in columns)
+        intern = names.intern
+
+        for machine_id, vending_machine in enumerate(vending_machines):
+            for slot_number, slot_item in occupied_items(vending_machine.slot_items):
+                machine_append(machine_id)
+                slot_append(slot_number)
+                name_append(intern(slot_item.name))
+                price_append(slot_item.price_cents)
+                stock_append(slot_item.stock)
+
+        return cls(*(np.frombuffer(column, dtype=column.typecode) for column in columns), names)
+
+    def low_stock(self, threshold=2):
+        """Find the slots whose stock is at or below a threshold.
+
+        Args:
+            threshold (int)
+
+        Returns:
+            tuple: machine ids and slot numbers of the slots, as arrays.
+
+        """
+        indexes = np.flatnonzero(self.stock <= threshold)
+        return self.machine_ids[indexes], self.slot_numbers[indexes]
+
+    def stock_by_item(self):
+        """Sum the stock on hand of each item over the fleet.
+
+        Returns:
+            dict: units keyed by item name.
+
+        """
+        return _by_name(self.names, self.name_ids, self.stock)
+
+    def price_outliers(self, threshold=3.5):
+        """Find the slots whose price is far from the prices of the same item elsewhere in the fleet.
+
+        A price is an outlier when its modified z-score, its distance to the median price of the item divided by
+        the median absolute deviation of those prices, is above threshold. The medians ignore the outliers they are
+        meant to find, unlike a mean and standard deviation.
+
+        Args:
+            threshold (float)
+
+        Returns:
+            tuple: machine ids and slot numbers of the slots, as arrays.
+
+        """
+        medians = _grouped_median(self.name_ids, self.prices, len(self.names))
+        deviations = np.abs(self.prices - medians[self.name_ids])
+        scales = _grouped_median(self.name_ids, deviations, len(self.names))[self.name_ids] / _MAD_SCALE
+
+        # When most slots agree on a price the scale is 0, and any other price is an outlier.
+        indexes = np.flatnonzero(deviations > threshold * scales)
+        return self.machine_ids[indexes], self.slot_numbers[indexes]
+
+    def __len__(self):
+        return len(self.machine_ids)
+
+
+class SalesHistory:
+    """Vends of a fleet as NumPy columns, one row per item vended, for vectorized revenue queries."""
+
+    def __init__(self, machine_ids, slot_numbers, name_ids, prices, times, names):
+        self.machine_ids = machine_ids
+        self.slot_numbers = slot_numbers
+        self.name_ids = name_ids
+        # Prices paid, in integer cents.
+        self.prices = prices
+        # Unix timestamps of the vends.
+        self.times = times
+        self.names = names
+
+    @classmethod
+    def from_journal(cls, path, machine_id=0, names=None):
+        """Read the vends of one machine from its journal, with the name and price of the item at the time.
+
+        Vends of a slot whose item was stocked before the journal started are skipped, as long as the journal does
+        not tell its name and price.
+
+        Args:
+            path (str)
+            machine_id (int): id of the machine in the fleet.
+            names (StringTable): table to intern the item names into, a new one by default.
+
+        Returns:
+            SalesHistory
+
+        """
+        recorder = SalesRecorder(names)
+        # Name id and price of the item in each occupied slot, following the records. Slots missing are empty or
+        # hold an item the journal has no ADD_ITEM or REPLACE_ITEM record of.
+        slots = {}
+        intern = recorder.names.intern
+
+        for op, timestamp, fields in read_journal(path):
+            if op == JournalOp.VEND:
+                slot = slots.get(fields[0])
+                if slot is not None:
+                    recorder.record(machine_id, fields[0], slot[0], slot[1], timestamp)
+            elif op == JournalOp.ADD_ITEM:
+                slots[fields[0]] = [intern(fields[4]), fields[2]]
+            elif op == JournalOp.REPLACE_ITEM:
+                slots[fields[0]] = [intern(fields[3]), fields[1]]
+            elif op == JournalOp.MOVE_ITEM:
+                slot = slots.pop(fields[0], None)
+                if slot is not None:
+                    slots[fields[1]] = slot
+                else:
+                    slots.pop(fields[1], None)
+            elif op == JournalOp.REMOVE_ITEM:
+                slots.pop(fields[0], None)
+            elif op == JournalOp.CHANGE_NAME and fields[0] in slots:
+                slots[fields[0]][0] = intern(fields[1])
+            elif op == JournalOp.CHANGE_PRICE and fields[0] in slots:
+                slots[fields[0]][1] = fields[1]
+
+        return recorder.history()
+
+    @classmethod
+    def concatenate(cls, histories):
+        """Join the histories of several machines, e.g. read from one journal each.
+
+        Args:
+            histories (list): SalesHistory objects sharing the same StringTable.
+
+        Returns:
+            SalesHistory
+
+        """
+        names = histories[0].names
+
+        if any(history.names is not names for history in histories):
+            raise ValueError('histories must share the same StringTable')
+
+        columns = ('machine_ids', 'slot_numbers', 'name_ids', 'prices', 'times')
+        return cls(*(np.concatenate([getattr(history, column) for history in histories]) for column in columns), names)
+
+    def between(self, start, end):
+        """Select the vends of a period.
+
+        Args:
+            start (float): Unix timestamp, included.
+            end (float): Unix timestamp, excluded.
+
+        Returns:
+            SalesHistory
+
+        """
+        indexes = np.flatnonzero((self.times >= start) & (self.times < end))
+        columns = (self.machine_ids, self.slot_numbers, self.name_ids, self.prices, self.times)
+        return SalesHistory(*(column[indexes] for column in columns), self.names)
+
+    def revenue(self):
+        """Total revenue of the vends.
+
+        Returns:
+            int: the revenue in cents.
+
+        """
+        return int(self.prices.sum())
+
+    def revenue_by_item(self):
+        """Sum the revenue of each item.
+
+        Returns:
+            dict: revenue in cents keyed by item name, for the items sold at least once.
+
+        """
+        return _by_name(self.names, self.name_ids, self.prices)
+
+    def units_by_item(self):
+        """Count the units sold of each item.
+
+        Returns:
+            dict: units keyed by item name, for the items sold at least once.
+
+        """
+        return _by_name(self.names, self.name_ids)
+
+    def revenue_by_machine(self, machines):
+        """Sum the revenue of each machine.
+
+        Args:
+            machines (int): number of machines of the fleet.
+
+        Returns:
+            numpy.ndarray: revenue in cents indexed by machine id.
+
+        """
+        return np.bincount(self.machine_ids, weights=self.prices, minlength=machines).astype(np.int64)
+
+    def sell_through(self, slot_table):
+        """Compute the sell-through rate of each item: units sold over units sold plus units still on hand.
+
+        Args:
+            slot_table (SlotTable): stock on hand at the end of the history, sharing the StringTable of the history.
+
+        Returns:
+            dict: rate from 0 to 1 keyed by item name, for the items sold or on hand.
+
+        """
+        if slot_table.names is not self.names:
+            raise ValueError('the slot table and the history must share the same StringTable')
+
+        name_count = len(self.names)
+        sold = np.bincount(self.name_ids, minlength=name_count)
+        on_hand = np.bincount(slot_table.name_ids, weights=slot_table.stock, minlength=name_count)
+        received = sold + on_hand
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rates = sold / received
+
+        return {self.names[name_id]: float(rates[name_id]) for name_id in np.flatnonzero(received)}
+
+    def __len__(self):
+        return len(self.machine_ids)
+
+
+class SalesRecorder:
+    """Collects vends into growing array columns, e.g. from the ItemVended events of running machines.
+
+    Subscribe the recorder to the EventBus of each machine with its machine id, then call history to get the vends
+    recorded so far as a SalesHistory.
+    """
+
+    def __init__(self, names=None, clock=time.time):
+        self.names = names if names is not None else StringTable()
+        self.clock = clock
+
+        self._columns = array('q'), array('q'), array('i'), array('q'), array('d')
+
+    def subscribe(self, events, machine_id=0):
+        """Record the vends of a machine.
+
+        Args:
+            events (EventBus): event bus of the machine.
+            machine_id (int)
+
+        Returns:
+            callable: the callback subscribed to ItemVended, to unsubscribe it.
+
+        """
+        intern = self.names.intern
+        clock = self.clock
+        record = self.record
+
+        def on_vend(event):
+            record(machine_id, event.slot, intern(event.name), event.price_cents, clock())
+
+        return events.subscribe(on_vend, ItemVended)
+
+    def record(self, machine_id, slot_number, name_id, price_cents, timestamp):
+        """Record one vend.
+
+        Args:
+            machine_id (int)
+            slot_number (int)
+            name_id (int): id of the item name in names.
+            price_cents (int)
+            timestamp (float)
+
+        """
+        machine_ids, slot_numbers, name_ids, prices, times = self._columns
+        machine_ids.append(machine_id)
+        slot_numbers.append(slot_number)
+        name_ids.append(name_id)
+        prices.append(price_cents)
+        times.append(timestamp)
+
+    def history(self):
+        """Copy the vends recorded so far into a SalesHistory.
+
+        Returns:
+            SalesHistory
+
+        """
+        return SalesHistory(*(np.array(column, dtype=column.typecode) for column in self._columns), self.names)
+
+    def __len__(self):
+        return len(self._columns[0])
+
+
+"""PRIVATE FUNCTIONS"""
+
+
+def _by_name(names, name_ids, weights=None):
+    # Sums of the weights, or counts, of the rows of each name, keyed by the names found in name_ids.
+    counts = np.bincount(name_ids, minlength=len(names))
+    totals = counts if weights is None else np.bincount(name_ids, weights=weights, minlength=len(names))
+    return {names[name_id]: int(totals[name_id]) for name_id in np.flatnonzero(counts)}
+
+
+def _grouped_median(group_ids, values, group_count):
+    # Sort by group then value, and take the middle value(s) of each group's run.
+    order = np.lexsort((values, group_ids))
+    sorted_values = values[order]
+    counts = np.bincount(group_ids, minlength=group_count)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    occupied = counts > 0
+    medians = np.zeros(group_count)
+    low = starts[occupied] + (counts[occupied] - 1) // 2
+    high = starts[occupied] + counts[occupied] // 2
+    medians[occupied] = (sorted_values[low] + sorted_values[high]) / 2
+
+    return medians
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+
+from vending_machine.abstract_cache import normalize_search_term
+from vending_machine.abstract_provider import AbstractProvider
+
+
+class AsyncAbstractProvider:
+    """Looks up item abstracts without blocking the event loop, on the pooled keep-alive session of an AbstractProvider.
+
+    Lookups run on a thread pool of max_concurrency threads, so at most max_concurrency requests are in flight at any
+    time, however many sessions are waiting on abstracts, and each of them reuses a pooled connection. Retries,
+    redirects and the circuit breaker are those of the AbstractProvider. Lookups of the same item that overlap share a
+    single request.
+    """
+
+    def __init__(self, provider=None, max_concurrency=10, **provider_options):
+        # AbstractProvider making the requests, created with provider_options and a pool of max_concurrency
+        # connections by default.
+        self.provider = provider if provider is not None else AbstractProvider(
+            pool_maxsize=max_concurrency, **provider_options
+        )
+        self.max_concurrency = max_concurrency
+        self.circuit_breaker = self.provider.circuit_breaker
+
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._pending = {}
+        self._loop = None
+
+    async def fetch(self, search_term):
+        """Fetch the abstract of an item.
+
+        Args:
+            search_term (str)
+
+        Returns:
+            str: the abstract of the item, or None if the upstream failed or the circuit breaker is open.
+
+        """
+        self._bind_to_running_loop()
+        key = normalize_search_term(search_term)
+        lookup = self._pending.get(key)
+
+        if lookup is None:
+            lookup = self._loop.run_in_executor(self._get_executor(), self.provider.fetch, search_term)
+            self._pending[key] = lookup
+            lookup.add_done_callback(lambda done_lookup: self._forget(key, done_lookup))
+
+        # Shielded so that a cancelled session does not cancel the lookup shared with other sessions.
+        return await asyncio.shield(lookup)
+
+    def close(self):
+        """Wait for the running lookups, then stop the thread pool and close the pooled connections."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+        self.provider.close()
+
+    """PRIVATE METHODS"""
+
+    def _bind_to_running_loop(self):
+        # Futures belong to the loop they are awaited on, so start afresh when used from a new loop.
+        loop = asyncio.get_running_loop()
+
+        if loop is not self._loop:
+            self._loop = loop
+            self._pending = {}
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    # Imported on use since concurrent.futures pulls in logging, which dominates the import time.
+                    from concurrent.futures import ThreadPoolExecutor
+
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_concurrency, thread_name_prefix='async-abstract-provider'
+                    )
+
+        return self._executor
+
+    def _forget(self, key, lookup):
+        if self._pending.get(key) is lookup:
+            del self._pending[key]
+
+
+_default_provider = None
+_default_provider_lock = threading.Lock()
+
+
+def get_default_async_provider():
+    """Get the provider shared by every AsyncVendingMachine created without one.
+
+    Returns:
+        AsyncAbstractProvider
+
+    """
+    global _default_provider
+
+    if _default_provider is None:
+        with _default_provider_lock:
+            if _default_provider is None:
+                _default_provider = AsyncAbstractProvider()
+
+    return _default_provider
@@ -0,0 +1,136 @@
+import asyncio
+
+from vending_machine.async_abstract_provider import get_default_async_provider
+from vending_machine.vending_machine import VendingMachine
+
+
+class AsyncVendingMachine:
+    """asyncio front end of a VendingMachine.
+
+    Balance and stock changes are applied to the wrapped machine right away, on the event loop thread. Only the
+    abstract lookups wait on the network, through an AsyncAbstractProvider, so a single event loop can serve any
+    number of machines and sessions at once. Use the wrapped vending_machine directly for maintenance.
+    """
+
+    __slots__ = ('vending_machine', 'abstract_provider')
+
+    def __init__(self, vending_machine=None, abstract_provider=None):
+        self.vending_machine = vending_machine if vending_machine is not None else VendingMachine()
+        self.abstract_provider = abstract_provider if abstract_provider is not None else get_default_async_provider()
+
+    @property
+    def current_balance(self):
+        return self.vending_machine.current_balance
+
+    async def insert(self, amount):
+        """Insert money into the vending machine.
+
+        Args:
+            amount (int/float/Decimal)
+
+        Returns:
+            bool: flag indicating whether or not the amount was inserted.
+            float: the current total balance after the transaction.
+
+        """
+        return self.vending_machine.insert_money(amount)
+
+    async def remove(self, amount):
+        """Remove money from the vending machine.
+
+        Args:
+            amount (int/float/Decimal)
+
+        Returns:
+            bool: flag indicating whether or not the amount was removed.
+            float: the current total balance after the transaction.
+
+        """
+        return self.vending_machine.remove_money(amount)
+
+    async def vend(self, slot_number):
+        """Vends the item at the slot number, following the rules of VendingMachine.select_and_vend.
+
+        Args:
+            slot_number (int)
+
+        Returns:
+            bool: flag indicating whether or not the item was vended.
+            str: summary of the item vended.
+            str: reason explaining the vend success or failure.
+            float: the remaining total balance.
+
+        """
+        vending_machine = self.vending_machine
+        vend_reason, current_slot_item = vending_machine._vend(slot_number)
+        vended, vend_result = vending_machine._describe_vend(vend_reason, current_slot_item)
+        balance = vending_machine.current_balance
+
+        item_summary = ''
+        if current_slot_item is not None:
+            item_summary = await self._get_abstract(current_slot_item.name)
+
+        return vended, item_summary, vend_result, balance
+
+    async def vend_with_reason(self, slot_number):
+        """Vends the item at the slot number like vend, returning the outcome as a VendReason and integer cents.
+
+        Args:
+            slot_number (int)
+
+        Returns:
+            VendReason: why the item was vended or not.
+            int: the remaining total balance, in cents.
+            str: summary of the item selected.
+
+        """
+        vending_machine = self.vending_machine
+        vend_reason, current_slot_item = vending_machine._vend(slot_number)
+        balance_cents = vending_machine.balance_cents
+
+        item_summary = ''
+        if current_slot_item is not None:
+            item_summary = await self._get_abstract(current_slot_item.name)
+
+        return vend_reason, balance_cents, item_summary
+
+    async def vend_many(self, requests, abstracts=True, cents=False):
+        """Apply a sequence of insert money and vend operations, following the rules of VendingMachine.vend_many.
+
+        Args:
+            requests (iterable): (amount, slot_number) pairs, use an amount of 0 to vend without inserting money.
+            abstracts (bool): whether or not to look up the abstracts of the selected items.
+            cents (bool): whether or not the amounts are already integer cents.
+
+        Returns:
+            VendBatchResult
+
+        """
+        result, selected_names = self.vending_machine._vend_batch(requests, cents)
+
+        if abstracts:
+            selected_names = list(selected_names)
+            summaries = await asyncio.gather(*map(self._get_abstract, selected_names))
+            result.abstracts = dict(zip(selected_names, summaries))
+
+        return result
+
+    """PRIVATE METHODS"""
+
+    async def _get_abstract(self, search_term):
+        abstract_cache = self.vending_machine.abstract_cache
+
+        if abstract_cache is not None:
+            abstract = abstract_cache.get(search_term)
+            if abstract is not None:
+                return abstract
+
+        abstract = await self.abstract_provider.fetch(search_term)
+
+        if abstract is None:
+            return ''
+
+        if abstract_cache is not None:
+            abstract_cache.set(search_term, abstract)
+
+        return abstract
@@ -0,0 +1,136 @@
+import asyncio
+from collections import deque
+
+from vending_machine.server import SEPARATOR
+from vending_machine.vending_machine import VendReason
+
+
+class VendingServerError(Exception):
+    """Raised when the vending server answers a request with ERR."""
+
+
+class VendingClient:
+    """asyncio client of a VendingServer.
+
+    A client keeps a single connection open. Requests made concurrently on it are pipelined: each one is written as
+    soon as it is made, without waiting for the responses to the previous ones.
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._waiting = deque()
+        self._response_reader = asyncio.ensure_future(self._read_responses())
+
+    @classmethod
+    async def connect(cls, host, port):
+        """Connect to a server listening on a TCP address.
+
+        Args:
+            host (str)
+            port (int)
+
+        Returns:
+            VendingClient
+
+        """
+        return cls(*await asyncio.open_connection(host, port))
+
+    @classmethod
+    async def connect_unix(cls, path):
+        """Connect to a server listening on a Unix socket.
+
+        Args:
+            path (str)
+
+        Returns:
+            VendingClient
+
+        """
+        return cls(*await asyncio.open_unix_connection(path))
+
+    async def request(self, command, *arguments):
+        """Send a request and wait for its response.
+
+        Args:
+            command (str)
+            arguments: arguments of the command, converted with str.
+
+        Returns:
+            list: the fields of the response, as strings.
+
+        Raises:
+            VendingServerError: if the server answers with an error.
+            ConnectionError: if the connection is closed before the response arrives.
+
+        """
+        if self._response_reader.done():
+            raise ConnectionError('connection to the vending server is closed')
+
+        response = asyncio.get_running_loop().create_future()
+        self._waiting.append(response)
+        self._writer.write(f'{" ".join(map(str, (command, *arguments)))}\n'.encode('utf-8'))
+
+        status, *fields = await response
+
+        if status != 'OK':
+            raise VendingServerError(*fields)
+
+        return fields
+
+    async def insert(self, amount):
+        """Insert money into the vending machine.
+
+        Args:
+            amount (int/float/Decimal)
+
+        Returns:
+            bool: flag indicating whether or not the amount was inserted.
+            int: the current total balance in cents after the transaction.
+
+        """
+        inserted, balance_cents = await self.request('INSERT', amount)
+        return inserted == '1', int(balance_cents)
+
+    async def vend(self, slot_number):
+        """Vend the item at the slot number.
+
+        Args:
+            slot_number (int)
+
+        Returns:
+            bool: flag indicating whether or not the item was vended.
+            VendReason: reason of the vend success or failure.
+            int: the remaining total balance in cents.
+            str: summary of the item.
+
+        """
+        vended, vend_reason, balance_cents, item_summary = await self.request('VEND', slot_number)
+        return vended == '1', VendReason(int(vend_reason)), int(balance_cents), item_summary
+
+    async def close(self):
+        """Close the connection, failing the requests still waiting for a response."""
+        self._writer.close()
+        await self._response_reader
+
+    """PRIVATE METHODS"""
+
+    async def _read_responses(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+
+                if not line:
+                    break
+
+                if self._waiting:
+                    response = self._waiting.popleft()
+                    if not response.done():
+                        response.set_result(line.decode('utf-8').rstrip('\n').split(SEPARATOR))
+        except ConnectionError:
+            pass
+        finally:
+            while self._waiting:
+                response = self._waiting.popleft()
+                if not response.done():
+                    response.set_exception(ConnectionError('connection to the vending server was closed'))
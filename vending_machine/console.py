@@ -0,0 +1,81 @@
+import json
+
+
+class Console:
+    """Terminal I/O of VendingMachineInterface: prompts with input and writes with print."""
+
+    # Whether the interface should display its menus, which only matter to a person at the terminal.
+    show_menus = True
+
+    def read(self, prompt=''):
+        """Read one line of user input.
+
+        Args:
+            prompt (str)
+
+        Returns:
+            str: the line, without its line terminator.
+
+        Raises:
+            EOFError: when there is no more input.
+
+        """
+        return input(prompt)
+
+    def write(self, text=''):
+        """Write one line of output for the user.
+
+        Args:
+            text (str)
+
+        """
+        print(text)
+
+    def write_screen(self, screen):
+        """Write a whole screen of output at once.
+
+        Args:
+            screen (str): the lines of the screen, each ending with a line terminator.
+
+        """
+        print(screen, end='', flush=True)
+
+    def event(self, event_name, **fields):
+        """Report a state change made through the interface.
+
+        Args:
+            event_name (str): what happened, e.g. vend or insert.
+            fields: details of the state change.
+
+        """
+
+
+class HeadlessConsole(Console):
+    """Console reading a command script and reporting state changes as JSON lines instead of messages.
+
+    The script is any iterable of lines, e.g. a list of strings or an open file. Menus and messages are dropped, so a
+    long session replays at the speed of the vending machine itself. Every event is written to the output text stream
+    as one JSON object per line, or dropped too when there is no output.
+    """
+
+    show_menus = False
+
+    def __init__(self, script, output=None):
+        self._lines = iter(script)
+        self._output = output
+
+    def read(self, prompt=''):
+        for line in self._lines:
+            return line.rstrip('\r\n')
+
+        raise EOFError('end of script')
+
+    def write(self, text=''):
+        pass
+
+    def write_screen(self, screen):
+        pass
+
+    def event(self, event_name, **fields):
+        if self._output is not None:
+            self._output.write(json.dumps({'event': event_name, **fields}, separators=(',', ':')) + '\n')
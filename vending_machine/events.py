@@ -0,0 +1,206 @@
+import threading
+from collections import deque, namedtuple
+
+# Events emitted by VendingMachine, one type per state change. Item fields hold the values of the item at the time of
+# the change, so an event stays accurate however long it is queued.
+ItemAdded = namedtuple('ItemAdded', 'slot replace name price_cents stock')
+ItemMoved = namedtuple('ItemMoved', 'source_slot target_slot replace')
+ItemRemoved = namedtuple('ItemRemoved', 'slot')
+ItemReplaced = namedtuple('ItemReplaced', 'slot name price_cents stock')
+NameChanged = namedtuple('NameChanged', 'slot name')
+PriceChanged = namedtuple('PriceChanged', 'slot price_cents')
+StockIncreased = namedtuple('StockIncreased', 'slot n stock')
+StockDecreased = namedtuple('StockDecreased', 'slot n stock')
+MoneyInserted = namedtuple('MoneyInserted', 'amount_cents balance_cents')
+MoneyRemoved = namedtuple('MoneyRemoved', 'amount_cents balance_cents')
+ItemVended = namedtuple('ItemVended', 'slot name price_cents stock balance_cents')
+VendFailed = namedtuple('VendFailed', 'slot reason balance_cents')
+
+EVENT_TYPES = (
+    ItemAdded, ItemMoved, ItemRemoved, ItemReplaced, NameChanged, PriceChanged, StockIncreased, StockDecreased,
+    MoneyInserted, MoneyRemoved, ItemVended, VendFailed,
+)
+
+# Queued after the last event by QueuedSubscriber.close.
+_CLOSE = object()
+
+
+class EventBus:
+    """Delivers the events of a vending machine to the subscribers of each event type.
+
+    Subscribers are called synchronously by the thread making the change, while the machine holds its locks, so they
+    should be quick. Wrap slow subscribers in a QueuedSubscriber. An event is only built when its type has subscribers,
+    so emitting an event nobody listens to costs a dict lookup.
+    """
+
+    def __init__(self):
+        # Event type -> tuple of callbacks, replaced rather than mutated so emit needs no lock.
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback, *event_types):
+        """Call a function with every event of the given types.
+
+        Args:
+            callback (callable): function taking the event.
+            event_types: event classes to deliver, all of EVENT_TYPES when none are given.
+
+        Returns:
+            callable: the callback, so subscribe can be used as a decorator.
+
+        """
+        with self._lock:
+            for event_type in event_types or EVENT_TYPES:
+                self._subscribers[event_type] = self._subscribers.get(event_type, ()) + (callback,)
+
+        return callback
+
+    def unsubscribe(self, callback):
+        """Stop calling a function with events.
+
+        Args:
+            callback (callable)
+
+        """
+        with self._lock:
+            for event_type, callbacks in list(self._subscribers.items()):
+                callbacks = tuple(subscribed for subscribed in callbacks if subscribed != callback)
+
+                if callbacks:
+                    self._subscribers[event_type] = callbacks
+                else:
+                    del self._subscribers[event_type]
+
+    def wants(self, event_type):
+        """Check whether an event type has subscribers.
+
+        Args:
+            event_type (type)
+
+        Returns:
+            bool
+
+        """
+        return event_type in self._subscribers
+
+    def emit(self, event_type, *fields):
+        """Build an event and deliver it to the subscribers of its type, if there are any.
+
+        Args:
+            event_type (type): one of EVENT_TYPES.
+            fields: values of the fields of the event, in order.
+
+        """
+        callbacks = self._subscribers.get(event_type)
+
+        if callbacks:
+            event = event_type(*fields)
+            for callback in callbacks:
+                callback(event)
+
+
+class QueuedSubscriber:
+    """Subscriber handing events to a slow callback in batches, from a background thread.
+
+    Events wait in a queue of at most max_queued events. When the queue is full, emitting blocks until the callback
+    catches up, or drops the event and counts it in dropped when drop_when_full is set. The callback receives lists of
+    up to max_batch events, in the order they were emitted. Events of a batch whose callback raises are counted in
+    failed.
+    """
+
+    def __init__(self, callback, max_queued=10000, max_batch=256, drop_when_full=False):
+        self.callback = callback
+        self.max_queued = max_queued
+        self.max_batch = max_batch
+        self.drop_when_full = drop_when_full
+
+        self.dropped = 0
+        self.delivered = 0
+        self.failed = 0
+
+        # Appending to a deque needs no lock, the condition is only used when one side has to wait for the other.
+        self._events = deque()
+        self._condition = threading.Condition()
+        self._sleeping = False
+        self._blocked = False
+
+        self._thread = threading.Thread(target=self._deliver, name='event-subscriber', daemon=True)
+        self._thread.start()
+
+    def __call__(self, event):
+        events = self._events
+
+        if len(events) >= self.max_queued:
+            if self.drop_when_full:
+                self.dropped += 1
+                return
+
+            with self._condition:
+                self._blocked = True
+                while len(events) >= self.max_queued:
+                    self._condition.wait()
+
+        self._append(event)
+
+    def join(self):
+        """Wait until every event queued so far has been delivered."""
+        delivered = threading.Event()
+        self._append(delivered)
+        delivered.wait()
+
+    def close(self):
+        """Deliver the queued events and stop the background thread."""
+        self._append(_CLOSE)
+        self._thread.join()
+
+    """PRIVATE METHODS"""
+
+    def _append(self, event):
+        self._events.append(event)
+
+        # The delivery thread sets _sleeping before it checks for events, so it cannot miss this one.
+        if self._sleeping:
+            with self._condition:
+                self._condition.notify_all()
+
+    def _deliver(self):
+        events = self._events
+        popleft = events.popleft
+
+        while True:
+            if not events:
+                with self._condition:
+                    self._sleeping = True
+                    while not events:
+                        self._condition.wait()
+                    self._sleeping = False
+
+            batch = []
+            marker = None
+
+            while events and len(batch) < self.max_batch:
+                event = popleft()
+
+                if event is _CLOSE or type(event) is threading.Event:
+                    marker = event
+                    break
+
+                batch.append(event)
+
+            if self._blocked:
+                with self._condition:
+                    self._blocked = False
+                    self._condition.notify_all()
+
+            if batch:
+                try:
+                    self.callback(batch)
+                    self.delivered += len(batch)
+                except Exception:
+                    # A failing batch must not stop the delivery of the next ones.
+                    self.failed += len(batch)
+
+            if marker is _CLOSE:
+                return
+            elif marker is not None:
+                marker.set()
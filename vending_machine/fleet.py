@@ -0,0 +1,310 @@
+from array import array
+from collections.abc import MutableMapping
+
+from vending_machine.abstract_provider import get_default_provider
+from vending_machine.money import from_cents, to_cents
+from vending_machine.slot_index import SlotIndex
+from vending_machine.vending_machine import VendingMachine
+
+EMPTY_NAME_ID = -1
+
+
+class StringTable:
+    """Interns item names so that every slot of the fleet stores a small integer id instead of a string."""
+
+    def __init__(self, strings=()):
+        self._strings = []
+        self._ids = {}
+
+        for string in strings:
+            self.intern(string)
+
+    def intern(self, string):
+        """Get the id of a string, adding it to the table if needed.
+
+        Args:
+            string (str)
+
+        Returns:
+            int: the id of the string.
+
+        """
+        string_id = self._ids.get(string)
+
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(string)
+            self._ids[string] = string_id
+
+        return string_id
+
+    def __getitem__(self, string_id):
+        return self._strings[string_id]
+
+    def __len__(self):
+        return len(self._strings)
+
+    def __iter__(self):
+        return iter(self._strings)
+
+
+class VendingFleet:
+    """Slot and balance state of many vending machines stored in flat array columns.
+
+    Slot s (1-based) of machine m lives at index m * slots_per_machine + s - 1 of the slot columns. Use machine() to get
+    a VendingMachine-compatible view of a single machine.
+    """
+
+    def __init__(self, machines, slots=9, abstract_cache=None, abstract_provider=None):
+        self.machine_count = machines
+        self.slots_per_machine = slots
+
+        self.abstract_cache = abstract_cache
+        self.abstract_provider = abstract_provider if abstract_provider is not None else get_default_provider()
+
+        slot_count = machines * slots
+
+        self.names = StringTable()
+        self.name_ids = array('i', [EMPTY_NAME_ID]) * slot_count
+        # Prices and balances are integer cents.
+        self.prices = array('q', [0]) * slot_count
+        self.stock = array('q', [0]) * slot_count
+
+        self.balances = array('q', [0]) * machines
+        self.available_slots = array('q', [slots]) * machines
+
+    @classmethod
+    def from_columns(cls, slots, names, name_ids, prices, stock, balances, available_slots, abstract_cache=None,
+                     abstract_provider=None):
+        """Build a fleet around existing columns, e.g. memoryviews over a memory-mapped snapshot.
+
+        Args:
+            slots (int): number of slots per machine.
+            names (StringTable)
+            name_ids, prices, stock: slot columns of machine_count * slots entries.
+            balances, available_slots: machine columns of machine_count entries.
+            abstract_cache (AbstractCache)
+            abstract_provider (AbstractProvider)
+
+        Returns:
+            VendingFleet
+
+        """
+        fleet = cls(0, slots, abstract_cache=abstract_cache, abstract_provider=abstract_provider)
+
+        fleet.machine_count = len(balances)
+        fleet.names = names
+        fleet.name_ids = name_ids
+        fleet.prices = prices
+        fleet.stock = stock
+        fleet.balances = balances
+        fleet.available_slots = available_slots
+
+        return fleet
+
+    def machine(self, machine_id):
+        """Get a VendingMachine-compatible view of one machine of the fleet.
+
+        Args:
+            machine_id (int): index of the machine, from 0 to machine_count - 1.
+
+        Returns:
+            FleetMachine
+
+        """
+        if not 0 <= machine_id < self.machine_count:
+            raise IndexError(f'machine id {machine_id} out of range')
+
+        return FleetMachine(self, machine_id)
+
+    def nbytes(self):
+        """Memory used by the columns, excluding the interned names.
+
+        Returns:
+            int
+
+        """
+        columns = (self.name_ids, self.prices, self.stock, self.balances, self.available_slots)
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def __len__(self):
+        return self.machine_count
+
+    def __iter__(self):
+        for machine_id in range(self.machine_count):
+            yield FleetMachine(self, machine_id)
+
+
+class FleetSlotItem:
+    """Item-compatible view of one occupied slot of a fleet, reading and writing the fleet columns."""
+
+    __slots__ = ('_fleet', '_index')
+
+    def __init__(self, fleet, index):
+        self._fleet = fleet
+        self._index = index
+
+    @property
+    def name(self):
+        return self._fleet.names[self._fleet.name_ids[self._index]]
+
+    @name.setter
+    def name(self, name):
+        self._fleet.name_ids[self._index] = self._fleet.names.intern(name)
+
+    @property
+    def price_cents(self):
+        return self._fleet.prices[self._index]
+
+    @price_cents.setter
+    def price_cents(self, price_cents):
+        self._fleet.prices[self._index] = price_cents
+
+    @property
+    def price(self):
+        return from_cents(self._fleet.prices[self._index])
+
+    @price.setter
+    def price(self, price):
+        self._fleet.prices[self._index] = to_cents(price)
+
+    @property
+    def stock(self):
+        return self._fleet.stock[self._index]
+
+    @stock.setter
+    def stock(self, stock):
+        self._fleet.stock[self._index] = stock
+
+
+class FleetSlotItems(MutableMapping):
+    """slot_items mapping of a fleet machine, from slot number to FleetSlotItem or None."""
+
+    def __init__(self, fleet, machine_id):
+        self._fleet = fleet
+        self._offset = machine_id * fleet.slots_per_machine - 1
+
+    def __getitem__(self, slot):
+        if not 0 < slot <= self._fleet.slots_per_machine:
+            raise KeyError(slot)
+
+        index = self._offset + slot
+
+        if self._fleet.name_ids[index] == EMPTY_NAME_ID:
+            return None
+
+        return FleetSlotItem(self._fleet, index)
+
+    def __setitem__(self, slot, item):
+        if not 0 < slot <= self._fleet.slots_per_machine:
+            raise KeyError(slot)
+
+        index = self._offset + slot
+
+        if item is None:
+            self._fleet.name_ids[index] = EMPTY_NAME_ID
+            self._fleet.prices[index] = 0
+            self._fleet.stock[index] = 0
+        else:
+            self._fleet.name_ids[index] = self._fleet.names.intern(item.name)
+            self._fleet.prices[index] = item.price_cents
+            self._fleet.stock[index] = item.stock
+
+    def __delitem__(self, slot):
+        raise TypeError('slots of a fleet machine cannot be deleted, assign None to empty them')
+
+    def __iter__(self):
+        return iter(range(1, self._fleet.slots_per_machine + 1))
+
+    def __len__(self):
+        return self._fleet.slots_per_machine
+
+
+class FleetMachine(VendingMachine):
+    """VendingMachine whose state lives in the columns of a VendingFleet.
+
+    Views are cheap to create and hold no state of their own, so any number of them can exist for the same machine.
+    Items placed in a slot are copied into the fleet columns rather than stored by reference.
+    """
+
+    __slots__ = ('fleet', 'machine_id')
+
+    def __init__(self, fleet, machine_id):
+        self.fleet = fleet
+        self.machine_id = machine_id
+        self.slot_items = FleetSlotItems(fleet, machine_id)
+
+        self.abstract_cache = fleet.abstract_cache
+        self.abstract_prefetcher = None
+        self.abstract_provider = fleet.abstract_provider
+        self.journal = None
+        self.events = None
+        self._slot_index = None
+
+    @property
+    def total_slots(self):
+        return self.fleet.slots_per_machine
+
+    @property
+    def available_slots(self):
+        return self.fleet.available_slots[self.machine_id]
+
+    @available_slots.setter
+    def available_slots(self, available_slots):
+        self.fleet.available_slots[self.machine_id] = available_slots
+
+    @property
+    def balance_cents(self):
+        return self.fleet.balances[self.machine_id]
+
+    @balance_cents.setter
+    def balance_cents(self, balance_cents):
+        self.fleet.balances[self.machine_id] = balance_cents
+
+    def move_item_to_slot(self, source_slot, target_slot, replace=False):
+        """Move item from one slot to another.
+
+        Args:
+            source_slot (int)
+            target_slot (int)
+            replace (bool): whether or not to replace the item in the target slot.
+
+        Returns:
+            bool: flag indicating whether or not the item was moved.
+
+        """
+        fleet = self.fleet
+        offset = self.machine_id * fleet.slots_per_machine - 1
+
+        if not (self._is_valid_slot(source_slot) and self._is_valid_slot(target_slot)):
+            return False
+
+        source_index, target_index = offset + source_slot, offset + target_slot
+
+        if fleet.name_ids[source_index] == EMPTY_NAME_ID:
+            return False
+
+        if fleet.name_ids[target_index] != EMPTY_NAME_ID and not replace:
+            return False
+
+        if source_index == target_index:
+            return True
+
+        if fleet.name_ids[target_index] != EMPTY_NAME_ID:
+            # The replaced item leaves the machine.
+            self._adjust_available_slots(1)
+
+        # The slot items are views over the columns, so copy the columns before the source slot is cleared.
+        for column in (fleet.name_ids, fleet.prices, fleet.stock):
+            column[target_index] = column[source_index]
+
+        self.slot_items[source_slot] = None
+
+        return True
+
+    """PRIVATE METHODS"""
+
+    def _index(self):
+        # Any number of views may change the same machine, so the slot queries scan the columns instead of keeping
+        # an index of their own.
+        return SlotIndex(self.slot_items)
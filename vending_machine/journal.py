@@ -0,0 +1,307 @@
+import atexit
+import os
+import struct
+import threading
+import time
+import weakref
+from enum import IntEnum
+
+JOURNAL_MAGIC = b'VMJ1'
+
+_FILE_HEADER = struct.Struct('<4sI')
+_RECORD_HEADER = struct.Struct('<Bd')
+_NAME_LENGTH = struct.Struct('<H')
+
+
+class JournalOp(IntEnum):
+    INSERT_MONEY = 1
+    REMOVE_MONEY = 2
+    VEND = 3
+    ADD_ITEM = 4
+    MOVE_ITEM = 5
+    REMOVE_ITEM = 6
+    REPLACE_ITEM = 7
+    CHANGE_NAME = 8
+    CHANGE_PRICE = 9
+    INCREASE_STOCK = 10
+    DECREASE_STOCK = 11
+
+
+# Numeric fields of each operation and whether an item name follows them.
+_PAYLOADS = {
+    JournalOp.INSERT_MONEY: (struct.Struct('<q'), False),  # amount_cents
+    JournalOp.REMOVE_MONEY: (struct.Struct('<q'), False),  # amount_cents
+    JournalOp.VEND: (struct.Struct('<I'), False),  # slot
+    JournalOp.ADD_ITEM: (struct.Struct('<I?qq'), True),  # slot, replace, price_cents, stock, name
+    JournalOp.MOVE_ITEM: (struct.Struct('<II?'), False),  # source_slot, target_slot, replace
+    JournalOp.REMOVE_ITEM: (struct.Struct('<I'), False),  # slot
+    JournalOp.REPLACE_ITEM: (struct.Struct('<Iqq'), True),  # slot, price_cents, stock, name
+    JournalOp.CHANGE_NAME: (struct.Struct('<I'), True),  # slot, name
+    JournalOp.CHANGE_PRICE: (struct.Struct('<Iq'), False),  # slot, price_cents
+    JournalOp.INCREASE_STOCK: (struct.Struct('<Iq'), False),  # slot, n
+    JournalOp.DECREASE_STOCK: (struct.Struct('<Iq'), False),  # slot, n
+}
+
+
+class Journal:
+    """Append-only binary log of the state-changing calls made on a VendingMachine.
+
+    Records are buffered in memory and written to the file in groups of group_commit records, or sooner once
+    max_delay seconds have passed since the oldest buffered record: a timer thread writes them even if no other
+    record comes. With fsync enabled every group is also flushed to stable storage before the write returns. Records
+    may be appended from several threads. The records still buffered when the journal is garbage collected or the
+    interpreter exits are written, and recording on a closed journal raises a ValueError.
+    """
+
+    def __init__(self, path, slots=9, group_commit=64, max_delay=None, fsync=False, clock=time.time):
+        self.path = path
+        self.group_commit = group_commit
+        self.max_delay = max_delay
+        self.fsync = fsync
+        self.clock = clock
+
+        self.records_written = 0
+
+        self._buffer = bytearray()
+        self._pending = 0
+        self._oldest_pending = None
+        # Timer flushing the buffer max_delay seconds after its oldest record, while records are buffered.
+        self._timer = None
+        self._lock = threading.RLock()
+
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+        if is_new:
+            os.write(self._fd, _FILE_HEADER.pack(JOURNAL_MAGIC, slots))
+            self.slots = slots
+        else:
+            self.slots = read_journal_header(path)
+
+        _open_journals.add(self)
+
+    def record(self, op, *fields):
+        """Append one operation to the journal.
+
+        Args:
+            op (JournalOp)
+            fields: numeric fields of the operation, followed by the item name for the operations that have one.
+
+        """
+        payload, has_name = _PAYLOADS[op]
+
+        if has_name:
+            name = fields[-1].encode('utf-8')
+            record = payload.pack(*fields[:-1]) + _NAME_LENGTH.pack(len(name)) + name
+        else:
+            record = payload.pack(*fields)
+
+        with self._lock:
+            if self._fd is None:
+                raise ValueError(f'the journal {self.path} is closed')
+
+            now = self.clock()
+            self._buffer += _RECORD_HEADER.pack(op, now)
+            self._buffer += record
+
+            if self._pending == 0:
+                self._oldest_pending = now
+
+                if self.max_delay is not None:
+                    self._timer = threading.Timer(self.max_delay, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+
+            self._pending += 1
+
+            if self._pending >= self.group_commit or \
+                    (self.max_delay is not None and now - self._oldest_pending >= self.max_delay):
+                self.flush()
+
+    def flush(self):
+        """Write the buffered records to the file, and sync it if fsync is enabled."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            if not self._pending:
+                return
+
+            view = memoryview(self._buffer)
+            while view:
+                written = os.write(self._fd, view)
+                view = view[written:]
+            view.release()
+
+            if self.fsync:
+                os.fsync(self._fd)
+
+            self.records_written += self._pending
+            self._buffer.clear()
+            self._pending = 0
+            self._oldest_pending = None
+
+    def close(self):
+        """Flush the buffered records and close the file."""
+        with self._lock:
+            if self._fd is None:
+                return
+
+            self.flush()
+            os.close(self._fd)
+            self._fd = None
+
+        _open_journals.discard(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        # The file may not have been opened if __init__ failed.
+        if getattr(self, '_fd', None) is not None:
+            self.close()
+
+
+def read_journal_header(path):
+    """Read the number of slots of the machine a journal was recorded on.
+
+    Args:
+        path (str)
+
+    Returns:
+        int
+
+    Raises:
+        ValueError: if the file is not a journal.
+
+    """
+    with open(path, 'rb') as journal_file:
+        header = journal_file.read(_FILE_HEADER.size)
+
+    if len(header) < _FILE_HEADER.size or header[:4] != JOURNAL_MAGIC:
+        raise ValueError(f'{path} is not a vending machine journal')
+
+    return _FILE_HEADER.unpack(header)[1]
+
+
+def read_journal(path):
+    """Iterate over the records of a journal.
+
+    A record cut short at the end of the file, e.g. by a crash in the middle of a write, is ignored.
+
+    Args:
+        path (str)
+
+    Yields:
+        tuple: the JournalOp, the timestamp and the fields of each record.
+
+    """
+    read_journal_header(path)
+
+    with open(path, 'rb') as journal_file:
+        data = journal_file.read()
+
+    offset = _FILE_HEADER.size
+    end = len(data)
+
+    while offset + _RECORD_HEADER.size <= end:
+        op, timestamp = _RECORD_HEADER.unpack_from(data, offset)
+        op = JournalOp(op)
+        payload, has_name = _PAYLOADS[op]
+        record_offset = offset + _RECORD_HEADER.size
+
+        if record_offset + payload.size > end:
+            return
+
+        fields = payload.unpack_from(data, record_offset)
+        record_offset += payload.size
+
+        if has_name:
+            if record_offset + _NAME_LENGTH.size > end:
+                return
+
+            name_length, = _NAME_LENGTH.unpack_from(data, record_offset)
+            record_offset += _NAME_LENGTH.size
+
+            if record_offset + name_length > end:
+                return
+
+            fields += (data[record_offset:record_offset + name_length].decode('utf-8'),)
+            record_offset += name_length
+
+        yield op, timestamp, fields
+
+        offset = record_offset
+
+
+def replay_journal(path, vending_machine=None):
+    """Rebuild a VendingMachine by applying every record of a journal.
+
+    Vends are applied without looking up item abstracts.
+
+    Args:
+        path (str)
+        vending_machine (VendingMachine): optional empty machine without a journal to apply the records to.
+
+    Returns:
+        VendingMachine: the machine in the state recorded by the journal.
+
+    """
+    from decimal import Decimal
+
+    from vending_machine.money import CENTS_PER_UNIT
+    from vending_machine.vending_machine import Item, VendingMachine
+
+    if vending_machine is None:
+        vending_machine = VendingMachine(slots=read_journal_header(path))
+
+    for op, timestamp, fields in read_journal(path):
+        if op == JournalOp.INSERT_MONEY:
+            vending_machine.balance_cents += fields[0]
+        elif op == JournalOp.REMOVE_MONEY:
+            vending_machine.balance_cents = max(vending_machine.balance_cents - fields[0], 0)
+        elif op == JournalOp.VEND:
+            vending_machine._vend(fields[0])
+        elif op == JournalOp.ADD_ITEM:
+            slot, replace, price_cents, stock, name = fields
+            vending_machine.add_item_to_slot(slot, _item(Item, name, price_cents, stock), replace=replace)
+        elif op == JournalOp.MOVE_ITEM:
+            vending_machine.move_item_to_slot(fields[0], fields[1], replace=fields[2])
+        elif op == JournalOp.REMOVE_ITEM:
+            vending_machine.remove_item_from_slot(fields[0])
+        elif op == JournalOp.REPLACE_ITEM:
+            slot, price_cents, stock, name = fields
+            vending_machine.replace_item_in_slot(slot, _item(Item, name, price_cents, stock))
+        elif op == JournalOp.CHANGE_NAME:
+            vending_machine.change_name(fields[0], fields[1])
+        elif op == JournalOp.CHANGE_PRICE:
+            vending_machine.change_price(fields[0], Decimal(fields[1]) / CENTS_PER_UNIT)
+        elif op == JournalOp.INCREASE_STOCK:
+            vending_machine.increase_stock(fields[0], fields[1])
+        elif op == JournalOp.DECREASE_STOCK:
+            vending_machine.decrease_stock(fields[0], fields[1])
+
+    return vending_machine
+
+
+"""PRIVATE FUNCTIONS"""
+
+
+def _item(item_class, name, price_cents, stock):
+    item = item_class(name, 0, stock)
+    item.price_cents = price_cents
+    return item
+
+
+# Journals not yet closed, closed at exit. Weak, so that the set does not keep journals alive.
+_open_journals = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_journals():
+    for journal in list(_open_journals):
+        journal.close()
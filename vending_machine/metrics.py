@@ -0,0 +1,378 @@
+import functools
+import os
+import threading
+import time
+from array import array
+
+from vending_machine.vending_machine import VendReason
+
+# Operations timed by Metrics, keyed by the VendingMachine method implementing them. The abstract lookup (cache and
+# network) and the fetch (network only) are timed apart from select_and_vend, which includes them.
+INSTRUMENTED_METHODS = {
+    'add_item_to_slot': 'add_item_to_slot',
+    'move_item_to_slot': 'move_item_to_slot',
+    'remove_item_from_slot': 'remove_item_from_slot',
+    'replace_item_in_slot': 'replace_item_in_slot',
+    'change_name': 'change_name',
+    'change_price': 'change_price',
+    'increase_stock': 'increase_stock',
+    'decrease_stock': 'decrease_stock',
+    'insert_money': 'insert_money',
+    'remove_money': 'remove_money',
+    'select_and_vend': 'select_and_vend',
+    'select_and_vend_deferred': 'select_and_vend_deferred',
+    'vend_many': 'vend_many',
+    '_vend': 'vend_decision',
+    '_vend_batch': 'vend_batch',
+    '_get_abstract': 'abstract_lookup',
+    '_fetch_abstract': 'abstract_fetch',
+}
+
+# Upper bounds of the exported histogram buckets, in seconds.
+EXPORT_BUCKETS = (
+    1e-06, 2.5e-06, 5e-06, 1e-05, 2.5e-05, 5e-05, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+_NS_PER_SECOND = 1000000000
+
+
+class LatencyHistogram:
+    """Histogram of durations in nanoseconds with HDR-style log-linear buckets.
+
+    Values below 2 ** precision_bits get a bucket each. Above that, every power of two is split into
+    2 ** (precision_bits - 1) buckets of equal width, so any recorded value is known within a relative error of
+    2 ** (1 - precision_bits) whatever its magnitude, using a fixed array of counts.
+    """
+
+    __slots__ = ('precision_bits', 'counts', 'count', 'total')
+
+    def __init__(self, precision_bits=6):
+        self.precision_bits = precision_bits
+        self.counts = array('q', [0]) * (self._index_of(2 ** 63 - 1) + 1)
+        self.count = 0
+        # Sum of the recorded values, in nanoseconds.
+        self.total = 0
+
+    def record(self, value_ns):
+        """Record one duration.
+
+        Args:
+            value_ns (int): duration in nanoseconds.
+
+        """
+        self.counts[self._index_of(value_ns if value_ns > 0 else 0)] += 1
+        self.count += 1
+        self.total += value_ns
+
+    def percentile(self, percent):
+        """Get the value at a percentile of the recorded durations.
+
+        Args:
+            percent (float): from 0 to 100.
+
+        Returns:
+            int: highest value of the bucket holding the percentile, in nanoseconds, 0 if nothing was recorded.
+
+        """
+        if not self.count:
+            return 0
+
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self._highest_value_of(index)
+
+        return self._highest_value_of(len(self.counts) - 1)
+
+    def cumulative_counts(self, bounds_ns):
+        """Count the recorded durations at or below each of a sequence of bounds.
+
+        Args:
+            bounds_ns (iterable): increasing upper bounds, in nanoseconds.
+
+        Returns:
+            list: number of durations whose bucket lies entirely at or below each bound.
+
+        """
+        cumulative = []
+        seen = 0
+        index = 0
+        counts = self.counts
+
+        for bound in bounds_ns:
+            while index < len(counts) and self._highest_value_of(index) <= bound:
+                seen += counts[index]
+                index += 1
+            cumulative.append(seen)
+
+        return cumulative
+
+    """PRIVATE METHODS"""
+
+    def _index_of(self, value):
+        precision_bits = self.precision_bits
+        exponent = value.bit_length() - precision_bits
+
+        if exponent <= 0:
+            return value
+
+        return (exponent << (precision_bits - 1)) + (value >> exponent)
+
+    def _highest_value_of(self, index):
+        half = 1 << (self.precision_bits - 1)
+
+        if index < 2 * half:
+            return index
+
+        exponent = index // half - 1
+        mantissa = index - exponent * half
+
+        return ((mantissa + 1) << exponent) - 1
+
+
+class Metrics:
+    """Call counts, vend outcome counts and latency histograms of the operations of vending machines.
+
+    Nothing is measured until enable is called with a VendingMachine class. Enabling wraps the methods listed in
+    INSTRUMENTED_METHODS on that class with timed versions, and disable puts the original methods back, so a class
+    without metrics enabled runs exactly the code it would run without this module. The figures are shared by every
+    machine of the enabled classes and can be rendered in the Prometheus text exposition format.
+    """
+
+    def __init__(self, precision_bits=6, clock=time.perf_counter_ns):
+        self.precision_bits = precision_bits
+        self.clock = clock
+
+        self.histograms = {operation: LatencyHistogram(precision_bits) for operation in INSTRUMENTED_METHODS.values()}
+        self.vend_reasons = {reason: 0 for reason in VendReason}
+
+        self._lock = threading.Lock()
+        # Class -> {method name: attribute the class defined itself, or None}, to undo enable.
+        self._originals = {}
+
+    def enable(self, vending_machine_class):
+        """Start measuring the operations of a class of vending machines.
+
+        Enable the class whose instances are used: methods a subclass overrides and then calls with super() are only
+        timed in the subclass, so nothing is counted twice.
+
+        Args:
+            vending_machine_class (type): VendingMachine or one of its subclasses.
+
+        """
+        with self._lock:
+            if vending_machine_class in self._originals:
+                return
+
+            originals = {}
+            for method_name, operation in INSTRUMENTED_METHODS.items():
+                originals[method_name] = vending_machine_class.__dict__.get(method_name)
+                method = getattr(vending_machine_class, method_name)
+                setattr(vending_machine_class, method_name, self._timed(method, operation))
+
+            self._originals[vending_machine_class] = originals
+
+    def disable(self, vending_machine_class):
+        """Stop measuring the operations of a class of vending machines, keeping the figures recorded so far.
+
+        Args:
+            vending_machine_class (type)
+
+        """
+        with self._lock:
+            originals = self._originals.pop(vending_machine_class, None)
+
+            if originals is None:
+                return
+
+            for method_name, original in originals.items():
+                if original is None:
+                    delattr(vending_machine_class, method_name)
+                else:
+                    setattr(vending_machine_class, method_name, original)
+
+    def is_enabled(self, vending_machine_class):
+        """Check whether the operations of a class are being measured.
+
+        Args:
+            vending_machine_class (type)
+
+        Returns:
+            bool
+
+        """
+        return vending_machine_class in self._originals
+
+    def calls(self, operation):
+        """Get the number of calls of an operation.
+
+        Args:
+            operation (str): one of the values of INSTRUMENTED_METHODS.
+
+        Returns:
+            int
+
+        """
+        return self.histograms[operation].count
+
+    def reset(self):
+        """Forget every figure recorded so far."""
+        with self._lock:
+            self.histograms = {
+                operation: LatencyHistogram(self.precision_bits) for operation in INSTRUMENTED_METHODS.values()
+            }
+            self.vend_reasons = {reason: 0 for reason in VendReason}
+
+    def render(self):
+        """Render the figures in the Prometheus text exposition format.
+
+        Returns:
+            str
+
+        """
+        bounds_ns = [round(bound * _NS_PER_SECOND) for bound in EXPORT_BUCKETS]
+        lines = [
+            '# HELP vending_machine_calls_total Calls of each vending machine operation.',
+            '# TYPE vending_machine_calls_total counter',
+        ]
+
+        with self._lock:
+            histograms = [(operation, histogram) for operation, histogram in self.histograms.items() if histogram.count]
+            vend_reasons = dict(self.vend_reasons)
+
+            for operation, histogram in histograms:
+                lines.append(f'vending_machine_calls_total{{operation="{operation}"}} {histogram.count}')
+
+            lines += [
+                '# HELP vending_machine_vends_total Vend requests by outcome.',
+                '# TYPE vending_machine_vends_total counter',
+            ]
+            for reason, count in vend_reasons.items():
+                lines.append(f'vending_machine_vends_total{{reason="{reason.name.lower()}"}} {count}')
+
+            lines += [
+                '# HELP vending_machine_operation_duration_seconds Duration of each vending machine operation.',
+                '# TYPE vending_machine_operation_duration_seconds histogram',
+            ]
+            for operation, histogram in histograms:
+                name = 'vending_machine_operation_duration_seconds'
+                for bound, count in zip(EXPORT_BUCKETS, histogram.cumulative_counts(bounds_ns)):
+                    lines.append(f'{name}_bucket{{operation="{operation}",le="{bound}"}} {count}')
+                lines += [
+                    f'{name}_bucket{{operation="{operation}",le="+Inf"}} {histogram.count}',
+                    f'{name}_sum{{operation="{operation}"}} {histogram.total / _NS_PER_SECOND}',
+                    f'{name}_count{{operation="{operation}"}} {histogram.count}',
+                ]
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """Write the rendered figures to a file, replacing it atomically, e.g. for a textfile collector.
+
+        Args:
+            path (str)
+
+        """
+        temporary_path = f'{path}.tmp'
+
+        with open(temporary_path, 'w') as metrics_file:
+            metrics_file.write(self.render())
+
+        os.replace(temporary_path, path)
+
+    """PRIVATE METHODS"""
+
+    def _timed(self, method, operation):
+        clock = self.clock
+        metrics = self
+
+        if operation == 'vend_decision':
+            def record(started, result):
+                ended = clock()
+                with metrics._lock:
+                    metrics.histograms[operation].record(ended - started)
+                    metrics.vend_reasons[result[0]] += 1
+        elif operation == 'vend_batch':
+            def record(started, result):
+                ended = clock()
+                with metrics._lock:
+                    metrics.histograms[operation].record(ended - started)
+                    for reason, count in result[0].reason_counts().items():
+                        metrics.vend_reasons[reason] += count
+        else:
+            def record(started, result):
+                ended = clock()
+                with metrics._lock:
+                    metrics.histograms[operation].record(ended - started)
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            started = clock()
+            result = method(*args, **kwargs)
+            record(started, result)
+            return result
+
+        return timed
+
+
+class MetricsServer:
+    """Serves the rendered figures of a Metrics to HTTP scrapers on a TCP address or a Unix socket.
+
+    Every GET request is answered with the current figures, whatever its path. Requests are handled on daemon
+    threads, so a scrape never blocks the vending machines.
+    """
+
+    def __init__(self, metrics, address):
+        import socketserver
+        from vending_machine.server import parse_address
+
+        parsed_address = parse_address(address)
+        handler = _handler_for(metrics)
+
+        if parsed_address[0] == 'unix':
+            self._server = socketserver.ThreadingUnixStreamServer(parsed_address[1], handler)
+        else:
+            self._server = socketserver.ThreadingTCPServer(parsed_address[1:], handler)
+        self._server.daemon_threads = True
+
+        self.address = self._server.server_address
+        self._thread = threading.Thread(target=self._server.serve_forever, name='metrics-server', daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stop serving and close the listening socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+        if isinstance(self.address, str):
+            os.unlink(self.address)
+
+
+"""PRIVATE FUNCTIONS"""
+
+
+def _handler_for(metrics):
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            body = metrics.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def address_string(self):
+            # Unix socket clients have no address.
+            return str(self.client_address)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
@@ -0,0 +1,99 @@
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+CENTS_PER_UNIT = 100
+
+_CENT = Decimal('0.01')
+
+
+def to_cents(amount):
+    """Convert an amount of money to integer cents.
+
+    Floats are converted through their shortest decimal representation, so 0.1 becomes 10 cents rather than the
+    binary approximation. Fractions of a cent are rounded half up.
+
+    Args:
+        amount (int/float/Decimal/str)
+
+    Returns:
+        int: the amount in cents.
+
+    """
+    if type(amount) is int:
+        return amount * CENTS_PER_UNIT
+
+    if isinstance(amount, float):
+        amount = repr(amount)
+
+    try:
+        amount = Decimal(amount)
+    except InvalidOperation:
+        raise ValueError(f'{amount!r} is not an amount of money') from None
+
+    if not amount.is_finite():
+        raise ValueError(f'{amount!r} is not an amount of money')
+
+    try:
+        amount = amount.quantize(_CENT, rounding=ROUND_HALF_UP)
+    except InvalidOperation:
+        # Amounts with more digits than the decimal context holds, e.g. 1e30.
+        raise ValueError(f'{amount!r} is too large an amount of money') from None
+
+    return int(amount * CENTS_PER_UNIT)
+
+
+def from_cents(cents):
+    """Convert integer cents to the float amounts returned by the public API.
+
+    Args:
+        cents (int)
+
+    Returns:
+        float
+
+    """
+    return cents / CENTS_PER_UNIT
+
+
+def parse_money(text):
+    """Parse an amount of money typed by a user without going through a float.
+
+    Args:
+        text (str)
+
+    Returns:
+        Decimal: the amount, rounded to the cent.
+
+    Raises:
+        ValueError: if the text is not a finite number.
+
+    """
+    return Decimal(to_cents(text.strip())) / CENTS_PER_UNIT
+
+
+def format_money(cents):
+    """Format integer cents for display.
+
+    Args:
+        cents (int)
+
+    Returns:
+        str: the amount with a dollar sign and two decimals, e.g. $1.25.
+
+    """
+    sign = '-' if cents < 0 else ''
+    units, remainder = divmod(abs(cents), CENTS_PER_UNIT)
+
+    return f'{sign}${units}.{remainder:02d}'
+
+
+def sum_cents(amounts):
+    """Exactly add up many amounts of money.
+
+    Args:
+        amounts (iterable): int/float/Decimal amounts.
+
+    Returns:
+        int: the total in cents.
+
+    """
+    return sum(map(to_cents, amounts))
@@ -0,0 +1,340 @@
+from array import array
+from collections import namedtuple
+from enum import IntEnum
+
+from vending_machine.fleet import EMPTY_NAME_ID, VendingFleet
+from vending_machine.money import from_cents, to_cents
+from vending_machine.sparse_slots import occupied_items
+from vending_machine.vending_machine import Item
+
+
+class PlanogramOp(IntEnum):
+    """Changes of a planogram diff, applied in this order."""
+
+    MOVE_ITEM = 1
+    REMOVE_ITEM = 2
+    REPLACE_ITEM = 3
+    ADD_ITEM = 4
+    CHANGE_PRICE = 5
+    CHANGE_STOCK = 6
+
+
+# One change of a planogram diff. source_slot is only set for MOVE_ITEM, name, price_cents and stock hold the desired
+# item of the slot, or None for REMOVE_ITEM.
+PlanogramChange = namedtuple('PlanogramChange', 'op slot source_slot name price_cents stock')
+
+
+class PlanogramError(Exception):
+    """A planogram change failed. The machine was rolled back to its layout before the apply."""
+
+    def __init__(self, change):
+        super().__init__(f'{change.op.name} of slot {change.slot} failed')
+        self.change = change
+
+
+class PlanogramRollbackError(Exception):
+    """Undoing the changes of a failed apply failed too, leaving the machine partly changed.
+
+    The exception that made the apply fail is the __cause__ of this one.
+    """
+
+    def __init__(self, change):
+        super().__init__(f'undoing with {change.op.name} of slot {change.slot} failed, the machine is partly changed')
+        self.change = change
+
+
+class PushReport:
+    """Outcome of pushing a planogram to many machines."""
+
+    __slots__ = ('changed', 'unchanged', 'changes', 'failures')
+
+    def __init__(self):
+        # Machines whose layout was changed, and the ones already matching the planogram.
+        self.changed = 0
+        self.unchanged = 0
+        # Changes applied, summed over the machines.
+        self.changes = 0
+        # (machine index, exception) of each machine that failed, rolled back unless the exception is a
+        # PlanogramRollbackError.
+        self.failures = []
+
+
+class Planogram:
+    """Desired layout of a machine: the item, price and stock of every slot, the slots left out being empty.
+
+    diff compares the planogram with a machine and lists the changes that give the machine that layout, keeping the
+    items already in it where it can. Slots already holding the right item only get their price or stock adjusted.
+    An item wanted in a slot that is empty, or emptied by an earlier move, is moved there from a slot that no longer
+    wants it, keeping its stock, rather than removed and added again. Items swapping slots are replaced, as moving
+    them would need a spare slot. apply makes those changes through the regular VendingMachine methods, so they are
+    validated, journaled and emitted as events like any other change, and undoes them if one fails.
+    """
+
+    def __init__(self, layout):
+        # Slot number -> (name, price in cents, stock), from the Item or (name, price, stock) tuple of each slot.
+        self.layout = {}
+
+        for slot_number, slot_item in layout.items():
+            if isinstance(slot_item, tuple):
+                name, price, stock = slot_item
+                price_cents = to_cents(price)
+            else:
+                name, price_cents, stock = slot_item.name, slot_item.price_cents, slot_item.stock
+
+            if slot_number < 1:
+                raise ValueError(f'no slot {slot_number}')
+            if price_cents < 0 or stock < 0:
+                raise ValueError(f'slot {slot_number} has a negative price or stock')
+
+            self.layout[slot_number] = (name, price_cents, stock)
+
+        self._highest_slot = max(self.layout, default=0)
+
+    @classmethod
+    def from_machine(cls, vending_machine):
+        """Capture the current layout of a machine.
+
+        Args:
+            vending_machine (VendingMachine)
+
+        Returns:
+            Planogram
+
+        """
+        return _planogram_of(_layout_of(vending_machine))
+
+    def diff(self, vending_machine):
+        """List the changes that give a machine the layout of the planogram.
+
+        Args:
+            vending_machine (VendingMachine)
+
+        Returns:
+            list: PlanogramChange of each change, in the order they must be applied.
+
+        """
+        self._check_slots(vending_machine.total_slots)
+
+        return self._diff(_layout_of(vending_machine))
+
+    def apply(self, vending_machine):
+        """Give a machine the layout of the planogram, all at once or not at all.
+
+        The changes are made one after the other, so other threads may see the machine halfway through. If a change
+        fails, or raises, the changes already made are undone, by applying the layout the machine had before, and the
+        error is raised again.
+
+        Args:
+            vending_machine (VendingMachine)
+
+        Returns:
+            list: PlanogramChange of each change made.
+
+        Raises:
+            PlanogramError: a change failed.
+            PlanogramRollbackError: a change failed or raised, and undoing the changes failed too.
+
+        """
+        self._check_slots(vending_machine.total_slots)
+
+        before = _layout_of(vending_machine)
+        changes = self._diff(before)
+
+        try:
+            for change in changes:
+                if not _apply_change(vending_machine, change):
+                    raise PlanogramError(change)
+        except BaseException as error:
+            _roll_back(vending_machine, before, error)
+            raise
+
+        return changes
+
+    def push(self, vending_machines):
+        """Apply the planogram to many machines, e.g. the machines of a fleet.
+
+        A machine that fails or raises any error, e.g. an OSError from its journal, is rolled back and reported without
+        stopping the others, with a PlanogramRollbackError if the rollback failed too. On a VendingFleet, machines
+        already matching the planogram are found by comparing their slot columns, without building their slot items;
+        this interns every item name of the planogram into fleet.names, even for a fleet that no machine changes.
+
+        Args:
+            vending_machines (iterable): VendingMachine objects, or a VendingFleet.
+
+        Returns:
+            PushReport
+
+        """
+        report = PushReport()
+
+        if isinstance(vending_machines, VendingFleet):
+            candidates = self._fleet_candidates(vending_machines, report)
+        else:
+            candidates = enumerate(vending_machines)
+
+        for machine_index, vending_machine in candidates:
+            try:
+                changes = self.apply(vending_machine)
+            except Exception as error:
+                report.failures.append((machine_index, error))
+                continue
+
+            if changes:
+                report.changed += 1
+                report.changes += len(changes)
+            else:
+                report.unchanged += 1
+
+        return report
+
+    """PRIVATE METHODS"""
+
+    def _check_slots(self, total_slots):
+        if self._highest_slot > total_slots:
+            raise ValueError(f'no slot {self._highest_slot} in a machine of {total_slots} slots')
+
+    def _diff(self, current):
+        layout = self.layout
+
+        # Occupied slots whose item is not wanted there, by item name, as sources of moves. Slots of the planogram come
+        # last, to be moved from first: emptying them lets another item move in.
+        leaving = {}
+        for slot_number, (name, _, _) in current.items():
+            if slot_number not in layout:
+                leaving.setdefault(name, []).append(slot_number)
+        for slot_number, (name, _, _) in current.items():
+            wanted = layout.get(slot_number)
+            if wanted is not None and wanted[0] != name:
+                leaving.setdefault(name, []).append(slot_number)
+
+        moves = []
+        # Source slot of each slot an item is moved to.
+        moved_from = {}
+
+        # Slots of the planogram that are empty when their turn comes: the empty ones, then the ones emptied by moves,
+        # appended as the loop goes.
+        empty = [slot_number for slot_number in layout if slot_number not in current]
+
+        for slot_number in empty:
+            wanted = layout[slot_number]
+            sources = leaving.get(wanted[0])
+
+            if sources:
+                moved_from[slot_number] = source_slot = sources.pop()
+                moves.append(PlanogramChange(PlanogramOp.MOVE_ITEM, slot_number, source_slot, *wanted))
+
+                if source_slot in layout:
+                    empty.append(source_slot)
+
+        moved_out = set(moved_from.values())
+        removals = [
+            PlanogramChange(PlanogramOp.REMOVE_ITEM, slot_number, None, None, None, None)
+            for slot_number in current if slot_number not in layout and slot_number not in moved_out
+        ]
+        replacements = []
+        additions = []
+        price_changes = []
+        stock_changes = []
+
+        for slot_number, wanted in layout.items():
+            if slot_number in moved_from:
+                current_item = current[moved_from[slot_number]]
+            else:
+                current_item = current.get(slot_number)
+
+                if current_item is None or slot_number in moved_out:
+                    additions.append(PlanogramChange(PlanogramOp.ADD_ITEM, slot_number, None, *wanted))
+                    continue
+                if current_item[0] != wanted[0]:
+                    replacements.append(PlanogramChange(PlanogramOp.REPLACE_ITEM, slot_number, None, *wanted))
+                    continue
+
+            if current_item[1] != wanted[1]:
+                price_changes.append(PlanogramChange(PlanogramOp.CHANGE_PRICE, slot_number, None, *wanted))
+            if current_item[2] != wanted[2]:
+                stock_changes.append(PlanogramChange(PlanogramOp.CHANGE_STOCK, slot_number, None, *wanted))
+
+        return moves + removals + replacements + additions + price_changes + stock_changes
+
+    def _fleet_candidates(self, fleet, report):
+        # Interns the names of the planogram into fleet.names as a side effect, to compare name ids.
+        slots = fleet.slots_per_machine
+        self._check_slots(slots)
+
+        # The slot columns of a machine matching the planogram, to compare whole machines at once.
+        name_ids = array('i', [EMPTY_NAME_ID]) * slots
+        prices = array('q', [0]) * slots
+        stock = array('q', [0]) * slots
+
+        for slot_number, (name, price_cents, slot_stock) in self.layout.items():
+            name_ids[slot_number - 1] = fleet.names.intern(name)
+            prices[slot_number - 1] = price_cents
+            stock[slot_number - 1] = slot_stock
+
+        for machine_id in range(fleet.machine_count):
+            start = machine_id * slots
+
+            if fleet.name_ids[start:start + slots] == name_ids and fleet.stock[start:start + slots] == stock and \
+                    fleet.prices[start:start + slots] == prices:
+                report.unchanged += 1
+            else:
+                yield machine_id, fleet.machine(machine_id)
+
+
+"""PRIVATE FUNCTIONS"""
+
+
+def _layout_of(vending_machine):
+    return {
+        slot_number: (slot_item.name, slot_item.price_cents, slot_item.stock)
+        for slot_number, slot_item in occupied_items(vending_machine.slot_items)
+    }
+
+
+def _planogram_of(layout):
+    # Planogram of a layout already in cents, e.g. read from a machine.
+    planogram = Planogram({})
+    planogram.layout = layout
+    planogram._highest_slot = max(layout, default=0)
+    return planogram
+
+
+def _roll_back(vending_machine, before, error):
+    for change in _planogram_of(before)._diff(_layout_of(vending_machine)):
+        try:
+            undone = _apply_change(vending_machine, change)
+        except Exception:
+            raise PlanogramRollbackError(change) from error
+
+        if not undone:
+            raise PlanogramRollbackError(change) from error
+
+
+def _apply_change(vending_machine, change):
+    op, slot_number = change.op, change.slot
+
+    if op == PlanogramOp.MOVE_ITEM:
+        return vending_machine.move_item_to_slot(change.source_slot, slot_number)
+    if op == PlanogramOp.REMOVE_ITEM:
+        return vending_machine.remove_item_from_slot(slot_number)
+    if op == PlanogramOp.REPLACE_ITEM:
+        return vending_machine.replace_item_in_slot(slot_number, _item(change))
+    if op == PlanogramOp.ADD_ITEM:
+        return vending_machine.add_item_to_slot(slot_number, _item(change))
+    if op == PlanogramOp.CHANGE_PRICE:
+        return vending_machine.change_price(slot_number, from_cents(change.price_cents))
+
+    slot_item = vending_machine.slot_items[slot_number]
+    if slot_item is None:
+        return False
+
+    if change.stock > slot_item.stock:
+        return vending_machine.increase_stock(slot_number, change.stock - slot_item.stock)[0]
+
+    return vending_machine.decrease_stock(slot_number, slot_item.stock - change.stock)[0]
+
+
+def _item(change):
+    item = Item(change.name, 0, change.stock)
+    item.price_cents = change.price_cents
+    return item
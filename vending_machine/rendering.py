@@ -0,0 +1,131 @@
+from vending_machine.money import format_money
+
+WELCOME_SCREEN = '\n'.join([
+    '=' * 21,
+    '== ' + 'VENDING MACHINE' + ' ==',
+    '=' * 21,
+    '',
+    '',
+])
+
+CUSTOMER_OPTIONS = '\n'.join([
+    '',
+    '(i) Insert Money',
+    '(r) Remove Money',
+    '(m) Maintenance Mode',
+    '(q) Exit Vending Machine',
+    '',
+])
+
+MAINTENANCE_SCREEN = '\n'.join([
+    '*' * 22,
+    '** MAINTENANCE MODE **',
+    '*' * 22,
+    '',
+    '(a) Add Item',
+    '(d) Display Items',
+    '(mod) Modify Existing Item',
+    '(mov) Move Item',
+    '(rem) Remove Item',
+    '(rep) Replace Item',
+    '(m) Exit Maintenance Mode',
+    '(q) Exit Vending Machine',
+    '',
+])
+
+MODIFY_ITEM_OPTIONS = '\n'.join([
+    '',
+    '(n) Change name',
+    '(p) Change price',
+    '(is) Increase stock',
+    '(ds) Decrease stock',
+    '(q) Return to Maintenance Mode menu',
+    '',
+])
+
+SLOT_ITEMS_HEADER = '==== SLOT ITEMS ====\n'
+
+
+class MenuRenderer:
+    """Composes the menu screens of VendingMachineInterface into single strings.
+
+    The static parts of the menus are built once. The listing line of every slot is cached with the item state it
+    was formatted from, and formatted again only once that item has changed.
+    """
+
+    def __init__(self, vending_machine):
+        self.vending_machine = vending_machine
+
+        # Slot number -> (name, price in cents, stock, line) of the occupied slots listed so far.
+        self._slot_lines = {}
+
+    def customer_screen(self):
+        """Compose the customer menu: the balance, the occupied slots and the options.
+
+        Returns:
+            str
+
+        """
+        return ''.join([
+            f'Current balance: {format_money(self.vending_machine.balance_cents)}\n\n',
+            SLOT_ITEMS_HEADER,
+            *self._slot_lines_of(include_empty=False),
+            CUSTOMER_OPTIONS,
+        ])
+
+    def slot_items_screen(self):
+        """Compose the maintenance listing of every slot, including the empty ones.
+
+        Returns:
+            str
+
+        """
+        return ''.join(['\n', SLOT_ITEMS_HEADER, *self._slot_lines_of(include_empty=True), '\n'])
+
+    @staticmethod
+    def modify_item_screen(slot_number, slot_item):
+        """Compose the menu modifying the item in a slot.
+
+        Args:
+            slot_number (int)
+            slot_item (Item)
+
+        Returns:
+            str
+
+        """
+        return ''.join([
+            f'\nThe current item in slot {slot_number} has the following parameters:\n',
+            f'Name: {slot_item.name}\n',
+            f'Price: {format_money(slot_item.price_cents)}\n',
+            f'Stock: {slot_item.stock}\n',
+            MODIFY_ITEM_OPTIONS,
+        ])
+
+    """PRIVATE METHODS"""
+
+    def _slot_lines_of(self, include_empty):
+        slot_items = self.vending_machine.slot_items
+        slot_lines = self._slot_lines
+
+        # The customer menu lists the occupied slots only, which the slot index yields without a scan of every slot.
+        slot_numbers = slot_items if include_empty else sorted(self.vending_machine.occupied_slots())
+
+        for slot_number in slot_numbers:
+            slot_item = slot_items[slot_number]
+
+            if slot_item is None:
+                yield f'[{slot_number}] Empty slot\n'
+                continue
+
+            cached = slot_lines.get(slot_number)
+            name, price_cents, stock = slot_item.name, slot_item.price_cents, slot_item.stock
+
+            if cached is None or cached[0] != name or cached[1] != price_cents or cached[2] != stock:
+                cached = (
+                    name, price_cents, stock,
+                    f'[{slot_number}] {name} - {format_money(price_cents)} (Remaining: {stock})\n'
+                )
+                slot_lines[slot_number] = cached
+
+            yield cached[3]
@@ -0,0 +1,281 @@
+import heapq
+import math
+import time
+from collections import namedtuple
+
+from vending_machine.events import (
+    ItemAdded, ItemMoved, ItemRemoved, ItemReplaced, ItemVended, NameChanged, StockDecreased, StockIncreased,
+)
+from vending_machine.sparse_slots import occupied_items
+
+# A slot of the restock plan: its stock, its sales rate in vends per hour and the time it is projected to run out.
+RestockNeed = namedtuple('RestockNeed', 'machine_id slot_number stock rate_per_hour stockout_at')
+
+_SECONDS_PER_HOUR = 3600
+
+
+class RestockPlanner:
+    """Projects when the slots of a fleet run out of stock from their recent sales, and ranks the ones to restock.
+
+    The sales rate of each slot is an exponentially weighted count of its vends: every vend adds 1 / tau and the
+    rate decays by a factor of e every tau seconds, tau being half_life / ln 2. A vend updates the rate in constant
+    time, whenever the previous one happened, and the slot is then projected to run out stock / rate seconds later.
+
+    Projections are kept in a heap ordered by stockout time. Updating a slot pushes a new entry and leaves the old one
+    in place, to be skipped when it reaches the top, so planning only looks at the slots running out first instead of
+    rescanning the fleet. The heap is rebuilt once stale entries outnumber live ones.
+
+    Slots are identified by (machine id, slot number). Feed the planner with observe_vend and observe_stock, or let
+    it follow the events of VendingMachine objects with watch.
+    """
+
+    def __init__(self, half_life=3 * 86400, clock=time.time):
+        self.half_life = half_life
+        self.clock = clock
+
+        self._tau = half_life / math.log(2)
+        # (machine id, slot number) -> [rate per second at last_time, last_time, stock, projected stockout time,
+        # sequence of the live heap entry].
+        self._slots = {}
+        # (stockout time, sequence, key) entries, valid while the state of the key holds the same sequence.
+        self._heap = []
+        self._sequence = 0
+
+    def observe_vend(self, machine_id, slot_number, stock, at=None):
+        """Count a successful vend.
+
+        Args:
+            machine_id (int)
+            slot_number (int)
+            stock (int): stock left after the vend.
+            at (float): time of the vend, now by default.
+
+        """
+        at = self.clock() if at is None else at
+        key = (machine_id, slot_number)
+        state = self._slots.get(key)
+
+        if state is None:
+            state = self._slots[key] = [0.0, at, stock, math.inf, None]
+        else:
+            self._decay(state, at)
+
+        state[0] += 1 / self._tau
+        state[2] = stock
+        self._project(key, state)
+
+    def observe_stock(self, machine_id, slot_number, stock, at=None, reset_rate=False):
+        """Update the stock of a slot after a restock or any other change that is not a sale.
+
+        Args:
+            machine_id (int)
+            slot_number (int)
+            stock (int)
+            at (float): time of the change, now by default.
+            reset_rate (bool): whether or not to forget the sales of the slot, e.g. when it gets a different item.
+
+        """
+        at = self.clock() if at is None else at
+        key = (machine_id, slot_number)
+        state = self._slots.get(key)
+
+        if state is None or reset_rate:
+            state = self._slots[key] = [0.0, at, stock, math.inf, None]
+        else:
+            self._decay(state, at)
+            state[2] = stock
+
+        self._project(key, state)
+
+    def forget(self, machine_id, slot_number):
+        """Stop following a slot, e.g. once it is emptied.
+
+        Args:
+            machine_id (int)
+            slot_number (int)
+
+        """
+        self._slots.pop((machine_id, slot_number), None)
+
+    def move(self, machine_id, source_slot, target_slot):
+        """Carry the sales rate and stock of a slot over to another slot of the same machine.
+
+        Args:
+            machine_id (int)
+            source_slot (int)
+            target_slot (int)
+
+        """
+        state = self._slots.pop((machine_id, source_slot), None)
+
+        if state is None:
+            self._slots.pop((machine_id, target_slot), None)
+        else:
+            self._slots[(machine_id, target_slot)] = state
+            self._project((machine_id, target_slot), state)
+
+    def watch(self, vending_machine, machine_id=0):
+        """Follow the vends and stock changes of a machine through its event bus.
+
+        Args:
+            vending_machine (VendingMachine): machine created with an EventBus.
+            machine_id (int)
+
+        Returns:
+            callable: the callback subscribed to the event bus, to unsubscribe it.
+
+        """
+        if vending_machine.events is None:
+            raise ValueError('the vending machine has no event bus')
+
+        slot_items = vending_machine.slot_items
+        # Item name of each occupied slot, to tell an item added on top of the same item from a replacement.
+        slot_names = {slot_number: slot_item.name for slot_number, slot_item in occupied_items(slot_items)}
+
+        def on_event(event):
+            event_type = type(event)
+
+            if event_type is ItemVended:
+                self.observe_vend(machine_id, event.slot, event.stock)
+            elif event_type is StockIncreased or event_type is StockDecreased:
+                self.observe_stock(machine_id, event.slot, event.stock)
+            elif event_type is ItemAdded:
+                # An item added to a slot holding the same item adds to its stock, read the total from the slot. Any
+                # other item replaced the one in the slot, whose sales say nothing about the new one.
+                same_item = slot_names.get(event.slot) == event.name
+                slot_names[event.slot] = event.name
+                self.observe_stock(machine_id, event.slot, slot_items[event.slot].stock, reset_rate=not same_item)
+            elif event_type is ItemReplaced:
+                slot_names[event.slot] = event.name
+                self.observe_stock(machine_id, event.slot, event.stock, reset_rate=True)
+            elif event_type is ItemMoved:
+                slot_names[event.target_slot] = slot_names.pop(event.source_slot, None)
+                self.move(machine_id, event.source_slot, event.target_slot)
+            elif event_type is ItemRemoved:
+                slot_names.pop(event.slot, None)
+                self.forget(machine_id, event.slot)
+            elif event_type is NameChanged:
+                slot_names[event.slot] = event.name
+
+        return vending_machine.events.subscribe(
+            on_event, ItemVended, StockIncreased, StockDecreased, ItemAdded, ItemReplaced, ItemMoved, ItemRemoved,
+            NameChanged,
+        )
+
+    def rate(self, machine_id, slot_number, at=None):
+        """Get the current sales rate of a slot.
+
+        Args:
+            machine_id (int)
+            slot_number (int)
+            at (float): time to decay the rate to, now by default.
+
+        Returns:
+            float: vends per hour, 0 for a slot without sales.
+
+        """
+        state = self._slots.get((machine_id, slot_number))
+
+        if state is None:
+            return 0.0
+
+        return self._rate_at(state, self.clock() if at is None else at) * _SECONDS_PER_HOUR
+
+    def stockout_time(self, machine_id, slot_number):
+        """Get the projected stockout time of a slot.
+
+        Args:
+            machine_id (int)
+            slot_number (int)
+
+        Returns:
+            float: time the slot is projected to run out, math.inf for a slot without sales.
+
+        """
+        state = self._slots.get((machine_id, slot_number))
+        return math.inf if state is None else state[3]
+
+    def plan(self, horizon, at=None, limit=None):
+        """List the slots projected to run out of stock within a horizon, the soonest first.
+
+        Slots already out of stock come first. Only the slots in the plan are looked at, so the cost does not grow
+        with the size of the fleet.
+
+        Args:
+            horizon (float): seconds from now.
+            at (float): time to plan from, now by default.
+            limit (int): maximum number of slots to list.
+
+        Returns:
+            list: RestockNeed of each slot, by projected stockout time.
+
+        """
+        at = self.clock() if at is None else at
+        deadline = at + horizon
+        heap = self._heap
+        slots = self._slots
+        taken = []
+        needs = []
+
+        while heap and heap[0][0] <= deadline and (limit is None or len(needs) < limit):
+            entry = heapq.heappop(heap)
+            stockout_at, sequence, key = entry
+            state = slots.get(key)
+
+            if state is None or state[4] != sequence:
+                continue
+
+            taken.append(entry)
+            rate_per_hour = self._rate_at(state, at) * _SECONDS_PER_HOUR
+            needs.append(RestockNeed(key[0], key[1], state[2], rate_per_hour, stockout_at))
+
+        for entry in taken:
+            heapq.heappush(heap, entry)
+
+        return needs
+
+    def __len__(self):
+        return len(self._slots)
+
+    """PRIVATE METHODS"""
+
+    def _decay(self, state, at):
+        # Vends reported out of order are counted at the time of the latest one.
+        if at > state[1]:
+            state[0] *= math.exp((state[1] - at) / self._tau)
+            state[1] = at
+
+    def _rate_at(self, state, at):
+        return state[0] * math.exp(min(state[1] - at, 0) / self._tau)
+
+    def _project(self, key, state):
+        rate, last_time, stock = state[0], state[1], state[2]
+
+        if stock <= 0:
+            stockout_at = last_time
+        elif rate > 0:
+            stockout_at = last_time + stock / rate
+        else:
+            stockout_at = math.inf
+
+        state[3] = stockout_at
+        state[4] = None
+
+        if stockout_at != math.inf:
+            state[4] = self._sequence
+            heapq.heappush(self._heap, (stockout_at, self._sequence, key))
+            self._sequence += 1
+
+            if len(self._heap) > 2 * len(self._slots) + 64:
+                self._compact()
+
+    def _compact(self):
+        self._heap = []
+
+        for key, state in self._slots.items():
+            if state[4] is not None:
+                state[4] = len(self._heap)
+                self._heap.append((state[3], state[4], key))
+
+        heapq.heapify(self._heap)
+        self._sequence = len(self._heap)
@@ -0,0 +1,326 @@
+import asyncio
+
+from vending_machine.async_vending_machine import AsyncVendingMachine
+from vending_machine.vending_machine import Item, VendReason
+
+SEPARATOR = '\t'
+
+# Longest request line accepted, as asyncio.StreamReader.readline does by default.
+MAX_LINE_LENGTH = 2 ** 16
+
+_READ_SIZE = 2 ** 16
+
+
+class VendingServer:
+    """Serves a VendingMachine to remote clients over TCP or a Unix socket.
+
+    The protocol is line based and UTF-8 encoded. Each request is a command followed by its arguments separated by
+    spaces, the item name always coming last so that it may contain spaces. Each response is OK or ERR followed by its
+    fields separated by tabs. Amounts of money are sent as decimal numbers and returned as integer cents:
+
+        PING                                  OK
+        BALANCE                               OK <balance>
+        INSERT <amount>                       OK <inserted> <balance>
+        REMOVE <amount>                       OK <removed> <balance>
+        VEND <slot>                           OK <vended> <VendReason> <balance> <summary>
+        SLOT <slot>                           OK [<name> <price> <stock>]
+        ADD <slot> <price> <stock> <name>     OK <added>
+        REPLACE <slot> <price> <stock> <name> OK <replaced>
+        MOVE <source> <target> [replace]      OK <moved>
+        CLEAR <slot>                          OK <removed>
+        NAME <slot> <name>                    OK <changed>
+        PRICE <slot> <price>                  OK <changed>
+        RESTOCK <slot> <n>                    OK <increased> <stock>
+        UNSTOCK <slot> <n>                    OK <decreased> <stock>
+        QUIT                                  OK, then the server closes the connection
+
+    Flags are sent as 0 or 1. Connections are kept alive until the client closes them or sends QUIT, and requests may
+    be pipelined: responses are always sent in request order. A request that fails unexpectedly gets an ERR internal
+    error response, and the connection keeps being served.
+    """
+
+    def __init__(self, vending_machine, abstract_provider=None):
+        self.vending_machine = vending_machine
+        self.async_vending_machine = AsyncVendingMachine(vending_machine, abstract_provider=abstract_provider)
+
+        self.connections = 0
+        self.requests_handled = 0
+
+        self._servers = []
+        # Command -> (fewest arguments, most arguments, handler).
+        self._commands = {
+            'PING': (0, 0, self._ping),
+            'BALANCE': (0, 0, self._balance),
+            'INSERT': (1, 1, self._insert),
+            'REMOVE': (1, 1, self._remove),
+            'VEND': (1, 1, self._vend),
+            'SLOT': (1, 1, self._slot),
+            'ADD': (4, 4, self._add),
+            'REPLACE': (4, 4, self._replace),
+            'MOVE': (2, 3, self._move),
+            'CLEAR': (1, 1, self._clear),
+            'NAME': (2, 2, self._name),
+            'PRICE': (2, 2, self._price),
+            'RESTOCK': (2, 2, self._restock),
+            'UNSTOCK': (2, 2, self._unstock),
+        }
+
+    async def start(self, host='127.0.0.1', port=0):
+        """Start listening on a TCP address.
+
+        Args:
+            host (str)
+            port (int): port to listen on, 0 to pick a free one.
+
+        Returns:
+            tuple: the host and port listened on.
+
+        """
+        server = await asyncio.start_server(self._serve_connection, host, port)
+        self._servers.append(server)
+
+        return server.sockets[0].getsockname()[:2]
+
+    async def start_unix(self, path):
+        """Start listening on a Unix socket.
+
+        Args:
+            path (str)
+
+        """
+        self._servers.append(await asyncio.start_unix_server(self._serve_connection, path))
+
+    async def serve_forever(self):
+        """Serve the connections of every address listened on until cancelled."""
+        await asyncio.gather(*(server.serve_forever() for server in self._servers))
+
+    async def close(self):
+        """Stop listening on every address."""
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+
+        self._servers = []
+
+    async def handle_request(self, request):
+        """Handle a single request line.
+
+        Args:
+            request (str): the request, without its line terminator.
+
+        Returns:
+            str: the response, without its line terminator.
+
+        """
+        command, _, arguments = request.strip().partition(' ')
+        minimum, maximum, handler = self._commands.get(command.upper(), (None, None, None))
+
+        if handler is None:
+            return _error(f'unknown command {command!r}')
+
+        command = command.upper()
+        # The last argument takes the rest of the line, so that item names may contain spaces.
+        arguments = arguments.split(None, maximum - 1) if maximum else arguments.split()
+
+        if not minimum <= len(arguments) <= maximum:
+            return _error(f'wrong number of arguments for {command}')
+
+        try:
+            fields = await handler(*arguments)
+        except ValueError as e:
+            return _error(f'invalid arguments for {command}: {e}')
+        except Exception:
+            # A bug must not drop the connection and the requests pipelined behind this one.
+            return _error(f'internal error handling {command}')
+
+        self.requests_handled += 1
+
+        return SEPARATOR.join(['OK', *map(_field, fields)])
+
+    """PRIVATE METHODS"""
+
+    async def _serve_connection(self, reader, writer):
+        self.connections += 1
+        # Start of a request line whose end has not been read yet.
+        partial = b''
+
+        try:
+            while True:
+                data = await reader.read(_READ_SIZE)
+
+                if data:
+                    *lines, partial = (partial + data).split(b'\n')
+                else:
+                    lines, partial = [partial], b''
+
+                # Pipelined requests read together are answered with a single write.
+                responses, quit = await self._handle_lines(lines)
+
+                if len(partial) > MAX_LINE_LENGTH:
+                    responses.append(_error('request line too long'))
+                    quit = True
+
+                if responses:
+                    writer.write(''.join(f'{response}\n' for response in responses).encode('utf-8'))
+                    await writer.drain()
+
+                if quit or not data:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _handle_lines(self, lines):
+        responses = []
+
+        for line in lines:
+            request = line.decode('utf-8', errors='replace').strip()
+
+            if not request:
+                continue
+
+            if request.upper() == 'QUIT':
+                responses.append('OK')
+                return responses, True
+
+            responses.append(await self.handle_request(request))
+
+        return responses, False
+
+    async def _ping(self):
+        return ()
+
+    async def _balance(self):
+        return (self.vending_machine.balance_cents,)
+
+    async def _insert(self, amount):
+        inserted, balance = await self.async_vending_machine.insert(amount)
+        return inserted, self.vending_machine.balance_cents
+
+    async def _remove(self, amount):
+        removed, balance = await self.async_vending_machine.remove(amount)
+        return removed, self.vending_machine.balance_cents
+
+    async def _vend(self, slot_number):
+        vend_reason, balance_cents, item_summary = await self.async_vending_machine.vend_with_reason(int(slot_number))
+        return vend_reason == VendReason.VENDED, int(vend_reason), balance_cents, item_summary
+
+    async def _slot(self, slot_number):
+        slot_number = int(slot_number)
+
+        if not self.vending_machine._is_valid_slot(slot_number):
+            raise ValueError(f'no slot {slot_number}')
+
+        slot_item = self.vending_machine.slot_items[slot_number]
+
+        if slot_item is None:
+            return ()
+
+        return slot_item.name, slot_item.price_cents, slot_item.stock
+
+    async def _add(self, slot_number, price, stock, name):
+        return (self.vending_machine.add_item_to_slot(int(slot_number), Item(name, price, int(stock))),)
+
+    async def _replace(self, slot_number, price, stock, name):
+        return (self.vending_machine.replace_item_in_slot(int(slot_number), Item(name, price, int(stock))),)
+
+    async def _move(self, source_slot, target_slot, replace='0'):
+        return (self.vending_machine.move_item_to_slot(int(source_slot), int(target_slot), replace=_flag(replace)),)
+
+    async def _clear(self, slot_number):
+        return (self.vending_machine.remove_item_from_slot(int(slot_number)),)
+
+    async def _name(self, slot_number, name):
+        return (self.vending_machine.change_name(int(slot_number), name),)
+
+    async def _price(self, slot_number, price):
+        return (self.vending_machine.change_price(int(slot_number), price),)
+
+    async def _restock(self, slot_number, n):
+        return self.vending_machine.increase_stock(int(slot_number), int(n))
+
+    async def _unstock(self, slot_number, n):
+        return self.vending_machine.decrease_stock(int(slot_number), int(n))
+
+
+def parse_address(address):
+    """Parse a server address given on the command line.
+
+    Args:
+        address (str): HOST:PORT, :PORT or unix:PATH.
+
+    Returns:
+        tuple: ('tcp', host, port) or ('unix', path).
+
+    Raises:
+        ValueError: if the address is malformed.
+
+    """
+    if address.startswith('unix:'):
+        return 'unix', address[len('unix:'):]
+
+    host, separator, port = address.rpartition(':')
+
+    if not separator or not port.isdigit():
+        raise ValueError(f'{address!r} is not HOST:PORT or unix:PATH')
+
+    return 'tcp', host or '127.0.0.1', int(port)
+
+
+def run_server(vending_machine, address, abstract_provider=None):
+    """Serve a vending machine on an address until interrupted.
+
+    Args:
+        vending_machine (VendingMachine)
+        address (str): HOST:PORT, :PORT or unix:PATH.
+        abstract_provider (AsyncAbstractProvider)
+
+    """
+    kind, *location = parse_address(address)
+
+    async def serve():
+        server = VendingServer(vending_machine, abstract_provider=abstract_provider)
+
+        if kind == 'unix':
+            await server.start_unix(*location)
+            print(f'Serving the vending machine on {address}')
+        else:
+            host, port = await server.start(*location)
+            print(f'Serving the vending machine on {host}:{port}')
+
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+"""PRIVATE FUNCTIONS"""
+
+
+def _flag(text):
+    if text not in ('0', '1'):
+        raise ValueError(f'{text!r} is not 0 or 1')
+
+    return text == '1'
+
+
+def _field(value):
+    if isinstance(value, bool):
+        return '1' if value else '0'
+
+    return str(value).replace(SEPARATOR, ' ').replace('\r', ' ').replace('\n', ' ')
+
+
+def _error(message):
+    return f'ERR{SEPARATOR}{_field(message)}'
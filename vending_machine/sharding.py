@@ -0,0 +1,403 @@
+import os
+from array import array
+from enum import IntEnum
+from itertools import accumulate, groupby, islice
+
+from vending_machine.vending_machine import Item, VendingMachine, VendReason
+
+# Int64 columns of a command: op, machine id, slot number, value, extra value.
+_COMMAND_COLUMNS = 5
+# Int64 columns of the shared command buffer: the command columns, then the rows of the batch ordered by worker.
+_BUFFER_COLUMNS = _COMMAND_COLUMNS + 1
+# Int64 columns of the shared result buffer: ok flag, VendReason, value.
+_RESULT_COLUMNS = 3
+# Int64 totals of each worker: commands, vends, revenue in cents, then one count per VendReason.
+_TOTALS = 3 + len(VendReason)
+
+
+class ShardOp(IntEnum):
+    """Commands of a ShardedFleet, with the meaning of their slot, value and extra fields and of their result value."""
+
+    INSERT_MONEY = 1  # -, amount in cents, -. Result: balance in cents.
+    REMOVE_MONEY = 2  # -, amount in cents, -. Result: balance in cents.
+    VEND = 3  # slot, amount in cents inserted first, -. Result: balance in cents, with the VendReason.
+    INCREASE_STOCK = 4  # slot, n, -. Result: new stock.
+    ADD_ITEM = 5  # slot, price in cents, stock, plus the item name. Result: 0.
+
+
+class ShardResults:
+    """Results of a batch of commands run by ShardedFleet.execute, one row per command in the order submitted."""
+
+    __slots__ = ('ok', 'reasons', 'values')
+
+    def __init__(self, ok, reasons, values):
+        # array('q') of 0/1 flags indicating whether or not each command succeeded.
+        self.ok = ok
+        # array('q') of the VendReason of each VEND command, 0 for the other commands.
+        self.reasons = reasons
+        # array('q') of the result value of each command, see ShardOp.
+        self.values = values
+
+    def __len__(self):
+        return len(self.ok)
+
+
+class ShardedFleet:
+    """Fleet of VendingMachine objects partitioned across worker processes by machine id.
+
+    Machine m lives in worker m % workers, so every worker runs its share of a batch of commands on its own core.
+    A batch is written once, as int64 columns, to a shared memory buffer, next to the rows of the batch ordered by
+    worker, from which every worker reads the rows of its own commands only. Each worker writes the results of those
+    commands to their rows of a shared result buffer and adds to its own totals in a third one, so the pipe to a
+    worker only carries the range of its rows, the item names of its ADD_ITEM commands and an acknowledgement.
+
+    Commands of a machine run in the order submitted. Commands of different machines are independent and may run in
+    any order. Commands are not transactional: when a worker fails, execute raises a RuntimeError naming the failed
+    shards once every worker is done, and the commands of the other shards, as well as those of the failed shards run
+    before the failure, stay applied.
+    """
+
+    def __init__(self, machines, slots=9, workers=None, batch_size=65536, start_method=None):
+        import multiprocessing
+        from multiprocessing.shared_memory import SharedMemory
+
+        self.machine_count = machines
+        self.slots_per_machine = slots
+        self.workers = workers if workers is not None else os.cpu_count()
+        self.batch_size = batch_size
+
+        self._commands = SharedMemory(create=True, size=8 * _BUFFER_COLUMNS * batch_size)
+        self._results = SharedMemory(create=True, size=8 * _RESULT_COLUMNS * batch_size)
+        self._totals = SharedMemory(create=True, size=8 * _TOTALS * self.workers)
+        self._totals.buf[:8 * _TOTALS * self.workers] = bytes(8 * _TOTALS * self.workers)
+
+        context = multiprocessing.get_context(start_method)
+        self._connections = []
+        self._processes = []
+
+        for worker_index in range(self.workers):
+            connection, worker_connection = context.Pipe()
+            process = context.Process(
+                target=_run_worker,
+                args=(worker_connection, self._commands.name, self._results.name, self._totals.name, worker_index,
+                      self.workers, machines, slots, batch_size),
+                name=f'fleet-shard-{worker_index}',
+                daemon=True,
+            )
+            process.start()
+            worker_connection.close()
+
+            self._connections.append(connection)
+            self._processes.append(process)
+
+    def execute(self, commands):
+        """Run a batch of commands on the workers owning their machines.
+
+        Args:
+            commands (iterable): (ShardOp, machine id, slot number, value, extra) tuples, plus the item name for
+                ADD_ITEM commands. See ShardOp for the fields of each command.
+
+        Returns:
+            ShardResults
+
+        Raises:
+            RuntimeError: if a worker failed, after the commands of the other workers were applied.
+
+        """
+        commands = list(commands)
+        # The names of ADD_ITEM commands are left out of the columns and sent apart.
+        columns = [array('q', column) for column in islice(zip(*commands), _COMMAND_COLUMNS)]
+
+        if not commands:
+            columns = [array('q') for _ in range(_COMMAND_COLUMNS)]
+        elif len(columns) != _COMMAND_COLUMNS:
+            raise ValueError(f'commands need {_COMMAND_COLUMNS} fields')
+
+        names = [command[5] for command in commands if command[0] == ShardOp.ADD_ITEM]
+
+        return self.execute_columns(columns, names)
+
+    def execute_columns(self, columns, names=()):
+        """Run a batch of commands given as columns, which saves building a tuple per command.
+
+        Args:
+            columns (list): op, machine id, slot number, value and extra columns of the commands, as array('q').
+            names (list): names of the ADD_ITEM commands, in order.
+
+        Returns:
+            ShardResults
+
+        Raises:
+            RuntimeError: if a worker failed, after the commands of the other workers were applied.
+
+        """
+        count = len(columns[0])
+        machine_ids = columns[1]
+
+        if count and not 0 <= min(machine_ids) <= max(machine_ids) < self.machine_count:
+            raise IndexError(f'machine id out of range: {min(machine_ids)} to {max(machine_ids)}')
+
+        results = array('q'), array('q'), array('q')
+        named = 0
+
+        for start in range(0, count, self.batch_size):
+            chunk = [column[start:start + self.batch_size] for column in columns]
+            added = chunk[0].count(ShardOp.ADD_ITEM)
+            self._execute_chunk(chunk, names[named:named + added], results)
+            named += added
+
+        return ShardResults(*results)
+
+    def vend_many(self, requests):
+        """Insert money and vend on many machines at once, following the rules of VendingMachine.vend_many.
+
+        Args:
+            requests (iterable): (machine id, amount in cents, slot number) tuples.
+
+        Returns:
+            ShardResults
+
+        """
+        columns = [array('q', column) for column in zip(*requests)] or [array('q') for _ in range(3)]
+        machine_ids, amounts_cents, slot_numbers = columns
+        count = len(machine_ids)
+
+        return self.execute_columns(
+            [array('q', [ShardOp.VEND]) * count, machine_ids, slot_numbers, amounts_cents, array('q', [0]) * count]
+        )
+
+    def stock_all(self, slot_number, name, price_cents, stock):
+        """Add the same item to a slot of every machine, replacing the item already there.
+
+        Args:
+            slot_number (int)
+            name (str)
+            price_cents (int)
+            stock (int)
+
+        Returns:
+            ShardResults
+
+        """
+        return self.execute((ShardOp.ADD_ITEM, machine_id, slot_number, price_cents, stock, name)
+                            for machine_id in range(self.machine_count))
+
+    def totals(self):
+        """Sum the totals of every worker, read from shared memory.
+
+        Returns:
+            dict: commands, vends and revenue_cents, plus the number of vend requests of each VendReason.
+
+        """
+        worker_totals = self._totals.buf.cast('q')
+        summed = [sum(worker_totals[column::_TOTALS]) for column in range(_TOTALS)]
+        worker_totals.release()
+
+        return {
+            'commands': summed[0],
+            'vends': summed[1],
+            'revenue_cents': summed[2],
+            'reasons': {reason: summed[3 + reason] for reason in VendReason},
+        }
+
+    def close(self):
+        """Stop the workers and free the shared memory."""
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+
+        for process, connection in zip(self._processes, self._connections):
+            process.join()
+            connection.close()
+
+        self._processes = []
+        self._connections = []
+
+        for shared_memory in (self._commands, self._results, self._totals):
+            if shared_memory.buf is not None:
+                shared_memory.close()
+                shared_memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    """PRIVATE METHODS"""
+
+    def _execute_chunk(self, columns, names, results):
+        count = len(columns[0])
+        batch_size = self.batch_size
+        workers = self.workers
+
+        # The rows of each worker follow each other in the row column, in their order within the batch. A single
+        # worker reads the whole batch, which needs no row column.
+        if workers == 1:
+            shard_sizes = [count]
+            shard_names = [names]
+        else:
+            worker_of = [machine_id % workers for machine_id in columns[1]]
+            columns = columns + [array('q', sorted(range(count), key=worker_of.__getitem__))]
+            shard_sizes = [worker_of.count(worker_index) for worker_index in range(workers)]
+            shard_names = [[] for _ in range(workers)]
+
+            add_rows = (row for row, op in enumerate(columns[0]) if op == ShardOp.ADD_ITEM) if names else ()
+            for row, name in zip(add_rows, names):
+                shard_names[worker_of[row]].append(name)
+
+        command_view = self._commands.buf.cast('q')
+        for column_index, column in enumerate(columns):
+            command_view[column_index * batch_size:column_index * batch_size + count] = column
+        command_view.release()
+
+        for connection, start, size, worker_names in zip(self._connections, accumulate([0] + shard_sizes),
+                                                          shard_sizes, shard_names):
+            connection.send((start, size, worker_names))
+
+        errors = [(worker_index, connection.recv()) for worker_index, connection in enumerate(self._connections)]
+        errors = [f'shard {worker_index}: {error}' for worker_index, error in errors if error is not None]
+        if errors:
+            raise RuntimeError(f'fleet shards failed, the commands of the other shards were applied: '
+                               f'{"; ".join(errors)}')
+
+        result_view = self._results.buf
+        for column_index, column in enumerate(results):
+            column.frombytes(result_view[8 * column_index * batch_size:8 * (column_index * batch_size + count)])
+
+
+class _NoAbstracts:
+    """Abstract provider of the worker machines, which never look up abstracts."""
+
+    def fetch(self, search_term):
+        return None
+
+
+"""PRIVATE FUNCTIONS"""
+
+
+def _run_worker(connection, commands_name, results_name, totals_name, worker_index, workers, machines, slots,
+                batch_size):
+    from multiprocessing.shared_memory import SharedMemory
+
+    # Workers are children of the fleet and share its resource tracker, so attaching does not take ownership.
+    shared_memories = [SharedMemory(name=name) for name in (commands_name, results_name, totals_name)]
+    command_view, result_view, totals_view = (shared_memory.buf.cast('q') for shared_memory in shared_memories)
+
+    provider = _NoAbstracts()
+    vending_machines = [
+        VendingMachine(slots=slots, abstract_provider=provider) for _ in range(worker_index, machines, workers)
+    ]
+    totals = totals_view[worker_index * _TOTALS:(worker_index + 1) * _TOTALS]
+
+    try:
+        while True:
+            message = connection.recv()
+            if message is None:
+                break
+
+            start, count, names = message
+
+            try:
+                _run_commands(vending_machines, command_view, result_view, totals, start, count, names, workers,
+                              batch_size)
+            except Exception as error:
+                connection.send(repr(error))
+            else:
+                connection.send(None)
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        for view in (totals, command_view, result_view, totals_view):
+            view.release()
+        for shared_memory in shared_memories:
+            shared_memory.close()
+
+
+def _run_commands(vending_machines, command_view, result_view, totals, start, count, names, workers, batch_size):
+    # Only the rows of this worker's commands are read, with the names of its ADD_ITEM commands, in order.
+    if workers == 1:
+        rows = range(count)
+        ops, machine_ids, slot_numbers, values, extras = (
+            command_view[column * batch_size:column * batch_size + count].tolist() for column in range(_COMMAND_COLUMNS)
+        )
+    else:
+        rows_offset = _COMMAND_COLUMNS * batch_size + start
+        rows = command_view[rows_offset:rows_offset + count].tolist()
+        ops, machine_ids, slot_numbers, values, extras = (
+            list(map(command_view[column * batch_size:(column + 1) * batch_size].__getitem__, rows))
+            for column in range(_COMMAND_COLUMNS)
+        )
+
+    add_op = ShardOp.ADD_ITEM
+    add_names = dict(zip((index for index in range(count) if ops[index] == add_op), names)) if names else {}
+
+    # Commands grouped per machine by a stable sort, so they keep their order and the vends of a machine run in
+    # batches.
+    machine_of = machine_ids.__getitem__
+
+    ok_offset, reason_offset, value_offset = 0, batch_size, 2 * batch_size
+    vend_op = ShardOp.VEND
+    commands = vends = revenue_cents = 0
+    reason_counts = [0] * len(VendReason)
+
+    for machine_id, machine_indexes in groupby(sorted(range(count), key=machine_of), key=machine_of):
+        vending_machine = vending_machines[machine_id // workers]
+        machine_indexes = list(machine_indexes)
+        vend_indexes = []
+        commands += len(machine_indexes)
+
+        for index in machine_indexes + [None]:
+            if index is not None and ops[index] == vend_op:
+                vend_indexes.append(index)
+                continue
+
+            if vend_indexes:
+                batch = vending_machine.vend_many(
+                    [(values[vend_index], slot_numbers[vend_index]) for vend_index in vend_indexes],
+                    abstracts=False,
+                    cents=True,
+                )
+                for vend_index, vended, reason, balance in zip(vend_indexes, batch.vended, batch.reasons,
+                                                               batch.balances):
+                    row = rows[vend_index]
+                    result_view[ok_offset + row] = vended
+                    result_view[reason_offset + row] = reason
+                    result_view[value_offset + row] = balance
+                    reason_counts[reason] += 1
+                vends += sum(batch.vended)
+                revenue_cents += batch.revenue_cents()
+                vend_indexes = []
+
+            if index is None:
+                break
+
+            op = ops[index]
+
+            if op == ShardOp.INSERT_MONEY:
+                succeeded, _ = vending_machine.insert_money(values[index], cents=True)
+                value = vending_machine.balance_cents
+            elif op == ShardOp.REMOVE_MONEY:
+                succeeded, _ = vending_machine.remove_money(values[index], cents=True)
+                value = vending_machine.balance_cents
+            elif op == ShardOp.INCREASE_STOCK:
+                succeeded, value = vending_machine.increase_stock(slot_numbers[index], values[index])
+            elif op == ShardOp.ADD_ITEM:
+                item = Item(add_names[index], 0, extras[index])
+                item.price_cents = values[index]
+                succeeded, value = vending_machine.add_item_to_slot(slot_numbers[index], item, replace=True), 0
+            else:
+                raise ValueError(f'unknown shard op {op}')
+
+            row = rows[index]
+            result_view[ok_offset + row] = succeeded
+            result_view[reason_offset + row] = 0
+            result_view[value_offset + row] = value
+
+    totals[0] += commands
+    totals[1] += vends
+    totals[2] += revenue_cents
+    for reason in VendReason:
+        totals[3 + reason] += reason_counts[reason]
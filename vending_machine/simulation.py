@@ -0,0 +1,213 @@
+import heapq
+import random
+
+from vending_machine.vending_machine import Item, VendingMachine
+
+# (name, price) of the items stocked by default, one per slot in turn.
+DEFAULT_MENU = [('Sparkling Water', 1.25), ('Soda', 0.75), ('Coffee', 1.75), ('Energy Drink', 1.50), ('Lemonade', 2.00)]
+
+# Customers pay with coins of this value, in cents, and take their change back.
+COIN_CENTS = 25
+
+# Event kinds, in the order events of the same time are handled.
+_CASH_PICKUP = 0
+_RESTOCK = 1
+_CUSTOMER = 2
+
+
+class SimulatedVendingMachine(VendingMachine):
+    """VendingMachine whose abstract lookups are stubbed out, since simulated customers never read them."""
+
+    __slots__ = ()
+
+    def _get_abstract(self, search_term):
+        return ''
+
+
+class MachineReport:
+    """Outcome of the simulation of one machine."""
+
+    __slots__ = ('revenue_cents', 'vends', 'lost_sales', 'stockout_hours', 'restocks', 'items_restocked',
+                 'cash_pickups', 'max_cash_cents')
+
+    def __init__(self):
+        self.revenue_cents = 0
+        self.vends = 0
+        # Customers whose chosen item was out of stock.
+        self.lost_sales = 0
+        # Slot hours spent out of stock, summed over the slots of the machine.
+        self.stockout_hours = 0.0
+        self.restocks = 0
+        self.items_restocked = 0
+        self.cash_pickups = 0
+        # Most cash held by the machine between two pickups.
+        self.max_cash_cents = 0
+
+
+class SimulationReport:
+    """Outcome of a simulation run, per machine and for the whole fleet."""
+
+    def __init__(self, machines, hours, events):
+        self.machines = machines
+        self.hours = hours
+        # Number of events handled by the scheduler.
+        self.events = events
+
+    @property
+    def revenue_cents(self):
+        return sum(machine.revenue_cents for machine in self.machines)
+
+    @property
+    def vends(self):
+        return sum(machine.vends for machine in self.machines)
+
+    @property
+    def lost_sales(self):
+        return sum(machine.lost_sales for machine in self.machines)
+
+    @property
+    def stockout_hours(self):
+        return sum(machine.stockout_hours for machine in self.machines)
+
+
+class FleetSimulation:
+    """Discrete-event simulation of a fleet of vending machines, their customers and their service routes.
+
+    Customers arrive at every machine as a Poisson process of arrival_rate customers per hour and choose a slot
+    following the popularity of the items at that machine. They insert coins until they can pay, vend through
+    select_and_vend and take their change back. Every restock_interval hours a route visit brings each slot back to
+    capacity with increase_stock, or add_item_to_slot for an emptied slot, and every cash_pickup_interval hours the
+    cash is collected. Visits to the machines are staggered over the interval.
+
+    Events are handled in time order from a heap. All randomness comes from a single generator seeded with seed, so a
+    simulation with the same parameters always gives the same report.
+    """
+
+    def __init__(self, machines=100, slots=9, menu=DEFAULT_MENU, capacity=10, arrival_rate=4.0,
+                 restock_interval=24.0, cash_pickup_interval=168.0, seed=0):
+        self.slots = slots
+        self.menu = menu
+        self.capacity = capacity
+        self.arrival_rate = arrival_rate
+        self.restock_interval = restock_interval
+        self.cash_pickup_interval = cash_pickup_interval
+        self.seed = seed
+
+        self.random = random.Random(seed)
+        self.vending_machines = [SimulatedVendingMachine(slots=slots) for _ in range(machines)]
+
+        # Cumulative popularity weights of the slots of each machine, for random.choices.
+        self._cumulative_weights = []
+
+        for vending_machine in self.vending_machines:
+            for slot_number in range(1, slots + 1):
+                vending_machine.add_item_to_slot(slot_number, self._new_item(slot_number))
+
+            weights = [self.random.paretovariate(1.5) for _ in range(slots)]
+            self._cumulative_weights.append([sum(weights[:n + 1]) for n in range(slots)])
+
+    def run(self, hours):
+        """Simulate the fleet for a number of hours.
+
+        Args:
+            hours (float)
+
+        Returns:
+            SimulationReport
+
+        """
+        reports = [MachineReport() for _ in self.vending_machines]
+        # Per machine and slot, the time the slot ran out of stock, or None while it is stocked.
+        empty_since = [[None] * (self.slots + 1) for _ in self.vending_machines]
+        cash = [0] * len(self.vending_machines)
+
+        events = []
+        sequence = 0
+
+        for machine_id in range(len(self.vending_machines)):
+            offset = (machine_id + 0.5) / len(self.vending_machines)
+            events.append((self.random.expovariate(self.arrival_rate), _CUSTOMER, sequence, machine_id))
+            events.append((offset * self.restock_interval, _RESTOCK, sequence + 1, machine_id))
+            events.append((offset * self.cash_pickup_interval, _CASH_PICKUP, sequence + 2, machine_id))
+            sequence += 3
+
+        heapq.heapify(events)
+
+        heappush, heappop = heapq.heappush, heapq.heappop
+        expovariate, choices = self.random.expovariate, self.random.choices
+        slot_numbers = range(1, self.slots + 1)
+        handled = 0
+
+        while events and events[0][0] < hours:
+            now, kind, _, machine_id = heappop(events)
+            vending_machine = self.vending_machines[machine_id]
+            report = reports[machine_id]
+            handled += 1
+
+            if kind == _CUSTOMER:
+                slot_number = choices(slot_numbers, cum_weights=self._cumulative_weights[machine_id])[0]
+                price_cents = vending_machine.slot_items[slot_number].price_cents
+                coins = -(-price_cents // COIN_CENTS)
+
+                vending_machine.insert_money(coins * COIN_CENTS / 100)
+                vended, _, _, _ = vending_machine.select_and_vend(slot_number)
+                vending_machine.remove_money(vending_machine.current_balance)
+
+                if vended:
+                    report.vends += 1
+                    report.revenue_cents += price_cents
+                    cash[machine_id] += price_cents
+
+                    if vending_machine.slot_items[slot_number].stock == 0:
+                        empty_since[machine_id][slot_number] = now
+                else:
+                    report.lost_sales += 1
+
+                next_event = (now + expovariate(self.arrival_rate), _CUSTOMER)
+            elif kind == _RESTOCK:
+                report.restocks += 1
+                report.items_restocked += self._restock(vending_machine)
+
+                for slot_number in slot_numbers:
+                    if empty_since[machine_id][slot_number] is not None:
+                        report.stockout_hours += now - empty_since[machine_id][slot_number]
+                        empty_since[machine_id][slot_number] = None
+
+                next_event = (now + self.restock_interval, _RESTOCK)
+            else:
+                report.cash_pickups += 1
+                report.max_cash_cents = max(report.max_cash_cents, cash[machine_id])
+                cash[machine_id] = 0
+
+                next_event = (now + self.cash_pickup_interval, _CASH_PICKUP)
+
+            heappush(events, (*next_event, sequence, machine_id))
+            sequence += 1
+
+        for machine_id, report in enumerate(reports):
+            report.max_cash_cents = max(report.max_cash_cents, cash[machine_id])
+
+            for since in empty_since[machine_id]:
+                if since is not None:
+                    report.stockout_hours += hours - since
+
+        return SimulationReport(reports, hours, handled)
+
+    """PRIVATE METHODS"""
+
+    def _new_item(self, slot_number):
+        name, price = self.menu[(slot_number - 1) % len(self.menu)]
+        return Item(name, price, self.capacity)
+
+    def _restock(self, vending_machine):
+        restocked = 0
+
+        for slot_number, slot_item in vending_machine.slot_items.items():
+            if slot_item is None:
+                vending_machine.add_item_to_slot(slot_number, self._new_item(slot_number))
+                restocked += self.capacity
+            elif slot_item.stock < self.capacity:
+                restocked += self.capacity - slot_item.stock
+                vending_machine.increase_stock(slot_number, self.capacity - slot_item.stock)
+
+        return restocked
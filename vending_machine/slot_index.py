@@ -0,0 +1,140 @@
+import heapq
+
+from vending_machine.sparse_slots import SparseSlots, occupied_items
+
+
+class SlotIndex:
+    """Incrementally maintained indexes over the slots of a vending machine.
+
+    Keeps the sets of empty and occupied slots, the slots holding each item name, and a heap of (stock, slot)
+    entries for low stock queries. The heap is invalidated lazily: every stock change pushes a new entry, and entries
+    that no longer match the slot are dropped when they surface or when the heap is compacted.
+
+    The empty slots of a SparseSlots mapping are not tracked, they are whatever slots are not occupied.
+    """
+
+    __slots__ = ('slot_items', 'empty', 'occupied', 'names', 'slots_by_name', '_stock_heap')
+
+    def __init__(self, slot_items):
+        self.slot_items = slot_items
+
+        self.empty = None if isinstance(slot_items, SparseSlots) else set()
+        self.occupied = set()
+        # Slot number -> name of the item indexed for it, to find the entry to drop when the item changes.
+        self.names = {}
+        self.slots_by_name = {}
+        self._stock_heap = []
+
+        for slot_number, slot_item in occupied_items(slot_items):
+            self._add(slot_number, slot_item)
+            self._stock_heap.append((slot_item.stock, slot_number))
+
+        if self.empty is not None:
+            self.empty.update(slot_number for slot_number in slot_items if slot_number not in self.occupied)
+
+        heapq.heapify(self._stock_heap)
+
+    def update(self, slot_number):
+        """Bring the indexes up to date with the current content of a slot.
+
+        Args:
+            slot_number (int)
+
+        """
+        slot_item = self.slot_items[slot_number]
+        indexed_name = self.names.get(slot_number)
+
+        if slot_item is None:
+            if indexed_name is not None:
+                self._remove_name(slot_number, indexed_name)
+                self.occupied.discard(slot_number)
+            if self.empty is not None:
+                self.empty.add(slot_number)
+            return
+
+        if indexed_name is None:
+            if self.empty is not None:
+                self.empty.discard(slot_number)
+            self._add(slot_number, slot_item)
+        elif indexed_name != slot_item.name:
+            self._remove_name(slot_number, indexed_name)
+            self._add(slot_number, slot_item)
+
+        self.stock_changed(slot_number, slot_item.stock)
+
+    def stock_changed(self, slot_number, stock):
+        """Record the new stock of an occupied slot whose item is otherwise unchanged.
+
+        Args:
+            slot_number (int)
+            stock (int)
+
+        """
+        heapq.heappush(self._stock_heap, (stock, slot_number))
+
+        # Stale entries pile up as stock changes, rebuild the heap once they outnumber the live ones.
+        if len(self._stock_heap) > 2 * len(self.occupied) + 64:
+            self._compact()
+
+    def empty_slots(self):
+        """Get a copy of the set of empty slots.
+
+        Returns:
+            set
+
+        """
+        if self.empty is not None:
+            return set(self.empty)
+
+        return set(range(1, len(self.slot_items) + 1)).difference(self.occupied)
+
+    def low_stock(self, threshold, limit=None):
+        """Find the occupied slots whose stock is at or below a threshold.
+
+        Args:
+            threshold (int)
+            limit (int): maximum number of slots to return, None for all of them.
+
+        Returns:
+            list: (slot number, stock) pairs, lowest stock first.
+
+        """
+        heap = self._stock_heap
+        slot_items = self.slot_items
+        found = []
+        seen = set()
+
+        while heap and heap[0][0] <= threshold and (limit is None or len(found) < limit):
+            stock, slot_number = heapq.heappop(heap)
+            slot_item = slot_items[slot_number]
+
+            if slot_item is None or slot_item.stock != stock or slot_number in seen:
+                continue
+
+            seen.add(slot_number)
+            found.append((slot_number, stock))
+
+        # The live entries are still needed by later queries.
+        for slot_number, stock in found:
+            heapq.heappush(heap, (stock, slot_number))
+
+        return found
+
+    """PRIVATE METHODS"""
+
+    def _add(self, slot_number, slot_item):
+        self.occupied.add(slot_number)
+        self.names[slot_number] = slot_item.name
+        self.slots_by_name.setdefault(slot_item.name, set()).add(slot_number)
+
+    def _remove_name(self, slot_number, name):
+        del self.names[slot_number]
+        slots = self.slots_by_name[name]
+        slots.discard(slot_number)
+
+        if not slots:
+            del self.slots_by_name[name]
+
+    def _compact(self):
+        self._stock_heap = [(self.slot_items[slot_number].stock, slot_number) for slot_number in self.occupied]
+        heapq.heapify(self._stock_heap)
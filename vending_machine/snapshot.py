@@ -0,0 +1,421 @@
+import mmap
+import os
+import struct
+from array import array
+
+from vending_machine.fleet import EMPTY_NAME_ID, StringTable, VendingFleet
+from vending_machine.sparse_slots import SparseSlots, occupied_items
+
+SNAPSHOT_MAGIC = b'VMS1'
+SNAPSHOT_VERSION = 1
+
+# magic, version, flags, machine_count, slots_per_machine, names_offset, names_size
+_HEADER = struct.Struct('<4sHHIIQQ')
+_HEADER_SIZE = 64
+_NAME_COUNT = struct.Struct('<I')
+_NAME_LENGTH = struct.Struct('<H')
+
+# Header flags: the snapshot was taken from a sparse machine, and an incremental checkpoint is being written.
+_SPARSE = 1
+_INCOMPLETE = 2
+
+# Column name, typecode and whether it has one entry per machine (True) or per slot (False), in file order.
+_COLUMNS = (
+    ('balances', 'q', True),
+    ('available_slots', 'q', True),
+    ('name_ids', 'i', False),
+    ('prices', 'q', False),
+    ('stock', 'q', False),
+)
+_TYPECODES = {column_name: typecode for column_name, typecode, per_machine in _COLUMNS}
+
+
+def save_fleet_snapshot(fleet, path):
+    """Write the full state of a fleet to a snapshot file.
+
+    The file holds a fixed-size header, every column as a contiguous native-endian array aligned to 8 bytes, so it
+    can be memory-mapped as is, and the interned item names at the end. The write goes to a temporary file first, so
+    a crash never leaves a torn snapshot.
+
+    Args:
+        fleet (VendingFleet)
+        path (str)
+
+    """
+    _save_fleet_snapshot(fleet, path, 0)
+
+
+def load_fleet_snapshot(path, abstract_cache=None, abstract_provider=None):
+    """Read a snapshot into a fleet backed by in-memory arrays.
+
+    Args:
+        path (str)
+        abstract_cache (AbstractCache)
+        abstract_provider (AbstractProvider)
+
+    Returns:
+        VendingFleet
+
+    """
+    with open(path, 'rb') as snapshot_file:
+        data = snapshot_file.read()
+
+    machine_count, slots, names_offset, names_size, flags = _read_header(data, path)
+    layout, _ = _layout(machine_count, slots)
+
+    columns = {}
+    for column_name, typecode, per_machine in _COLUMNS:
+        offset, length = layout[column_name]
+        column = array(typecode)
+        column.frombytes(data[offset:offset + length * column.itemsize])
+        columns[column_name] = column
+
+    return VendingFleet.from_columns(
+        slots, _decode_names(data[names_offset:names_offset + names_size]),
+        abstract_cache=abstract_cache, abstract_provider=abstract_provider, **columns
+    )
+
+
+class FleetSnapshot:
+    """A snapshot file memory-mapped as the live state of a fleet.
+
+    Opening maps the file instead of rebuilding any object, and every change made through the fleet lands directly in
+    the mapped pages. checkpoint() makes the changes durable: the kernel writes back only the dirty pages, and the
+    name table is rewritten only when new item names were interned. The kernel may also write pages back between
+    checkpoints, so the file is not crash-safe: after a crash it can hold part of the changes made since the last
+    checkpoint. Keep a copy made with save_fleet_snapshot() where that matters.
+    """
+
+    def __init__(self, path, abstract_cache=None, abstract_provider=None):
+        self.path = path
+
+        self._file = open(path, 'r+b')
+        header = self._file.read(_HEADER_SIZE)
+        machine_count, slots, names_offset, names_size, flags = _read_header(header, path)
+
+        self._file.seek(names_offset)
+        names = _decode_names(self._file.read(names_size))
+        self._names_offset = names_offset
+        self._names_written = len(names)
+        self._flags = flags
+
+        layout, _ = _layout(machine_count, slots)
+        self._mmap = mmap.mmap(self._file.fileno(), names_offset, access=mmap.ACCESS_WRITE)
+        self._views = []
+
+        columns = {}
+        for column_name, typecode, per_machine in _COLUMNS:
+            offset, length = layout[column_name]
+            view = memoryview(self._mmap)[offset:offset + length * array(typecode).itemsize].cast(typecode)
+            self._views.append(view)
+            columns[column_name] = view
+
+        self.fleet = VendingFleet.from_columns(
+            slots, names, abstract_cache=abstract_cache, abstract_provider=abstract_provider, **columns
+        )
+
+    def checkpoint(self):
+        """Make every change made through the fleet since the last checkpoint durable."""
+        if len(self.fleet.names) != self._names_written:
+            names = _encode_names(self.fleet.names)
+            self._file.seek(self._names_offset)
+            self._file.write(names)
+            self._file.truncate()
+            self._file.seek(0)
+            self._file.write(_header(
+                self.fleet.machine_count, self.fleet.slots_per_machine, self._names_offset, len(names), self._flags
+            ))
+            self._file.flush()
+            self._names_written = len(self.fleet.names)
+
+        self._mmap.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        """Checkpoint and unmap the file. The fleet must not be used afterwards."""
+        if self._mmap is None:
+            return
+
+        self.checkpoint()
+
+        for view in self._views:
+            view.release()
+
+        self._mmap.close()
+        self._file.close()
+        self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def open_fleet_snapshot(path, abstract_cache=None, abstract_provider=None):
+    """Memory-map a snapshot as the live state of a fleet.
+
+    Args:
+        path (str)
+        abstract_cache (AbstractCache)
+        abstract_provider (AbstractProvider)
+
+    Returns:
+        FleetSnapshot
+
+    """
+    return FleetSnapshot(path, abstract_cache=abstract_cache, abstract_provider=abstract_provider)
+
+
+def save_snapshot(vending_machine, path):
+    """Write the state of a single vending machine to a snapshot file.
+
+    Args:
+        vending_machine (VendingMachine)
+        path (str)
+
+    """
+    _save_fleet_snapshot(_fleet_of(vending_machine), path, _flags_of(vending_machine))
+
+
+def load_snapshot(path, **vending_machine_options):
+    """Rebuild a single vending machine from a snapshot file.
+
+    A snapshot taken from a sparse machine is rebuilt as a sparse machine, unless sparse is given.
+
+    Args:
+        path (str)
+        vending_machine_options: keyword arguments passed on to VendingMachine.
+
+    Returns:
+        VendingMachine
+
+    """
+    from vending_machine.vending_machine import Item, VendingMachine
+
+    with open(path, 'rb') as snapshot_file:
+        flags = _read_header(snapshot_file.read(_HEADER_SIZE), path)[4]
+
+    fleet = load_fleet_snapshot(path)
+
+    if fleet.machine_count != 1:
+        raise ValueError(f'{path} holds {fleet.machine_count} machines, use load_fleet_snapshot instead')
+
+    vending_machine_options.setdefault('sparse', bool(flags & _SPARSE))
+    vending_machine = VendingMachine(slots=fleet.slots_per_machine, **vending_machine_options)
+    vending_machine.balance_cents = fleet.balances[0]
+    vending_machine.available_slots = fleet.available_slots[0]
+
+    for slot_number in range(1, fleet.slots_per_machine + 1):
+        index = slot_number - 1
+        if fleet.name_ids[index] != EMPTY_NAME_ID:
+            item = Item(fleet.names[fleet.name_ids[index]], 0, fleet.stock[index])
+            item.price_cents = fleet.prices[index]
+            vending_machine.slot_items[slot_number] = item
+
+    return vending_machine
+
+
+class SnapshotWriter:
+    """Keeps a snapshot file of a single vending machine up to date with incremental checkpoints.
+
+    The first checkpoint writes the full snapshot. Later checkpoints compare the occupied slots with the state written
+    last time and write only the slots that changed, plus the balance and the name table when needed. They write in
+    place, so the header is marked incomplete until the checkpoint is synced: a snapshot torn by a crash in the middle
+    of a checkpoint is refused on load instead of read as a mix of old and new slots.
+    """
+
+    def __init__(self, vending_machine, path):
+        self.vending_machine = vending_machine
+        self.path = path
+
+        # Occupied slots as written by the last checkpoint, as (name, price_cents, stock) by slot number.
+        self._written_slots = None
+        self._names = None
+        self._names_size = None
+
+    def checkpoint(self):
+        """Write the changes made to the machine since the last checkpoint.
+
+        Returns:
+            int: number of slots written.
+
+        """
+        vending_machine = self.vending_machine
+
+        flags = _flags_of(vending_machine)
+
+        if self._written_slots is None or not os.path.exists(self.path):
+            fleet = _fleet_of(vending_machine)
+            _save_fleet_snapshot(fleet, self.path, flags)
+            self._written_slots = self._slot_states()
+            self._names = fleet.names
+            self._names_size = len(_encode_names(fleet.names))
+            return vending_machine.total_slots
+
+        layout, names_offset = _layout(1, vending_machine.total_slots)
+        names_count = len(self._names)
+        slot_states = self._slot_states()
+        # Slots emptied since the last checkpoint are written as empty.
+        dirty_slots = [
+            (slot_number, slot_state) for slot_number, slot_state in slot_states.items()
+            if self._written_slots.get(slot_number) != slot_state
+        ] + [(slot_number, (None, 0, 0)) for slot_number in self._written_slots.keys() - slot_states.keys()]
+        written = 0
+
+        with open(self.path, 'r+b') as snapshot_file:
+            snapshot_file.write(_header(1, vending_machine.total_slots, names_offset, self._names_size,
+                                        flags | _INCOMPLETE))
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+
+            for slot_number, slot_state in dirty_slots:
+                name, price_cents, stock = slot_state
+                name_id = EMPTY_NAME_ID if name is None else self._names.intern(name)
+                index = slot_number - 1
+
+                for column_name, value in (('name_ids', name_id), ('prices', price_cents), ('stock', stock)):
+                    column = array(_TYPECODES[column_name], [value])
+                    snapshot_file.seek(layout[column_name][0] + index * column.itemsize)
+                    snapshot_file.write(column.tobytes())
+
+                written += 1
+
+            for column_name, value in (('balances', vending_machine.balance_cents),
+                                       ('available_slots', vending_machine.available_slots)):
+                snapshot_file.seek(layout[column_name][0])
+                snapshot_file.write(array('q', [value]).tobytes())
+
+            if len(self._names) != names_count:
+                names = _encode_names(self._names)
+                snapshot_file.seek(names_offset)
+                snapshot_file.write(names)
+                snapshot_file.truncate()
+                self._names_size = len(names)
+
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+
+            snapshot_file.seek(0)
+            snapshot_file.write(_header(1, vending_machine.total_slots, names_offset, self._names_size, flags))
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+
+        self._written_slots = slot_states
+
+        return written
+
+    """PRIVATE METHODS"""
+
+    def _slot_states(self):
+        return {
+            slot_number: (slot_item.name, slot_item.price_cents, slot_item.stock)
+            for slot_number, slot_item in occupied_items(self.vending_machine.slot_items)
+        }
+
+
+"""PRIVATE FUNCTIONS"""
+
+
+def _save_fleet_snapshot(fleet, path, flags):
+    layout, names_offset = _layout(fleet.machine_count, fleet.slots_per_machine)
+    names = _encode_names(fleet.names)
+    temporary_path = f'{path}.tmp'
+
+    with open(temporary_path, 'wb') as snapshot_file:
+        snapshot_file.write(_header(fleet.machine_count, fleet.slots_per_machine, names_offset, len(names), flags))
+
+        for column_name, typecode, per_machine in _COLUMNS:
+            offset, length = layout[column_name]
+            snapshot_file.seek(offset)
+            snapshot_file.write(_column_bytes(getattr(fleet, column_name), typecode))
+
+        snapshot_file.seek(names_offset)
+        snapshot_file.write(names)
+
+    os.replace(temporary_path, path)
+
+
+def _align(size):
+    return (size + 7) & ~7
+
+
+def _layout(machine_count, slots):
+    layout = {}
+    offset = _HEADER_SIZE
+
+    for column_name, typecode, per_machine in _COLUMNS:
+        length = machine_count if per_machine else machine_count * slots
+        layout[column_name] = (offset, length)
+        offset += _align(length * array(typecode).itemsize)
+
+    return layout, offset
+
+
+def _header(machine_count, slots, names_offset, names_size, flags=0):
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags, machine_count, slots, names_offset, names_size)
+    return header.ljust(_HEADER_SIZE, b'\0')
+
+
+def _read_header(data, path):
+    if len(data) < _HEADER.size:
+        raise ValueError(f'{path} is not a vending machine snapshot')
+
+    magic, version, flags, machine_count, slots, names_offset, names_size = _HEADER.unpack_from(data)
+
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError(f'{path} is not a vending machine snapshot')
+
+    if flags & _INCOMPLETE:
+        raise ValueError(f'{path} is a torn snapshot, written by an interrupted checkpoint')
+
+    return machine_count, slots, names_offset, names_size, flags
+
+
+def _column_bytes(column, typecode):
+    if isinstance(column, array) and column.typecode != typecode:
+        column = array(typecode, column)
+
+    return column.tobytes()
+
+
+def _encode_names(names):
+    encoded = bytearray(_NAME_COUNT.pack(len(names)))
+
+    for name in names:
+        name_bytes = name.encode('utf-8')
+        encoded += _NAME_LENGTH.pack(len(name_bytes))
+        encoded += name_bytes
+
+    return bytes(encoded)
+
+
+def _decode_names(data):
+    names = StringTable()
+    count, = _NAME_COUNT.unpack_from(data)
+    offset = _NAME_COUNT.size
+
+    for _ in range(count):
+        length, = _NAME_LENGTH.unpack_from(data, offset)
+        offset += _NAME_LENGTH.size
+        names.intern(data[offset:offset + length].decode('utf-8'))
+        offset += length
+
+    return names
+
+
+def _flags_of(vending_machine):
+    return _SPARSE if isinstance(vending_machine.slot_items, SparseSlots) else 0
+
+
+def _fleet_of(vending_machine):
+    fleet = VendingFleet(1, slots=vending_machine.total_slots, abstract_provider=vending_machine.abstract_provider)
+    fleet_machine = fleet.machine(0)
+
+    for slot_number, slot_item in occupied_items(vending_machine.slot_items):
+        fleet_machine.slot_items[slot_number] = slot_item
+
+    fleet.balances[0] = vending_machine.balance_cents
+    fleet.available_slots[0] = vending_machine.available_slots
+
+    return fleet
@@ -0,0 +1,68 @@
+from collections.abc import MutableMapping
+
+
+class SparseSlots(MutableMapping):
+    """slot_items mapping of a large machine that only stores its occupied slots.
+
+    It behaves like the dict of a regular machine: every slot number from 1 to total_slots is a key, reading an empty
+    slot gives None and assigning None empties the slot. Iterating still goes over every slot number, use
+    occupied_items() to only visit the occupied ones.
+    """
+
+    __slots__ = ('total_slots', '_items')
+
+    def __init__(self, total_slots):
+        self.total_slots = total_slots
+        self._items = {}
+
+    def occupied_items(self):
+        """Get the occupied slots and their items, in slot order.
+
+        Returns:
+            list: (slot number, item) pairs.
+
+        """
+        return sorted(self._items.items())
+
+    def __getitem__(self, slot):
+        if not 0 < slot <= self.total_slots:
+            raise KeyError(slot)
+
+        return self._items.get(slot)
+
+    def __setitem__(self, slot, item):
+        if not 0 < slot <= self.total_slots:
+            raise KeyError(slot)
+
+        if item is None:
+            self._items.pop(slot, None)
+        else:
+            self._items[slot] = item
+
+    def __delitem__(self, slot):
+        raise TypeError('slots cannot be deleted, assign None to empty them')
+
+    def __contains__(self, slot):
+        return type(slot) is int and 0 < slot <= self.total_slots
+
+    def __iter__(self):
+        return iter(range(1, self.total_slots + 1))
+
+    def __len__(self):
+        return self.total_slots
+
+
+def occupied_items(slot_items):
+    """Get the occupied slots of a slot_items mapping and their items, in slot order.
+
+    Args:
+        slot_items (dict/SparseSlots)
+
+    Returns:
+        iterable: (slot number, item) pairs.
+
+    """
+    if isinstance(slot_items, SparseSlots):
+        return slot_items.occupied_items()
+
+    return ((slot_number, slot_item) for slot_number, slot_item in slot_items.items() if slot_item is not None)
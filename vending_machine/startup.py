@@ -0,0 +1,103 @@
+import os
+import sys
+import threading
+
+from vending_machine.abstract_provider import get_default_provider
+from vending_machine.sparse_slots import occupied_items
+
+# Budget for the cumulative import time of main.py in a fresh interpreter, in microseconds.
+COLD_START_BUDGET_US = 50000
+
+_IMPORT_TIME_LINE = r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$'
+
+
+def warmup(vending_machine=None, provider=None):
+    """Pay the one-off startup costs ahead of the first customer vend.
+
+    Imports requests, sets up the provider connection pool and, if a vending machine is given, resolves the abstracts
+    of the items in its slots so that they are cached before anyone selects them.
+
+    Args:
+        vending_machine (VendingMachine): optional machine whose slot items should be looked up.
+        provider (AbstractProvider): provider to warm up, defaults to the machine's provider or the shared one.
+
+    """
+    if provider is None:
+        provider = vending_machine.abstract_provider if vending_machine is not None else get_default_provider()
+
+    provider.warmup()
+
+    if vending_machine is None or vending_machine.abstract_cache is None:
+        return
+
+    prefetcher = vending_machine.abstract_prefetcher
+
+    for _, slot_item in list(occupied_items(vending_machine.slot_items)):
+        if slot_item.name in vending_machine.abstract_cache:
+            continue
+
+        if prefetcher is not None:
+            # Joins the lookup the machine scheduled when the item was added, instead of fetching it a second time.
+            prefetcher.submit(slot_item.name, vending_machine._get_abstract).result()
+        else:
+            vending_machine._get_abstract(slot_item.name)
+
+
+def warmup_in_background(vending_machine=None, provider=None):
+    """Run warmup on a daemon thread so a front end can call it while it waits for input.
+
+    Args:
+        vending_machine (VendingMachine)
+        provider (AbstractProvider)
+
+    Returns:
+        Thread: the started warmup thread.
+
+    """
+    thread = threading.Thread(
+        target=warmup, args=(vending_machine, provider), name='vending-machine-warmup', daemon=True
+    )
+    thread.start()
+
+    return thread
+
+
+def measure_import_time(module='main', runs=5, cwd=None):
+    """Measure the cold import time of a module with python -X importtime.
+
+    Every run uses a fresh interpreter, so the figures include everything the module imports transitively.
+
+    Args:
+        module (str)
+        runs (int)
+        cwd (str): directory to run the interpreter in, defaults to the repository root.
+
+    Returns:
+        int: median cumulative import time of the module, in microseconds.
+        dict: median cumulative import time of each package module, in microseconds.
+
+    """
+    # Imported on use, main.py imports this module on every start.
+    import re
+    import statistics
+    import subprocess
+
+    if cwd is None:
+        cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    module_times = {}
+
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=cwd, capture_output=True, text=True, check=True,
+        )
+
+        for line in completed.stderr.splitlines():
+            match = re.match(_IMPORT_TIME_LINE, line)
+            if match and (match.group(4) == module or match.group(4).startswith('vending_machine')):
+                module_times.setdefault(match.group(4), []).append(int(match.group(2)))
+
+    medians = {name: int(statistics.median(times)) for name, times in module_times.items()}
+
+    return medians.get(module, 0), medians
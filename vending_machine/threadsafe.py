@@ -0,0 +1,146 @@
+import threading
+
+from vending_machine.vending_machine import VendingMachine
+
+
+class ThreadSafeVendingMachine(VendingMachine):
+    """VendingMachine that can be driven by several payment and maintenance threads at once.
+
+    Every slot has its own lock, so vends and maintenance on different slots do not wait for each other. The balance,
+    the free slot counter and the slot index are each guarded by a lock of their own that is only ever held briefly.
+
+    To stay deadlock-free, locks are always taken in the same order: slot locks in ascending slot order first, then
+    the balance lock, then the free slot or slot index lock. Nothing is acquired while holding one of the latter two.
+    """
+
+    __slots__ = ('_slot_locks', '_balance_lock', '_available_slots_lock', '_index_lock')
+
+    def __init__(self, slots=9, **vending_machine_options):
+        super().__init__(slots=slots, **vending_machine_options)
+
+        # Index 0 is unused so that slot numbers index the list directly.
+        self._slot_locks = [threading.Lock() for _ in range(slots + 1)]
+        self._balance_lock = threading.Lock()
+        self._available_slots_lock = threading.Lock()
+        self._index_lock = threading.Lock()
+
+    def add_item_to_slot(self, target_slot, item, replace=False):
+        if not self._is_valid_slot(target_slot):
+            return False
+
+        with self._slot_locks[target_slot]:
+            return super().add_item_to_slot(target_slot, item, replace=replace)
+
+    def move_item_to_slot(self, source_slot, target_slot, replace=False):
+        if not (self._is_valid_slot(source_slot) and self._is_valid_slot(target_slot)):
+            return False
+
+        first_lock, second_lock = (self._slot_locks[slot] for slot in sorted((source_slot, target_slot)))
+
+        with first_lock:
+            if first_lock is second_lock:
+                return super().move_item_to_slot(source_slot, target_slot, replace=replace)
+
+            with second_lock:
+                return super().move_item_to_slot(source_slot, target_slot, replace=replace)
+
+    def remove_item_from_slot(self, target_slot):
+        if not self._is_valid_slot(target_slot):
+            return False
+
+        with self._slot_locks[target_slot]:
+            return super().remove_item_from_slot(target_slot)
+
+    def replace_item_in_slot(self, target_slot, item):
+        if not self._is_valid_slot(target_slot):
+            return False
+
+        with self._slot_locks[target_slot]:
+            return super().replace_item_in_slot(target_slot, item)
+
+    def change_name(self, target_slot, new_name):
+        if not self._is_valid_slot(target_slot):
+            return False
+
+        with self._slot_locks[target_slot]:
+            return super().change_name(target_slot, new_name)
+
+    def change_price(self, target_slot, new_price):
+        if not self._is_valid_slot(target_slot):
+            return False
+
+        with self._slot_locks[target_slot]:
+            return super().change_price(target_slot, new_price)
+
+    def increase_stock(self, target_slot, n=1):
+        if not self._is_valid_slot(target_slot):
+            return False, 0
+
+        with self._slot_locks[target_slot]:
+            return super().increase_stock(target_slot, n)
+
+    def decrease_stock(self, target_slot, n=1):
+        if not self._is_valid_slot(target_slot):
+            return False, 0
+
+        with self._slot_locks[target_slot]:
+            return super().decrease_stock(target_slot, n)
+
+    def empty_slots(self):
+        with self._index_lock:
+            return super().empty_slots()
+
+    def occupied_slots(self):
+        with self._index_lock:
+            return super().occupied_slots()
+
+    def find_slots(self, name):
+        with self._index_lock:
+            return super().find_slots(name)
+
+    def low_stock_slots(self, threshold=0, limit=None):
+        with self._index_lock:
+            return super().low_stock_slots(threshold, limit)
+
+    def insert_money(self, amount, cents=False):
+        with self._balance_lock:
+            return super().insert_money(amount, cents)
+
+    def remove_money(self, amount, cents=False):
+        with self._balance_lock:
+            return super().remove_money(amount, cents)
+
+    """PRIVATE METHODS"""
+
+    def _adjust_available_slots(self, delta):
+        with self._available_slots_lock:
+            super()._adjust_available_slots(delta)
+
+    def _slot_changed(self, slot_number):
+        with self._index_lock:
+            super()._slot_changed(slot_number)
+
+    def _stock_changed(self, slot_number, stock):
+        with self._index_lock:
+            super()._stock_changed(slot_number, stock)
+
+    def _vend_batch(self, requests, cents=False):
+        # A batch may touch any slot, so it holds every slot lock, in ascending order, while it is applied. The
+        # abstracts are looked up by vend_many after the locks are released.
+        for slot_lock in self._slot_locks:
+            slot_lock.acquire()
+
+        try:
+            with self._balance_lock, self._index_lock:
+                return super()._vend_batch(requests, cents)
+        finally:
+            for slot_lock in reversed(self._slot_locks):
+                slot_lock.release()
+
+    def _vend(self, slot_number):
+        if not self._is_valid_slot(slot_number):
+            return super()._vend(slot_number)
+
+        with self._slot_locks[slot_number]:
+            with self._balance_lock:
+                return super()._vend(slot_number)
@@ -1,19 +1,139 @@
+from array import array
+from enum import IntEnum
+
+from vending_machine.abstract_cache import AbstractCache
+from vending_machine.abstract_prefetcher import AbstractPrefetcher, completed_future
+from vending_machine.abstract_provider import get_default_provider
+from vending_machine.console import Console
+from vending_machine.events import (
+    ItemAdded, ItemMoved, ItemRemoved, ItemReplaced, ItemVended, MoneyInserted, MoneyRemoved, NameChanged,
+    PriceChanged, StockDecreased, StockIncreased, VendFailed,
+)
+from vending_machine.journal import JournalOp
+from vending_machine.money import format_money, from_cents, parse_money, to_cents
+from vending_machine.rendering import MAINTENANCE_SCREEN, WELCOME_SCREEN, MenuRenderer
+from vending_machine.slot_index import SlotIndex
+from vending_machine.sparse_slots import SparseSlots
+
+
 class Item:
 
+    __slots__ = ('name', 'price_cents', 'stock')
+
     def __init__(self, name, price, stock):
         self.name = name
-        self.price = price
+        self.price_cents = to_cents(price)
         self.stock = stock
+
+    @property
+    def price(self):
+        return from_cents(self.price_cents)
+
+    @price.setter
+    def price(self, price):
+        self.price_cents = to_cents(price)
         
 
+class VendReason(IntEnum):
+    VENDED = 0
+    INVALID_SLOT = 1
+    EMPTY_SLOT = 2
+    INSUFFICIENT_BALANCE = 3
+    OUT_OF_STOCK = 4
+
+
+VEND_REASON_MESSAGES = {
+    VendReason.INVALID_SLOT: 'Invalid Slot',
+    VendReason.EMPTY_SLOT: 'Empty Slot',
+    VendReason.INSUFFICIENT_BALANCE: 'Insufficient Balance',
+    VendReason.OUT_OF_STOCK: 'Out of Stock',
+}
+
+
+class VendBatchResult:
+    """Columnar outcome of VendingMachine.vend_many, one row per vend request."""
+
+    __slots__ = ('vended', 'reasons', 'balances', 'sales', 'abstracts')
+
+    def __init__(self, vended, reasons, balances, sales, abstracts):
+        # array('b') of 0/1 flags indicating whether or not each request vended.
+        self.vended = vended
+        # array('B') of VendReason codes.
+        self.reasons = reasons
+        # array('q') of the total balance after each request, in cents.
+        self.balances = balances
+        # array('q') of the price charged by each request, in cents, 0 when nothing was vended.
+        self.sales = sales
+        # Abstract of every distinct item name selected in the batch.
+        self.abstracts = abstracts
+
+    def revenue_cents(self):
+        """Total price of the items vended by the batch.
+
+        Returns:
+            int: the revenue in cents.
+
+        """
+        return sum(self.sales)
+
+    def reason_counts(self):
+        """Count the requests of each outcome.
+
+        Returns:
+            dict: number of requests keyed by VendReason.
+
+        """
+        return {reason: self.reasons.count(reason) for reason in VendReason if reason in self.reasons}
+
+    def __len__(self):
+        return len(self.reasons)
+
+    def __getitem__(self, index):
+        return bool(self.vended[index]), VendReason(self.reasons[index]), from_cents(self.balances[index])
+
+
 class VendingMachine:
-    
-    def __init__(self, slots=9):
+
+    __slots__ = (
+        'available_slots', 'total_slots', 'slot_items', 'balance_cents',
+        'abstract_cache', 'abstract_prefetcher', 'abstract_provider', 'journal', 'events', '_slot_index',
+    )
+
+    def __init__(self, slots=9, abstract_cache=None, abstract_prefetcher=None, abstract_provider=None, journal=None,
+                 sparse=False, events=None):
         self.available_slots = slots
         self.total_slots = slots
-        self.slot_items = {i: None for i in range(1, slots+1)}
 
-        self.current_balance = 0
+        # Sparse machines only store their occupied slots, for very large slot counts.
+        self.slot_items = SparseSlots(slots) if sparse else {i: None for i in range(1, slots+1)}
+
+        self.balance_cents = 0
+
+        # Optional AbstractCache shared between machines to avoid a lookup per vend.
+        self.abstract_cache = abstract_cache
+
+        # Optional AbstractPrefetcher resolving abstracts off the vend path.
+        self.abstract_prefetcher = abstract_prefetcher
+
+        # AbstractProvider owning the pooled HTTP session, shared by default between machines.
+        self.abstract_provider = abstract_provider if abstract_provider is not None else get_default_provider()
+
+        # Optional Journal recording every state-changing call.
+        self.journal = journal
+
+        # Optional EventBus notified of every state change.
+        self.events = events
+
+        # SlotIndex built on the first slot query and kept current by the mutators from then on.
+        self._slot_index = None
+
+    @property
+    def current_balance(self):
+        return from_cents(self.balance_cents)
+
+    @current_balance.setter
+    def current_balance(self, current_balance):
+        self.balance_cents = to_cents(current_balance)
 
     def add_item_to_slot(self, target_slot, item, replace=False):
         """Add to the specified slot in the vending machine.
@@ -36,7 +156,7 @@ class VendingMachine:
 
         if current_slot_item is not None:
             if current_slot_item.name == item.name:
-                self.slot_items[target_slot].price = item.price
+                self.slot_items[target_slot].price_cents = item.price_cents
                 self.slot_items[target_slot].stock += item.stock
                 added = True
             elif replace:
@@ -44,9 +164,20 @@ class VendingMachine:
                 added = True
         else:
             self.slot_items[target_slot] = item
-            self.available_slots -= 1
+            self._adjust_available_slots(-1)
             added = True
 
+        if added:
+            self._slot_changed(target_slot)
+
+            if self.journal is not None:
+                self.journal.record(JournalOp.ADD_ITEM, target_slot, replace, item.price_cents, item.stock, item.name)
+
+            if self.events is not None:
+                self.events.emit(ItemAdded, target_slot, replace, item.name, item.price_cents, item.stock)
+
+            self._prefetch_abstract(item.name)
+
         return added
 
     def move_item_to_slot(self, source_slot, target_slot, replace=False):
@@ -67,11 +198,24 @@ class VendingMachine:
                 and self.slot_items[source_slot] is not None:
 
             if self.slot_items[target_slot] is None or replace:
+                if self.slot_items[target_slot] is not None and source_slot != target_slot:
+                    # The replaced item leaves the machine.
+                    self._adjust_available_slots(1)
+
                 item = self.slot_items[source_slot]
                 self.slot_items[source_slot] = None
                 self.slot_items[target_slot] = item
                 moved = True
 
+                self._slot_changed(source_slot)
+                self._slot_changed(target_slot)
+
+                if self.journal is not None:
+                    self.journal.record(JournalOp.MOVE_ITEM, source_slot, target_slot, replace)
+
+                if self.events is not None:
+                    self.events.emit(ItemMoved, source_slot, target_slot, replace)
+
         return moved
 
     def remove_item_from_slot(self, target_slot):
@@ -93,9 +237,17 @@ class VendingMachine:
 
         if current_slot_item is not None:
             self.slot_items[target_slot] = None
-            self.available_slots += 1
+            self._adjust_available_slots(1)
             removed = True
 
+            self._slot_changed(target_slot)
+
+            if self.journal is not None:
+                self.journal.record(JournalOp.REMOVE_ITEM, target_slot)
+
+            if self.events is not None:
+                self.events.emit(ItemRemoved, target_slot)
+
         return removed
 
     def replace_item_in_slot(self, target_slot, item):
@@ -113,11 +265,21 @@ class VendingMachine:
 
         if self._is_valid_slot(target_slot):
             if self.slot_items[target_slot] is None:
-                self.available_slots -= 1
+                self._adjust_available_slots(-1)
 
             self.slot_items[target_slot] = item
             replaced = True
 
+            self._slot_changed(target_slot)
+
+            if self.journal is not None:
+                self.journal.record(JournalOp.REPLACE_ITEM, target_slot, item.price_cents, item.stock, item.name)
+
+            if self.events is not None:
+                self.events.emit(ItemReplaced, target_slot, item.name, item.price_cents, item.stock)
+
+            self._prefetch_abstract(item.name)
+
         return replaced
 
     def change_name(self, target_slot, new_name):
@@ -137,6 +299,14 @@ class VendingMachine:
             self.slot_items[target_slot].name = new_name
             changed = True
 
+            self._slot_changed(target_slot)
+
+            if self.journal is not None:
+                self.journal.record(JournalOp.CHANGE_NAME, target_slot, new_name)
+
+            if self.events is not None:
+                self.events.emit(NameChanged, target_slot, new_name)
+
         return changed
     
     def change_price(self, target_slot, new_price):
@@ -144,7 +314,7 @@ class VendingMachine:
 
         Args:
             target_slot (int)
-            new_price (int/float)
+            new_price (int/float/Decimal)
 
         Returns:
             bool: flag indicating whether or not the price of the item was changed.
@@ -153,9 +323,15 @@ class VendingMachine:
         changed = False
 
         if self._is_valid_slot(target_slot) and self.slot_items[target_slot] is not None:
-            self.slot_items[target_slot].price = new_price
+            self.slot_items[target_slot].price_cents = to_cents(new_price)
             changed = True
 
+            if self.journal is not None:
+                self.journal.record(JournalOp.CHANGE_PRICE, target_slot, self.slot_items[target_slot].price_cents)
+
+            if self.events is not None:
+                self.events.emit(PriceChanged, target_slot, self.slot_items[target_slot].price_cents)
+
         return changed
     
     def increase_stock(self, target_slot, n=1):
@@ -179,6 +355,14 @@ class VendingMachine:
             self.slot_items[target_slot].stock = new_stock
             increased = True
 
+            self._stock_changed(target_slot, new_stock)
+
+            if self.journal is not None:
+                self.journal.record(JournalOp.INCREASE_STOCK, target_slot, n)
+
+            if self.events is not None:
+                self.events.emit(StockIncreased, target_slot, n, new_stock)
+
         return increased, new_stock
 
     def decrease_stock(self, target_slot, n=1):
@@ -208,43 +392,70 @@ class VendingMachine:
 
             decreased = True
 
+            self._stock_changed(target_slot, new_stock)
+
+            if self.journal is not None:
+                self.journal.record(JournalOp.DECREASE_STOCK, target_slot, n)
+
+            if self.events is not None:
+                self.events.emit(StockDecreased, target_slot, n, new_stock)
+
         return decreased, new_stock
     
-    def insert_money(self, amount):
+    def insert_money(self, amount, cents=False):
         """Insert money into the vending machine.
 
         Args:
-            amount (int/float)
+            amount (int/float/Decimal)
+            cents (bool): whether or not the amount is already integer cents, which skips its conversion.
 
         Returns:
             bool: flag indicating whether or not the amount was inserted.
             float: the current total balance after the transaction.
 
         """
-        if amount > 0:
-            self.current_balance += amount
+        amount_cents = amount if cents else to_cents(amount)
+
+        if amount_cents > 0:
+            self.balance_cents += amount_cents
+
+            if self.journal is not None:
+                self.journal.record(JournalOp.INSERT_MONEY, amount_cents)
+
+            if self.events is not None:
+                self.events.emit(MoneyInserted, amount_cents, self.balance_cents)
+
             return True, self.current_balance
         else:
             return False, self.current_balance
 
-    def remove_money(self, amount):
+    def remove_money(self, amount, cents=False):
         """Remove money from the vending machine.
 
         If the amount to remove is higher than the total balance, remove the entire total balance.
 
         Args:
-            amount (int/float)
+            amount (int/float/Decimal)
+            cents (bool): whether or not the amount is already integer cents, which skips its conversion.
 
         Returns:
             bool: flag indicating whether or not the amount was removed.
             float: the current total balance after the transaction.
 
         """
-        if amount > 0 and self.current_balance > 0:
-            if amount > self.current_balance:
-                self.current_balance = 0
+        amount_cents = amount if cents else to_cents(amount)
+
+        if amount_cents > 0 and self.balance_cents > 0:
+            if amount_cents > self.balance_cents:
+                self.balance_cents = 0
             else:
-                self.current_balance -= amount
+                self.balance_cents -= amount_cents
+
+            if self.journal is not None:
+                self.journal.record(JournalOp.REMOVE_MONEY, amount_cents)
+
+            if self.events is not None:
+                self.events.emit(MoneyRemoved, amount_cents, self.balance_cents)
 
             return True, self.current_balance
         else:
@@ -265,63 +476,322 @@ class VendingMachine:
             float: the remaining total balance.
 
         """
-        vended, item_summary, vend_result = False, '', ''
+        vend_reason, current_slot_item = self._vend(slot_number)
+        vended, vend_result = self._describe_vend(vend_reason, current_slot_item)
 
-        if not self._is_valid_slot(slot_number):
-            return vended, item_summary, 'Invalid Slot', self.current_balance
+        item_summary = ''
+        if current_slot_item is not None:
+            pending_abstract = None
+            if self.abstract_prefetcher is not None:
+                pending_abstract = self.abstract_prefetcher.pending(current_slot_item.name)
+
+            if pending_abstract is not None:
+                item_summary = pending_abstract.result()
+            else:
+                item_summary = self._get_abstract(current_slot_item.name)
+
+        return vended, item_summary, vend_result, self.current_balance
 
-        current_slot_item = self.slot_items[slot_number]
+    def select_and_vend_deferred(self, slot_number, on_summary=None):
+        """Vends the item at the slot number without waiting for the item summary.
+
+        The vend decision and the balance/stock changes happen immediately. The item summary is resolved on the
+        abstract prefetcher, or synchronously if the machine has none.
+
+        Args:
+            slot_number (int)
+            on_summary (callable): optional callback receiving the item summary once it is resolved.
+
+        Returns:
+            bool: flag indicating whether or not the item was vended.
+            Future: resolves to the summary of the item vended.
+            str: reason explaining the vend success or failure.
+            float: the remaining total balance.
+
+        """
+        vend_reason, current_slot_item = self._vend(slot_number)
+        vended, vend_result = self._describe_vend(vend_reason, current_slot_item)
 
         if current_slot_item is None:
-            return vended, item_summary, 'Empty Slot', self.current_balance
+            item_summary = completed_future('')
+        elif self.abstract_prefetcher is not None:
+            item_summary = self.abstract_prefetcher.submit(current_slot_item.name, self._get_abstract)
         else:
-            item_summary = self._get_abstract(current_slot_item.name)
+            item_summary = completed_future(self._get_abstract(current_slot_item.name))
 
-            if self.current_balance < current_slot_item.price:
-                return vended, item_summary, 'Insufficient Balance', self.current_balance
-            elif current_slot_item.stock <= 0:
-                return vended, item_summary, 'Out of Stock', self.current_balance
-            else:
-                self.current_balance -= current_slot_item.price
-                current_slot_item.stock -= 1
+        if on_summary is not None:
+            item_summary.add_done_callback(lambda future: on_summary(future.result()))
 
-                vend_result = f'Vended: {current_slot_item.name}'
+        return vended, item_summary, vend_result, self.current_balance
 
-                vended = True
+    def vend_many(self, requests, abstracts=True, cents=False):
+        """Apply a sequence of insert money and vend operations in one call.
 
-        return vended, item_summary, vend_result, self.current_balance
+        Each request inserts its amount, following the rules of insert_money, then vends its slot, following the
+        rules of select_and_vend. Abstracts are looked up once per distinct item name after the whole batch is applied.
+
+        Args:
+            requests (iterable): (amount, slot_number) pairs, use an amount of 0 to vend without inserting money.
+            abstracts (bool): whether or not to look up the abstracts of the selected items.
+            cents (bool): whether or not the amounts are already integer cents, which skips their conversion.
+
+        Returns:
+            VendBatchResult: vended flags, VendReason codes, balances and sales of each request.
+
+        """
+        result, selected_names = self._vend_batch(requests, cents)
+
+        if abstracts:
+            result.abstracts = self._get_abstracts(selected_names)
+
+        return result
+
+    def empty_slots(self):
+        """Get the slots without an item.
+
+        The set is a copy, built in time proportional to the number of slots. To test a single slot, check
+        slot_items[slot_number] is None instead.
+
+        Returns:
+            set: the empty slot numbers.
+
+        """
+        return self._index().empty_slots()
+
+    def occupied_slots(self):
+        """Get the slots holding an item.
+
+        Returns:
+            set: the occupied slot numbers.
+
+        """
+        return set(self._index().occupied)
+
+    def find_slots(self, name):
+        """Find the slots holding an item.
+
+        Args:
+            name (str): the exact name of the item.
+
+        Returns:
+            set: the slot numbers holding the item, empty if there are none.
+
+        """
+        return set(self._index().slots_by_name.get(name, ()))
+
+    def low_stock_slots(self, threshold=0, limit=None):
+        """Find the slots whose stock is running low.
+
+        Args:
+            threshold (int): highest stock considered low.
+            limit (int): maximum number of slots to return, None for all of them.
+
+        Returns:
+            list: (slot number, stock) pairs, lowest stock first.
+
+        """
+        return self._index().low_stock(threshold, limit)
 
     """PRIVATE METHODS"""
 
     def _is_valid_slot(self, slot):
         return 0 < slot <= self.total_slots
 
-    def _get_abstract(self, search_term):
-        import requests
+    def _vend_batch(self, requests, cents=False):
+        vended_column = array('b')
+        reason_column = array('B')
+        balance_column = array('q')
+        sale_column = array('q')
+
+        vended_append = vended_column.append
+        reason_append = reason_column.append
+        balance_append = balance_column.append
+        sale_append = sale_column.append
+
+        slot_items = self.slot_items
+        total_slots = self.total_slots
+        balance = self.balance_cents
+        journal = self.journal
+        events = self.events
+        slot_index = self._slot_index
+        selected_names = set()
+
+        # Plain ints compare faster than the enum members in the loop below.
+        vended_code = VendReason.VENDED.value
+        invalid_slot_code = VendReason.INVALID_SLOT.value
+        empty_slot_code = VendReason.EMPTY_SLOT.value
+        insufficient_balance_code = VendReason.INSUFFICIENT_BALANCE.value
+        out_of_stock_code = VendReason.OUT_OF_STOCK.value
+
+        for amount, slot_number in requests:
+            amount_cents = amount if cents else to_cents(amount)
+            sale = 0
+
+            if amount_cents > 0:
+                balance += amount_cents
+
+                if journal is not None:
+                    journal.record(JournalOp.INSERT_MONEY, amount_cents)
+
+                if events is not None:
+                    events.emit(MoneyInserted, amount_cents, balance)
+
+            if not 0 < slot_number <= total_slots:
+                reason = invalid_slot_code
+            else:
+                slot_item = slot_items[slot_number]
+
+                if slot_item is None:
+                    reason = empty_slot_code
+                else:
+                    selected_names.add(slot_item.name)
+
+                    if balance < slot_item.price_cents:
+                        reason = insufficient_balance_code
+                    elif slot_item.stock <= 0:
+                        reason = out_of_stock_code
+                    else:
+                        sale = slot_item.price_cents
+                        balance -= sale
+                        slot_item.stock -= 1
+                        reason = vended_code
+
+                        if slot_index is not None:
+                            slot_index.stock_changed(slot_number, slot_item.stock)
+
+                        if journal is not None:
+                            journal.record(JournalOp.VEND, slot_number)
+
+                        if events is not None:
+                            events.emit(ItemVended, slot_number, slot_item.name, sale, slot_item.stock, balance)
+
+            if events is not None and reason != vended_code:
+                events.emit(VendFailed, slot_number, VendReason(reason), balance)
+
+            vended_append(reason == vended_code)
+            reason_append(reason)
+            balance_append(balance)
+            sale_append(sale)
+
+        self.balance_cents = balance
+
+        return VendBatchResult(vended_column, reason_column, balance_column, sale_column, {}), selected_names
+
+    def _adjust_available_slots(self, delta):
+        self.available_slots += delta
+
+    def _index(self):
+        if self._slot_index is None:
+            self._slot_index = SlotIndex(self.slot_items)
+
+        return self._slot_index
 
-        request_params = {
-            'q': search_term.lower(),
-            'format': 'json',
-            'pretty': 1
+    def _slot_changed(self, slot_number):
+        if self._slot_index is not None:
+            self._slot_index.update(slot_number)
+
+    def _stock_changed(self, slot_number, stock):
+        if self._slot_index is not None:
+            self._slot_index.stock_changed(slot_number, stock)
+
+    def _vend(self, slot_number):
+        current_slot_item = None
+
+        if not self._is_valid_slot(slot_number):
+            vend_reason = VendReason.INVALID_SLOT
+        else:
+            current_slot_item = self.slot_items[slot_number]
+
+            if current_slot_item is None:
+                vend_reason = VendReason.EMPTY_SLOT
+            elif self.balance_cents < current_slot_item.price_cents:
+                vend_reason = VendReason.INSUFFICIENT_BALANCE
+            elif current_slot_item.stock <= 0:
+                vend_reason = VendReason.OUT_OF_STOCK
+            else:
+                vend_reason = VendReason.VENDED
+
+        if vend_reason != VendReason.VENDED:
+            if self.events is not None:
+                self.events.emit(VendFailed, slot_number, vend_reason, self.balance_cents)
+
+            return vend_reason, current_slot_item
+
+        self.balance_cents -= current_slot_item.price_cents
+        current_slot_item.stock -= 1
+
+        self._stock_changed(slot_number, current_slot_item.stock)
+
+        if self.journal is not None:
+            self.journal.record(JournalOp.VEND, slot_number)
+
+        if self.events is not None:
+            self.events.emit(ItemVended, slot_number, current_slot_item.name, current_slot_item.price_cents,
+                             current_slot_item.stock, self.balance_cents)
+
+        return VendReason.VENDED, current_slot_item
+
+    @staticmethod
+    def _describe_vend(vend_reason, slot_item):
+        if vend_reason == VendReason.VENDED:
+            return True, f'Vended: {slot_item.name}'
+
+        return False, VEND_REASON_MESSAGES[vend_reason]
+
+    def _get_abstracts(self, search_terms):
+        if self.abstract_prefetcher is None:
+            return {search_term: self._get_abstract(search_term) for search_term in search_terms}
+
+        futures = {
+            search_term: self.abstract_prefetcher.submit(search_term, self._get_abstract)
+            for search_term in search_terms
         }
 
-        search_url = 'https://api.duckduckgo.com'
+        return {search_term: future.result() for search_term, future in futures.items()}
 
-        abstract = ''
-        try:
-            response = requests.get(url=search_url, params=request_params).json()
-            abstract = response.get('AbstractText', '')
-        except requests.exceptions.RequestException as e:
-            print(f'Could not establish a connection to the DuckDuckGo API!\n{e}')
+    def _prefetch_abstract(self, search_term):
+        if self.abstract_prefetcher is not None and self.abstract_cache is not None \
+                and search_term not in self.abstract_cache:
+            self.abstract_prefetcher.submit(search_term, self._get_abstract)
+
+    def _get_abstract(self, search_term):
+        if self.abstract_cache is not None:
+            abstract = self.abstract_cache.get(search_term)
+            if abstract is not None:
+                return abstract
+
+        abstract = self._fetch_abstract(search_term)
+
+        if abstract is None:
+            return ''
+
+        if self.abstract_cache is not None:
+            self.abstract_cache.set(search_term, abstract)
 
         return abstract
 
+    def _fetch_abstract(self, search_term):
+        return self.abstract_provider.fetch(search_term)
+
 
 class VendingMachineInterface:
 
-    def __init__(self):
-        self.vending_machine = VendingMachine()
+    def __init__(self, vending_machine=None, console=None, abstract_provider=None):
         self.maintenance_mode = False
+        self.console = console if console is not None else Console()
+
+        if vending_machine is not None:
+            self.vending_machine = vending_machine
+            self.renderer = MenuRenderer(vending_machine)
+            return
+
+        # abstract_provider is only used by the machine created here, when none is given.
+        self.vending_machine = VendingMachine(
+            abstract_cache=AbstractCache(), abstract_prefetcher=AbstractPrefetcher(max_workers=2),
+            abstract_provider=abstract_provider,
+        )
+
+        self.renderer = MenuRenderer(self.vending_machine)
 
         # Initial items
         self.vending_machine.add_item_to_slot(1, Item('Sparkling Water', 1.25, 20))
@@ -330,39 +800,32 @@ class VendingMachineInterface:
         self.vending_machine.add_item_to_slot(9, Item('Energy Drink', 1.50, 20))
 
     def run(self):
-        print('=' * 21)
-        print('== ' + 'VENDING MACHINE' + ' ==')
-        print('=' * 21)
-        print()
+        if self.console.show_menus:
+            self.console.write_screen(WELCOME_SCREEN)
 
-        selected_option = self.customer_menu()
+        try:
+            selected_option = self.customer_menu()
 
-        while selected_option != 'q':
-            if self.maintenance_mode:
-                selected_option = self.maintenance_menu()
-            else:
-                selected_option = self.customer_menu()
+            while selected_option != 'q':
+                if self.maintenance_mode:
+                    selected_option = self.maintenance_menu()
+                else:
+                    selected_option = self.customer_menu()
+        except EOFError:
+            # The input ran out, e.g. at the end of a script, which ends the session like quitting does.
+            pass
 
     def customer_menu(self):
 
         selected_option = ''
 
         while selected_option != 'q':
-            selectable_slots = set()
-
-            print(f'Current balance: ${self.vending_machine.current_balance}\n')
-            print('==== SLOT ITEMS ====')
-            for slot_number, slot_item in self.vending_machine.slot_items.items():
-                if slot_item:
-                    print(f'[{slot_number}] {slot_item.name} - ${slot_item.price} (Remaining: {slot_item.stock})')
-                    selectable_slots.add(slot_number)
-            print()
-            print('(i) Insert Money')
-            print('(r) Remove Money')
-            print('(m) Maintenance Mode')
-            print('(q) Exit Vending Machine')
-
-            selected_option = input('\nPlease select an option: ').lower()
+            if self.console.show_menus:
+                self.console.write_screen(self.renderer.customer_screen())
+
+            selectable_slots = self.vending_machine.occupied_slots()
+
+            selected_option = self.console.read('\nPlease select an option: ').lower()
 
             try:
                 selected_option_int = int(selected_option)
@@ -372,53 +835,71 @@ class VendingMachineInterface:
             if selected_option_int in selectable_slots:
                 vended, item_summary, vend_result, total_balance = \
                     self.vending_machine.select_and_vend(selected_option_int)
+                self.console.event(
+                    'vend', slot=selected_option_int, vended=vended, result=vend_result,
+                    balance=self.vending_machine.balance_cents
+                )
 
                 if vended:
-                    print(vend_result)
+                    self.console.write(vend_result)
                     if item_summary:
-                        print(item_summary)
-                    print(f'\nYour new balance is: ${total_balance}')
+                        self.console.write(item_summary)
+                    self.console.write(f'\nYour new balance is: {format_money(self.vending_machine.balance_cents)}')
                 else:
-                    print(f'Unable to vend item in slot {selected_option_int} for the '
-                          f'following reason: {vend_result}')
+                    self.console.write(f'Unable to vend item in slot {selected_option_int} for the '
+                                       f'following reason: {vend_result}')
 
             elif selected_option == 'i':
                 try:
-                    insert_amount = float(input('Please enter the amount you would like to insert: '))
+                    insert_amount = parse_money(
+                        self.console.read('Please enter the amount you would like to insert: ')
+                    )
                     inserted, new_balance = self.vending_machine.insert_money(insert_amount)
+                    self.console.event(
+                        'insert', amount=to_cents(insert_amount), inserted=inserted,
+                        balance=self.vending_machine.balance_cents
+                    )
                     if inserted:
-                        print(f'${insert_amount} inserted. Your new balance is: ${new_balance}')
+                        self.console.write(f'{format_money(to_cents(insert_amount))} inserted. '
+                                           f'Your new balance is: {format_money(self.vending_machine.balance_cents)}')
                     else:
-                        print(f'Could not insert ${insert_amount}')
+                        self.console.write(f'Could not insert {format_money(to_cents(insert_amount))}')
 
                 except ValueError:
-                    print('Invalid character entered! Returning to menu...')
+                    self.console.write('Invalid character entered! Returning to menu...')
 
             elif selected_option == 'r':
                 try:
-                    remove_amount = float(input('Please enter the amount you would like to remove: '))
+                    remove_amount = parse_money(
+                        self.console.read('Please enter the amount you would like to remove: ')
+                    )
                     removed, new_balance = self.vending_machine.remove_money(remove_amount)
+                    self.console.event(
+                        'remove', amount=to_cents(remove_amount), removed=removed,
+                        balance=self.vending_machine.balance_cents
+                    )
                     if removed:
-                        print(f'${remove_amount} removed. Your new balance is: ${new_balance}')
+                        self.console.write(f'{format_money(to_cents(remove_amount))} removed. '
+                                           f'Your new balance is: {format_money(self.vending_machine.balance_cents)}')
                     else:
-                        print(f'Could not remove ${remove_amount}')
+                        self.console.write(f'Could not remove {format_money(to_cents(remove_amount))}')
                 except ValueError:
-                    print('Invalid character entered! Returning to menu...')
+                    self.console.write('Invalid character entered! Returning to menu...')
 
             elif selected_option == 'm':
                 selected_option = self.maintenance_menu()
                 if selected_option == 'm':
-                    print('Returning to customer menu...')
+                    self.console.write('Returning to customer menu...')
                     selected_option = ''
 
             else:
                 if selected_option_int != -1:
                     if 0 < selected_option_int <= self.vending_machine.total_slots:
-                        print('This slot is empty! Please try again.')
+                        self.console.write('This slot is empty! Please try again.')
                     else:
-                        print('Invalid slot selected! Please try again.')
+                        self.console.write('Invalid slot selected! Please try again.')
                 elif selected_option != 'q':
-                    print('Invalid character entered! Please try again.')
+                    self.console.write('Invalid character entered! Please try again.')
 
         return selected_option
 
@@ -427,39 +908,23 @@ class VendingMachineInterface:
         selected_option = ''
 
         while selected_option != 'q' and selected_option != 'm':
-            print('*' * 22)
-            print('** MAINTENANCE MODE **')
-            print('*' * 22)
-            print()
-
-            print('(a) Add Item')
-            print('(d) Display Items')
-            print('(mod) Modify Existing Item')
-            print('(mov) Move Item')
-            print('(rem) Remove Item')
-            print('(rep) Replace Item')
-            print('(m) Exit Maintenance Mode')
-            print('(q) Exit Vending Machine')
-
-            selected_option = input('Please select an option: ').lower()
-
-            if selected_option == 'a' or selected_option == 'rep':
-                available_slots = set()
+            if self.console.show_menus:
+                self.console.write_screen(MAINTENANCE_SCREEN)
 
-                for slot_number, slot_item in self.vending_machine.slot_items.items():
-                    if slot_item is None:
-                        available_slots.add(slot_number)
+            selected_option = self.console.read('Please select an option: ').lower()
 
-                selected_slot = input(f'Please select a slot number: ')
+            if selected_option == 'a' or selected_option == 'rep':
+                selected_slot = self.console.read(f'Please select a slot number: ')
 
                 try:
                     selected_slot_number = int(selected_slot)
                     if 0 < selected_slot_number <= self.vending_machine.total_slots:
 
                         replace_item = False
+                        slot_occupied = self.vending_machine.slot_items[selected_slot_number] is not None
 
-                        if selected_slot_number not in available_slots:
-                            replace_item_response = input(
+                        if slot_occupied:
+                            replace_item_response = self.console.read(
                                 f'The selected slot is occupied by '
                                 f'{self.vending_machine.slot_items[selected_slot_number].name}. '
                                 f'Would you like to replace it? (y/n) '
@@ -468,73 +933,75 @@ class VendingMachineInterface:
                                 replace_item = True
 
                         if selected_option == 'a' or (selected_option == 'rep' and replace_item):
-                            item_name = input('Please enter the name of the item to be added: ')
-                            item_price = input('Please enter the price of the item to be added: ')
-                            item_stock = input('Please enter the number of items to be added: ')
+                            item_name = self.console.read('Please enter the name of the item to be added: ')
+                            item_price = self.console.read('Please enter the price of the item to be added: ')
+                            item_stock = self.console.read('Please enter the number of items to be added: ')
 
                             try:
-                                item_price_number = float(item_price)
+                                item_price_number = parse_money(item_price)
                             except ValueError:
                                 item_price_number = None
-                                print('Invalid character entered for item price! Returning to menu...')
+                                self.console.write('Invalid character entered for item price! Returning to menu...')
 
                             try:
                                 item_stock_number = int(item_stock)
                             except ValueError:
                                 item_stock_number = None
-                                print('Invalid character entered for item stock! Returning to menu...')
+                                self.console.write('Invalid character entered for item stock! Returning to menu...')
 
-                            if type(item_price_number) is float and type(item_stock_number) is int:
+                            if item_price_number is not None and item_stock_number is not None:
                                 item = Item(item_name, item_price_number, item_stock_number)
 
                                 if selected_option == 'a':
                                     added = self.vending_machine.add_item_to_slot(
                                         selected_slot_number, item, replace=replace_item
                                     )
+                                    self.console.event(
+                                        'add', slot=selected_slot_number, name=item_name, price=item.price_cents,
+                                        stock=item_stock_number, added=added
+                                    )
 
                                     if added:
-                                        print(f'Successfully added {item_stock_number} units of {item_name} priced at '
-                                              f'{item_price_number} to slot number {selected_slot_number}!')
+                                        self.console.write(f'Successfully added {item_stock_number} units of '
+                                                           f'{item_name} priced at {format_money(item.price_cents)} to '
+                                                           f'slot number '
+                                                           f'{selected_slot_number}!')
                                     else:
-                                        print(f'Could not add {item_name} to slot number {selected_slot_number}!')
+                                        self.console.write(f'Could not add {item_name} to slot number '
+                                                           f'{selected_slot_number}!')
                                 elif selected_option == 'rep':
                                     replaced = self.vending_machine.replace_item_in_slot(selected_slot_number, item)
+                                    self.console.event(
+                                        'replace', slot=selected_slot_number, name=item_name,
+                                        price=item.price_cents, stock=item_stock_number, replaced=replaced
+                                    )
 
                                     if replaced:
-                                        print(f'Successfully replaced slot number {selected_slot_number} with '
-                                              f'{item_stock_number} units of {item_name} priced at '
-                                              f'{item_price_number}!')
+                                        self.console.write(f'Successfully replaced slot number {selected_slot_number} '
+                                                           f'with '
+                                                           f'{item_stock_number} units of {item_name} priced at '
+                                                           f'{format_money(item.price_cents)}!')
                                     else:
-                                        print(f'Could not replace the item in slot number {selected_slot_number}!')
+                                        self.console.write(f'Could not replace the item in slot number '
+                                                           f'{selected_slot_number}!')
                         else:
-                            if selected_slot_number not in available_slots:
-                                print('Item was not replaced!')
+                            if slot_occupied:
+                                self.console.write('Item was not replaced!')
                             else:
-                                print(f'No item in {selected_slot_number} to replace!')
+                                self.console.write(f'No item in {selected_slot_number} to replace!')
                     else:
-                        print('Invalid slot number entered! Returning to menu...')
+                        self.console.write('Invalid slot number entered! Returning to menu...')
 
                 except ValueError:
-                    print('Invalid character entered! Returning to menu...')
+                    self.console.write('Invalid character entered! Returning to menu...')
 
             elif selected_option == 'd':
-                print()
-                print('==== SLOT ITEMS ====')
-                for slot_number, slot_item in self.vending_machine.slot_items.items():
-                    if slot_item:
-                        print(f'[{slot_number}] {slot_item.name} - ${slot_item.price} (Remaining: {slot_item.stock})')
-                    else:
-                        print(f'[{slot_number}] Empty slot')
-                print()
+                self.console.write_screen(self.renderer.slot_items_screen())
 
             elif selected_option == 'mod':
-                occupied_slots = set()
-
-                for slot_number, slot_item in self.vending_machine.slot_items.items():
-                    if slot_item is not None:
-                        occupied_slots.add(slot_number)
+                occupied_slots = self.vending_machine.occupied_slots()
 
-                selected_slot = input(f'Please select a slot to modify {occupied_slots}: ')
+                selected_slot = self.console.read(f'Please select a slot to modify {occupied_slots}: ')
 
                 try:
                     selected_slot_number = int(selected_slot)
@@ -543,103 +1010,101 @@ class VendingMachineInterface:
                         selected_suboption = ''
 
                         while selected_suboption != 'q':
-                            print()
-                            print(f'The current item in slot {selected_slot_number} has the following parameters:')
-                            print(f'Name: {current_item.name}')
-                            print(f'Price: {current_item.price}')
-                            print(f'Stock: {current_item.stock}')
-                            print()
-                            print('(n) Change name')
-                            print('(p) Change price')
-                            print('(is) Increase stock')
-                            print('(ds) Decrease stock')
-                            print('(q) Return to Maintenance Mode menu')
-
-                            selected_suboption = input('Please select a modification for this item: ')
+                            if self.console.show_menus:
+                                self.console.write_screen(
+                                    self.renderer.modify_item_screen(selected_slot_number, current_item)
+                                )
+
+                            selected_suboption = self.console.read('Please select a modification for this item: ')
 
                             if selected_suboption == 'n':
-                                new_name = input('Please enter a new name for this item: ')
+                                new_name = self.console.read('Please enter a new name for this item: ')
                                 changed = self.vending_machine.change_name(selected_slot_number, new_name)
+                                self.console.event('change_name', slot=selected_slot_number, name=new_name,
+                                                   changed=changed)
 
                                 if changed:
-                                    print(f'Successfully changed the name to {new_name}!')
+                                    self.console.write(f'Successfully changed the name to {new_name}!')
                                 else:
-                                    print('Could not change the name!')
+                                    self.console.write('Could not change the name!')
 
                             elif selected_suboption == 'p':
-                                new_price = input('Please enter a new price for this item: ')
+                                new_price = self.console.read('Please enter a new price for this item: ')
 
                                 try:
-                                    new_price_number = float(new_price)
+                                    new_price_number = parse_money(new_price)
                                     changed = self.vending_machine.change_price(selected_slot_number, new_price_number)
+                                    self.console.event('change_price', slot=selected_slot_number,
+                                                       price=to_cents(new_price_number), changed=changed)
 
                                     if changed:
-                                        print(f'Successfully changed the price to ${new_price_number}!')
+                                        self.console.write(f'Successfully changed the price to '
+                                                           f'{format_money(to_cents(new_price_number))}!')
                                     else:
-                                        print('Could not change the price!')
+                                        self.console.write('Could not change the price!')
 
                                 except ValueError:
-                                    print('Invalid character entered! Returning to submenu...')
+                                    self.console.write('Invalid character entered! Returning to submenu...')
 
                             elif selected_suboption == 'is':
-                                increase_amount = input('Please enter an amount to increase the stock by: ')
+                                increase_amount = self.console.read('Please enter an amount to increase the stock by: ')
 
                                 try:
                                     increase_amount_number = int(increase_amount)
                                     increased, new_stock = self.vending_machine.increase_stock(
                                         selected_slot_number, increase_amount_number
                                     )
+                                    self.console.event('increase_stock', slot=selected_slot_number,
+                                                       n=increase_amount_number, increased=increased, stock=new_stock)
 
                                     if increased:
-                                        print(f'Successfully increased the stock by {increase_amount_number} to '
-                                              f'{new_stock}!')
+                                        self.console.write(f'Successfully increased the stock by '
+                                                           f'{increase_amount_number} to {new_stock}!')
                                     else:
-                                        print(f'Could not increase the stock by {increase_amount_number}!')
+                                        self.console.write(f'Could not increase the stock by {increase_amount_number}!')
 
                                 except ValueError:
-                                    print('Invalid character entered! Returning to submenu...')
+                                    self.console.write('Invalid character entered! Returning to submenu...')
 
                             elif selected_suboption == 'ds':
-                                decrease_amount = input('Please enter an amount to decrease the stock by: ')
+                                decrease_amount = self.console.read('Please enter an amount to decrease the stock by: ')
 
                                 try:
                                     decrease_amount_number = int(decrease_amount)
                                     increased, new_stock = self.vending_machine.decrease_stock(
                                         selected_slot_number, decrease_amount_number
                                     )
+                                    self.console.event('decrease_stock', slot=selected_slot_number,
+                                                       n=decrease_amount_number, decreased=increased, stock=new_stock)
 
                                     if increased:
-                                        print(f'Successfully decreased the stock by {decrease_amount_number} to '
-                                              f'{new_stock}!')
+                                        self.console.write(f'Successfully decreased the stock by '
+                                                           f'{decrease_amount_number} to {new_stock}!')
                                     else:
-                                        print(f'Could not decrease the stock by {decrease_amount_number}!')
+                                        self.console.write(f'Could not decrease the stock by {decrease_amount_number}!')
 
                                 except ValueError:
-                                    print('Invalid character entered! Returning to submenu...')
+                                    self.console.write('Invalid character entered! Returning to submenu...')
                             else:
                                 if selected_suboption != 'q':
-                                    print('Invalid character entered! Please try again.')
+                                    self.console.write('Invalid character entered! Please try again.')
 
                     else:
-                        print('Invalid slot number entered! Returning to menu...')
+                        self.console.write('Invalid slot number entered! Returning to menu...')
 
                 except ValueError:
-                    print('Invalid character entered! Returning to menu...')
+                    self.console.write('Invalid character entered! Returning to menu...')
 
             elif selected_option == 'mov' or selected_option == 'rem':
-                occupied_slots = set()
-
-                for slot_number, slot_item in self.vending_machine.slot_items.items():
-                    if slot_item is not None:
-                        occupied_slots.add(slot_number)
+                occupied_slots = self.vending_machine.occupied_slots()
 
                 source_slot = self.vending_machine.total_slots
 
                 if selected_option == 'mov':
-                    source_slot = input('Please select a slot to move: ')
-                    target_slot = input('Please select a slot to move into: ')
+                    source_slot = self.console.read('Please select a slot to move: ')
+                    target_slot = self.console.read('Please select a slot to move into: ')
                 else:
-                    target_slot = input('Please select a slot to remove: ')
+                    target_slot = self.console.read('Please select a slot to remove: ')
 
                 try:
                     source_slot_number = source_slot
@@ -657,7 +1122,7 @@ class VendingMachineInterface:
                                 replace_item = False
 
                                 if target_slot_number in occupied_slots:
-                                    replace_item_response = input(
+                                    replace_item_response = self.console.read(
                                         f'The selected slot is occupied by '
                                         f'{self.vending_machine.slot_items[target_slot_number].name}. '
                                         f'Would you like to replace it? (y/n) '
@@ -668,36 +1133,42 @@ class VendingMachineInterface:
                                 moved = self.vending_machine.move_item_to_slot(
                                     source_slot_number, target_slot_number, replace=replace_item
                                 )
+                                self.console.event('move', source_slot=source_slot_number,
+                                                   target_slot=target_slot_number, moved=moved)
 
                                 if moved:
-                                    print(f'Successfully moved '
-                                          f'{self.vending_machine.slot_items[target_slot_number].name} from slot '
-                                          f'number {source_slot_number} to slot number {target_slot_number}!')
+                                    self.console.write(f'Successfully moved '
+                                                       f'{self.vending_machine.slot_items[target_slot_number].name} '
+                                                       f'from slot number {source_slot_number} to slot number '
+                                                       f'{target_slot_number}!')
                                 else:
-                                    print(f'Could not move the item in slot number {source_slot_number} to '
-                                          f'{target_slot_number}!')
+                                    self.console.write(f'Could not move the item in slot number {source_slot_number} '
+                                                       f'to {target_slot_number}!')
 
                             elif selected_option == 'rem':
                                 if target_slot_number in occupied_slots:
                                     removed = self.vending_machine.remove_item_from_slot(target_slot_number)
+                                    self.console.event('remove_item', slot=target_slot_number, removed=removed)
 
                                     if removed:
-                                        print(f'Successfully removed item from slot number {target_slot_number}!')
+                                        self.console.write(f'Successfully removed item from slot number '
+                                                           f'{target_slot_number}!')
                                     else:
-                                        print(f'Could not remove the item in slot number {target_slot_number}!')
+                                        self.console.write(f'Could not remove the item in slot number '
+                                                           f'{target_slot_number}!')
                                 else:
-                                    print('No item to remove!')
+                                    self.console.write('No item to remove!')
 
                         else:
-                            print('Selected slot to move from has no item! Returning to menu...')
+                            self.console.write('Selected slot to move from has no item! Returning to menu...')
                     else:
-                        print('Invalid slot number entered! Returning to menu...')
+                        self.console.write('Invalid slot number entered! Returning to menu...')
 
                 except ValueError:
-                    print('Invalid character entered! Returning to menu...')
+                    self.console.write('Invalid character entered! Returning to menu...')
 
             else:
                 if selected_option != 'm' and selected_option != 'q':
-                    print('Invalid character entered! Please try again.')
+                    self.console.write('Invalid character entered! Please try again.')
 
         return selected_option